@@ -0,0 +1,41 @@
+"""
+Hàm dùng chung cho các script benchmark (đo thời gian, tạo dữ liệu tổng hợp)
+"""
+
+import time
+
+import numpy as np
+
+
+def time_it(func, repeat=3):
+    """Thời gian tốt nhất (giây) qua nhiều lần chạy"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_synthetic_csv(path, base, n_rows, chunk_rows=500_000, seed=0, id_prefix=None):
+    """
+    Ghi file CSV n_rows dòng lấy mẫu có hoàn lại từ base, ghi theo từng khối
+
+    Args:
+        path: Đường dẫn file output
+        base: DataFrame nguồn
+        n_rows: Số dòng cần tạo
+        chunk_rows: Số dòng mỗi khối ghi (giới hạn bộ nhớ)
+        seed: Random seed
+        id_prefix: Đánh lại customerID thành '<id_prefix><số thứ tự>' cho
+            duy nhất (None: giữ customerID lấy mẫu)
+    """
+    rng = np.random.default_rng(seed)
+    with open(path, 'w', newline='') as f:
+        for start in range(0, n_rows, chunk_rows):
+            n = min(chunk_rows, n_rows - start)
+            chunk = base.iloc[rng.integers(0, len(base), size=n)]
+            if id_prefix is not None:
+                chunk = chunk.copy()
+                chunk['customerID'] = [f"{id_prefix}{i:09d}" for i in range(start, start + n)]
+            chunk.to_csv(f, header=(start == 0), index=False)
@@ -0,0 +1,90 @@
+"""
+Benchmark bước align cột trong preprocess_input
+Chạy: python benchmarks/bench_alignment.py
+
+So sánh vòng lặp thêm từng cột cũ với reindex 1 lần theo:
+- Số dòng (nhân bản data/Customer_Churn.csv)
+- Số cột dummy bị thiếu (ép các cột phân loại về category gốc)
+"""
+
+import os
+import sys
+import warnings
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from _common import time_it
+from predict import load_model_and_scaler, preprocess_input
+
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+DATA_PATH = os.path.join(ROOT, 'data', 'Customer_Churn.csv')
+
+
+def align_loop(data, feature_columns):
+    """Cách align cũ: thêm từng cột thiếu trong vòng lặp Python"""
+    for col in feature_columns:
+        if col not in data.columns:
+            data[col] = 0
+    return data[feature_columns]
+
+
+def align_reindex(data, feature_columns):
+    """Cách align mới: 1 lần reindex"""
+    return data.reindex(columns=feature_columns, fill_value=0)
+
+
+def encoded_without_alignment(df, scaler):
+    """Chạy preprocess_input đến trước bước align (để đo riêng bước align)"""
+    return preprocess_input(df.copy(), scaler, feature_columns=None)
+
+
+def force_missing_dummies(df, n_columns):
+    """Ép n_columns cột phân loại đầu tiên về 1 giá trị để thiếu cột dummy"""
+    df = df.copy()
+    categorical_cols = [c for c in df.columns
+                        if df[c].dtype == object or pd.api.types.is_string_dtype(df[c])]
+    categorical_cols = [c for c in categorical_cols if c not in ('customerID', 'TotalCharges')]
+    for col in categorical_cols[:n_columns]:
+        df[col] = df[col].iloc[0]
+    return df
+
+
+def main():
+    warnings.simplefilter('ignore', category=UserWarning)
+    _, scaler, feature_columns = load_model_and_scaler(
+        os.path.join(ROOT, 'models', 'logistic_model.pkl'),
+        os.path.join(ROOT, 'models', 'scaler.pkl'),
+        os.path.join(ROOT, 'models', 'feature_columns.pkl')
+    )
+    base = pd.read_csv(DATA_PATH).drop(columns=['Churn'])
+
+    print("\n📊 Throughput theo số dòng (align đầy đủ cột)")
+    print(f"{'Số dòng':>10} {'loop (ms)':>12} {'reindex (ms)':>14} {'dòng/s (reindex)':>18}")
+    for factor in (1, 4, 16, 64):
+        df = pd.concat([base] * factor, ignore_index=True)
+        encoded = encoded_without_alignment(df, scaler)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', pd.errors.PerformanceWarning)
+            t_loop = time_it(lambda: align_loop(encoded.copy(), feature_columns))
+        t_reindex = time_it(lambda: align_reindex(encoded.copy(), feature_columns))
+        print(f"{len(df):>10,} {t_loop * 1e3:>12.2f} {t_reindex * 1e3:>14.2f} "
+              f"{len(df) / t_reindex:>18,.0f}")
+
+    df_large = pd.concat([base] * 4, ignore_index=True)
+    print(f"\n📊 Thời gian align theo số cột dummy bị thiếu ({len(df_large):,} dòng)")
+    print(f"{'Cột thiếu':>10} {'loop (ms)':>12} {'reindex (ms)':>14}")
+    for n_columns in (0, 4, 8, 12, 15):
+        encoded = encoded_without_alignment(force_missing_dummies(df_large, n_columns), scaler)
+        n_missing = sum(col not in encoded.columns for col in feature_columns)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', pd.errors.PerformanceWarning)
+            t_loop = time_it(lambda: align_loop(encoded.copy(), feature_columns))
+        t_reindex = time_it(lambda: align_reindex(encoded.copy(), feature_columns))
+        print(f"{n_missing:>10} {t_loop * 1e3:>12.2f} {t_reindex * 1e3:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
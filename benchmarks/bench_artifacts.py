@@ -0,0 +1,84 @@
+"""
+Benchmark thời gian tải mô hình: pickle so với artifact nhị phân (memory-map)
+Chạy: python benchmarks/bench_artifacts.py --trees 500
+
+Huấn luyện Random Forest trên data/Customer_Churn.csv, lưu thành .pkl và
+.artifact (cả dạng sklearn lẫn FlatForest), rồi đo thời gian tải trong 1 tiến
+trình Python mới (cold start, không tính thời gian import thư viện).
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import warnings
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from fast_scoring import FlatForest
+from modeling import save_model, train_random_forest
+from preprocessing import preprocess_pipeline
+
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'Customer_Churn.csv')
+
+# Chạy trong tiến trình con: import trước, chỉ đo phần tải file
+LOAD_SCRIPT = """
+import sys, time, warnings
+warnings.simplefilter('ignore')
+sys.path.insert(0, {src!r})
+import sklearn.ensemble, fast_scoring
+from artifacts import load_object
+best = float('inf')
+for _ in range({repeat}):
+    start = time.perf_counter()
+    load_object({path!r})
+    best = min(best, time.perf_counter() - start)
+print(best)
+"""
+
+
+def cold_load_seconds(path, repeat=1):
+    """Thời gian tải (giây) trong 1 tiến trình mới"""
+    script = LOAD_SCRIPT.format(src=os.path.abspath(SRC_DIR), path=path, repeat=repeat)
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True,
+                            text=True, check=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tải mô hình")
+    parser.add_argument('--trees', type=int, default=500)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        X_train, _, y_train, _, _ = preprocess_pipeline(DATA_PATH)
+        rf = train_random_forest(X_train, y_train, n_estimators=args.trees)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = {
+            'RF .pkl': (rf, os.path.join(tmp, 'rf.pkl')),
+            'RF .artifact': (rf, os.path.join(tmp, 'rf.artifact')),
+            'FlatForest .pkl': (FlatForest.from_model(rf), os.path.join(tmp, 'flat.pkl')),
+            'FlatForest .artifact': (FlatForest.from_model(rf), os.path.join(tmp, 'flat.artifact')),
+        }
+        with contextlib.redirect_stdout(io.StringIO()):
+            for model, path in files.values():
+                save_model(model, path)
+
+        print(f"🌲 Random Forest {args.trees} cây")
+        print(f"{'Định dạng':<22} {'Kích thước (MB)':>16} {'Tải lần đầu (ms)':>17} {'Tải lại (ms)':>13}")
+        for label, (_, path) in files.items():
+            first = cold_load_seconds(path)
+            warm = cold_load_seconds(path, repeat=5)
+            print(f"{label:<22} {os.path.getsize(path) / 1e6:>16.1f} "
+                  f"{first * 1e3:>17.1f} {warm * 1e3:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
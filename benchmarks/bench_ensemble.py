@@ -0,0 +1,61 @@
+"""
+Benchmark độ trễ Ensemble: chấm điểm thành viên tuần tự và song song (thread pool)
+Chạy: python benchmarks/bench_ensemble.py
+
+Huấn luyện Logistic Regression và Random Forest trên data/Customer_Churn.csv,
+đo độ trễ mỗi batch của từng thành viên và của Ensemble với n_jobs=1 / n_jobs=-1.
+Song song hiệu quả thì Ensemble ≈ max(thành viên) thay vì tổng các thành viên.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import warnings
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from _common import time_it
+from ensemble import PrefitVotingClassifier
+from modeling import train_logistic_regression, train_random_forest
+from preprocessing import preprocess_pipeline
+
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'Customer_Churn.csv')
+BATCH_SIZES = [1, 100, 10_000, 100_000]
+
+
+def main():
+    warnings.simplefilter('ignore')
+    with contextlib.redirect_stdout(io.StringIO()):
+        X_train, X_test, y_train, _, _ = preprocess_pipeline(DATA_PATH)
+        lr = train_logistic_regression(X_train, y_train)
+        rf = train_random_forest(X_train, y_train, n_estimators=200)
+
+    members = [('lr', lr), ('rf', rf)]
+    sequential = PrefitVotingClassifier(members, n_jobs=1).fit()
+    parallel = PrefitVotingClassifier(members, n_jobs=-1).fit()
+
+    rng = np.random.default_rng(0)
+    X_all = X_test.to_numpy(dtype=float)
+    print(f"🖥️  Số core: {os.cpu_count()}")
+    print(f"\n{'Batch':>8} {'LR (ms)':>9} {'RF (ms)':>9} {'Tổng':>9} {'Max':>9} "
+          f"{'Tuần tự':>9} {'Song song':>10}")
+    for n in BATCH_SIZES:
+        X = X_all[rng.integers(0, len(X_all), size=n)]
+        repeat = 20 if n <= 100 else 3
+
+        t_lr = time_it(lambda: lr.predict_proba(X), repeat)
+        t_rf = time_it(lambda: rf.predict_proba(X), repeat)
+        t_seq = time_it(lambda: sequential.predict_proba(X), repeat)
+        t_par = time_it(lambda: parallel.predict_proba(X), repeat)
+        assert np.allclose(sequential.predict_proba(X), parallel.predict_proba(X))
+
+        print(f"{n:>8,} {t_lr * 1e3:>9.2f} {t_rf * 1e3:>9.2f} {(t_lr + t_rf) * 1e3:>9.2f} "
+              f"{max(t_lr, t_rf) * 1e3:>9.2f} {t_seq * 1e3:>9.2f} {t_par * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
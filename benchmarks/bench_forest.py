@@ -0,0 +1,79 @@
+"""
+Benchmark FlatForest so với RandomForestClassifier.predict_proba
+Chạy: python benchmarks/bench_forest.py [batch sizes...]
+
+Dùng models/best_rf_model.pkl nếu có, ngược lại huấn luyện nhanh 1 Random
+Forest trên data/Customer_Churn.csv. Dữ liệu cho batch lớn được lấy mẫu
+có hoàn lại từ tập dữ liệu gốc.
+"""
+
+import os
+import pickle
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from _common import time_it
+from fast_scoring import FlatForest
+from predict import load_model_and_scaler, preprocess_input
+
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+DATA_PATH = os.path.join(ROOT, 'data', 'Customer_Churn.csv')
+RF_PATH = os.path.join(ROOT, 'models', 'best_rf_model.pkl')
+BATCH_SIZES = [1, 100, 10_000, 1_000_000]
+
+
+def load_forest(X, y):
+    """Tải Random Forest đã lưu hoặc huấn luyện mới"""
+    if os.path.exists(RF_PATH):
+        with open(RF_PATH, 'rb') as f:
+            return pickle.load(f)
+
+    from sklearn.ensemble import RandomForestClassifier
+    print("⚠️  Không tìm thấy best_rf_model.pkl, huấn luyện Random Forest 200 cây...")
+    model = RandomForestClassifier(n_estimators=200, random_state=42)
+    model.fit(X, y)
+    return model
+
+
+def main():
+    warnings.simplefilter('ignore', category=UserWarning)
+    batch_sizes = [int(n) for n in sys.argv[1:]] or BATCH_SIZES
+
+    _, scaler, feature_columns = load_model_and_scaler(
+        os.path.join(ROOT, 'models', 'logistic_model.pkl'),
+        os.path.join(ROOT, 'models', 'scaler.pkl'),
+        os.path.join(ROOT, 'models', 'feature_columns.pkl')
+    )
+    df = pd.read_csv(DATA_PATH)
+    y = (df.pop('Churn') == 'Yes').astype(int)
+    X = preprocess_input(df, scaler, feature_columns).to_numpy(dtype=float)
+
+    model = load_forest(X, y)
+    start = time.perf_counter()
+    forest = FlatForest.from_model(model)
+    print(f"✅ Xuất {forest.n_trees} cây ({len(forest.feature):,} node, "
+          f"độ sâu {forest.max_depth}) trong {time.perf_counter() - start:.2f}s")
+
+    rng = np.random.default_rng(0)
+    print(f"\n{'Batch':>10} {'sklearn (ms)':>14} {'FlatForest (ms)':>16} {'Tăng tốc':>10} {'Sai lệch max':>14}")
+    for n in batch_sizes:
+        X_batch = X[rng.integers(0, len(X), size=n)]
+        repeat = 5 if n <= 10_000 else 1
+
+        t_sklearn = time_it(lambda: model.predict_proba(X_batch), repeat)
+        t_flat = time_it(lambda: forest.predict_proba(X_batch), repeat)
+        diff = np.abs(model.predict_proba(X_batch) - forest.predict_proba(X_batch)).max()
+
+        print(f"{n:>10,} {t_sklearn * 1e3:>14.2f} {t_flat * 1e3:>16.2f} "
+              f"{t_sklearn / t_flat:>9.1f}x {diff:>14.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark huấn luyện Logistic Regression out-of-core (incremental)
+Chạy: python benchmarks/bench_incremental.py --rows 2000000 --chunksize 100000
+
+1. Chất lượng: so sánh incremental với LogisticRegression huấn luyện toàn bộ
+   trong bộ nhớ trên cùng tập train/test của data/Customer_Churn.csv.
+2. Bộ nhớ: huấn luyện trên file tổng hợp --rows dòng, đo đỉnh bộ nhớ cấp phát
+   (tracemalloc) để thấy bộ nhớ phụ thuộc chunksize chứ không phụ thuộc file.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from _common import make_synthetic_csv
+from metrics import binary_metrics
+from modeling import train_logistic_regression, train_logistic_regression_incremental
+from predict import build_encoder
+from preprocessing import iter_encoded_chunks
+
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'Customer_Churn.csv')
+
+
+def holdout_metrics(model, scaler, feature_columns, test_df):
+    X = build_encoder(scaler, feature_columns).transform(test_df)
+    y = (test_df['Churn'] == 'Yes').to_numpy(dtype=int)
+    metrics, _ = binary_metrics(y, model.predict(X), model.predict_proba(X)[:, 1])
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark huấn luyện incremental")
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--epochs', type=int, default=5)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    raw = pd.read_csv(DATA_PATH)
+    train_df, test_df = train_test_split(raw, test_size=0.2, random_state=42,
+                                         stratify=raw['Churn'])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        train_path = os.path.join(tmp, 'train.csv')
+        train_df.to_csv(train_path, index=False)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            incremental = train_logistic_regression_incremental(
+                train_path, chunksize=1000, n_epochs=args.epochs
+            )
+            scaler = incremental[1]
+            X_train = np.vstack([X for X, _ in iter_encoded_chunks(train_path, scaler)])
+            y_train = np.concatenate([y for _, y in iter_encoded_chunks(train_path, scaler)])
+            batch = train_logistic_regression(X_train, y_train)
+
+        print("📊 Chất lượng trên tập test (cùng encoder/scaler)")
+        print(f"{'Mô hình':<14} {'F1':>8} {'AUC':>8}")
+        for label, model in (('Batch LR', batch), ('Incremental', incremental[0])):
+            metrics = holdout_metrics(model, scaler, incremental[2], test_df)
+            print(f"{label:<14} {metrics['f1']:>8.4f} {metrics['auc']:>8.4f}")
+
+        big_path = os.path.join(tmp, 'big.csv')
+        make_synthetic_csv(big_path, train_df, args.rows)
+        size_mb = os.path.getsize(big_path) / 1e6
+        dense_mb = args.rows * len(incremental[2]) * 8 / 1e6
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            train_logistic_regression_incremental(
+                big_path, chunksize=args.chunksize, n_epochs=1
+            )
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"\n📦 {args.rows:,} dòng: CSV {size_mb:,.0f} MB, "
+              f"ma trận đặc trưng đầy đủ {dense_mb:,.0f} MB")
+        print(f"✅ 1 epoch (chunksize={args.chunksize:,}): {elapsed:.1f}s "
+              f"({args.rows / elapsed:,.0f} dòng/s), đỉnh bộ nhớ {peak / 1e6:,.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark tính metrics: src/metrics.py so với các hàm sklearn.metrics riêng lẻ
+Chạy: python benchmarks/bench_metrics.py --rows 5000000 --models 4
+
+Tạo nhãn và điểm số ngẫu nhiên cho nhiều "mô hình", đo thời gian tính
+accuracy/precision/recall/F1/AUC + classification report theo 2 cách
+và kiểm tra kết quả khớp nhau.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn import metrics as skm
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from metrics import binary_metrics, classification_report_from_confusion
+
+
+def sklearn_metrics(y_true, y_pred, y_score):
+    """Cách cũ của evaluate_model: mỗi metric 1 lần duyệt"""
+    metrics = {
+        'accuracy': skm.accuracy_score(y_true, y_pred),
+        'precision': skm.precision_score(y_true, y_pred),
+        'recall': skm.recall_score(y_true, y_pred),
+        'f1': skm.f1_score(y_true, y_pred),
+        'auc': skm.roc_auc_score(y_true, y_score)
+    }
+    skm.classification_report(y_true, y_pred, target_names=['No Churn', 'Churn'])
+    return metrics
+
+
+def engine_metrics(y_true, y_pred, y_score):
+    """1 ma trận nhầm lẫn + 1 lần sắp xếp"""
+    metrics, cm = binary_metrics(y_true, y_pred, y_score)
+    classification_report_from_confusion(cm)
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark metrics engine")
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    parser.add_argument('--models', type=int, default=4)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    y_true = (rng.random(args.rows) < 0.27).astype(np.int64)
+    scores = [np.clip(0.3 * y_true + rng.normal(0.35, 0.2, args.rows), 0, 1)
+              for _ in range(args.models)]
+
+    timings = {}
+    results = {}
+    for label, func in [('sklearn', sklearn_metrics), ('engine', engine_metrics)]:
+        start = time.perf_counter()
+        results[label] = [func(y_true, (s > 0.5).astype(np.int64), s) for s in scores]
+        timings[label] = time.perf_counter() - start
+
+    for ref, new in zip(results['sklearn'], results['engine']):
+        assert all(np.isclose(ref[k], new[k], rtol=0, atol=1e-9) for k in ref)
+
+    print(f"📊 {args.rows:,} dòng x {args.models} mô hình")
+    for label, elapsed in timings.items():
+        print(f"{label:<8} {elapsed:>8.2f}s")
+    print(f"✅ Kết quả khớp nhau, nhanh hơn {timings['sklearn'] / timings['engine']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark dự đoán hàng loạt song song (predict_batch_parallel)
+Chạy: python benchmarks/bench_parallel.py --rows 10000000
+
+Tạo file CSV tổng hợp bằng cách lấy mẫu các dòng của data/Customer_Churn.csv,
+rồi đo thời gian và tốc độ tăng (speedup) theo số worker, tăng dần tới số core.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from _common import make_synthetic_csv
+from predict import build_encoder, load_model_and_scaler, predict_batch_parallel
+
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+DATA_PATH = os.path.join(ROOT, 'data', 'Customer_Churn.csv')
+
+
+def worker_counts(max_workers):
+    """1, 2, 4, ... tới max_workers"""
+    counts = [1]
+    while counts[-1] * 2 < max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dự đoán song song")
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    parser.add_argument('--input', help="Dùng file CSV có sẵn thay vì tạo file tổng hợp")
+    args = parser.parse_args()
+    warnings.simplefilter('ignore', category=UserWarning)
+
+    model, scaler, feature_columns = load_model_and_scaler(
+        os.path.join(ROOT, 'models', 'logistic_model.pkl'),
+        os.path.join(ROOT, 'models', 'scaler.pkl'),
+        os.path.join(ROOT, 'models', 'feature_columns.pkl')
+    )
+    encoder = build_encoder(scaler, feature_columns)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.input
+        if path is None:
+            path = os.path.join(tmp, 'synthetic.csv')
+            start = time.perf_counter()
+            base = pd.read_csv(DATA_PATH).drop(columns=['Churn'])
+            make_synthetic_csv(path, base, args.rows, chunk_rows=1_000_000, id_prefix='SYN-')
+            print(f"✅ Đã tạo {args.rows:,} dòng ({os.path.getsize(path) / 1e6:,.0f} MB) "
+                  f"trong {time.perf_counter() - start:.1f}s")
+
+        print(f"\n{'Workers':>8} {'Thời gian (s)':>14} {'dòng/s':>14} {'Speedup':>9}")
+        baseline = None
+        for n_workers in worker_counts(args.max_workers):
+            start = time.perf_counter()
+            n_rows = predict_batch_parallel(
+                model, scaler, path, feature_columns, output=os.devnull,
+                n_workers=n_workers, encoder=encoder
+            )
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{n_workers:>8} {elapsed:>14.2f} {n_rows / elapsed:>14,.0f} "
+                  f"{baseline / elapsed:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark bộ nhớ của scale_features
+Chạy: python benchmarks/bench_scaling.py --rows 2000000
+
+Nhân bản dữ liệu đã mã hóa của data/Customer_Churn.csv thành --rows dòng,
+rồi đo đỉnh bộ nhớ cấp phát thêm (tracemalloc) và thời gian của:
+- Cách cũ: .copy() cả 2 tập + fit_transform toàn bộ cột số
+- scale_features mặc định (copy=True, chuẩn hóa từng cột)
+- scale_features(copy=False, chunksize=...) chuẩn hóa trực tiếp
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from preprocessing import (
+    encode_categorical_features, handle_missing_values, load_data,
+    scale_features, split_features_target
+)
+
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'Customer_Churn.csv')
+
+
+def scale_features_copy(X_train, X_test):
+    """Cách làm trước đây của scale_features"""
+    scaler = StandardScaler()
+    numeric_cols = X_train.select_dtypes(include=[np.number]).columns.tolist()
+    X_train_scaled = X_train.copy()
+    X_test_scaled = X_test.copy()
+    X_train_scaled[numeric_cols] = scaler.fit_transform(X_train[numeric_cols])
+    X_test_scaled[numeric_cols] = scaler.transform(X_test[numeric_cols])
+    return X_train_scaled, X_test_scaled, scaler
+
+
+def measure(func, X_train, X_test):
+    """(đỉnh bộ nhớ cấp phát thêm MB, thời gian s)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(X_train, X_test)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak / 1e6, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bộ nhớ scale_features")
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = encode_categorical_features(handle_missing_values(load_data(DATA_PATH)))
+        X, _ = split_features_target(df)
+    idx = np.random.default_rng(0).integers(0, len(X), size=args.rows)
+    n_train = int(args.rows * 0.8)
+
+    def fresh_split():
+        # Giống train_test_split: 2 DataFrame mới
+        return X.iloc[idx[:n_train]].reset_index(drop=True), X.iloc[idx[n_train:]].reset_index(drop=True)
+
+    variants = [
+        ('copy + fit_transform (cũ)', scale_features_copy),
+        ('scale_features()', scale_features),
+        ('copy=False, chunksize', lambda a, b: scale_features(a, b, chunksize=args.chunksize,
+                                                              copy=False)),
+    ]
+
+    X_train, X_test = fresh_split()
+    data_mb = (X_train.memory_usage(index=False).sum() + X_test.memory_usage(index=False).sum()) / 1e6
+    print(f"📦 {args.rows:,} dòng, dữ liệu {data_mb:,.0f} MB")
+    print(f"{'Cách':<28} {'Bộ nhớ thêm (MB)':>17} {'Thời gian (s)':>14}")
+    for label, func in variants:
+        X_train, X_test = fresh_split()
+        peak, elapsed = measure(func, X_train, X_test)
+        print(f"{label:<28} {peak:>17,.0f} {elapsed:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+So sánh các chế độ tìm siêu tham số của optimize_random_forest
+Chạy: python benchmarks/bench_search.py [grid halving grid+cache ...]
+
+Với mỗi chế độ: đo thời gian tìm kiếm (wall-clock), sau đó đánh giá mô hình
+tốt nhất bằng cùng 5-fold CV F1 (không tính vào thời gian) và F1 trên tập test.
+Hậu tố '+cache' dùng 1 FoldCache chung cho mọi chế độ có hậu tố này.
+"""
+
+import os
+import sys
+import time
+import warnings
+
+from sklearn.base import clone
+from sklearn.metrics import f1_score
+from sklearn.model_selection import cross_val_score
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modeling import FoldCache, optimize_random_forest
+from preprocessing import preprocess_pipeline
+
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'Customer_Churn.csv')
+SEARCH_MODES = ['grid', 'halving', 'warm_start', 'grid+cache', 'warm_start+cache']
+
+
+def main():
+    warnings.simplefilter('ignore')
+    modes = sys.argv[1:] or SEARCH_MODES
+
+    X_train, X_test, y_train, y_test, _ = preprocess_pipeline(DATA_PATH)
+    fold_cache = FoldCache(X_train, y_train, cv=5)
+
+    rows = []
+    for mode in modes:
+        print(f"\n{'=' * 70}\n🔍 Chế độ: {mode}")
+        search, _, cached = mode.partition('+')
+        start = time.perf_counter()
+        best = optimize_random_forest(X_train, y_train, search=search,
+                                      fold_cache=fold_cache if cached else None)
+        elapsed = time.perf_counter() - start
+
+        cv_f1 = cross_val_score(clone(best), X_train, y_train, cv=5, scoring='f1', n_jobs=-1).mean()
+        test_f1 = f1_score(y_test, best.predict(X_test))
+        params = {k: best.get_params()[k] for k in ('n_estimators', 'max_depth', 'min_samples_split')}
+        rows.append((mode, elapsed, cv_f1, test_f1, params))
+
+    print(f"\n{'=' * 70}\n📊 SO SÁNH CHẾ ĐỘ TÌM KIẾM")
+    print(f"{'Chế độ':<12} {'Thời gian (s)':>14} {'CV F1':>8} {'Test F1':>8}  Tham số tốt nhất")
+    for mode, elapsed, cv_f1, test_f1, params in rows:
+        print(f"{mode:<12} {elapsed:>14.1f} {cv_f1:>8.4f} {test_f1:>8.4f}  {params}")
+
+
+if __name__ == "__main__":
+    main()
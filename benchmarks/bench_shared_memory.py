@@ -0,0 +1,102 @@
+"""
+Benchmark bộ nhớ khi nhiều worker cùng tải 1 mô hình
+Chạy: python benchmarks/bench_shared_memory.py --trees 500 --workers 4
+
+So sánh 2 cách cho N worker (start method 'spawn', mỗi worker tự tải mô hình):
+- .pkl: mỗi worker unpickle 1 bản Random Forest riêng
+- .artifact (export_shared_model): mọi worker memory-map cùng 1 file FlatForest
+
+Mỗi worker chấm điểm 1 batch (chạm vào toàn bộ cây) rồi báo RSS, PSS và USS
+(bộ nhớ riêng) từ /proc/self/smaps_rollup (chỉ chạy trên Linux). RSS tính cả trang dùng chung nên
+không giảm; PSS chia trang dùng chung cho các process và phản ánh tổng bộ nhớ
+thực, USS là phần chỉ riêng process đó giữ.
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import warnings
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from artifacts import load_object
+from modeling import save_model, train_random_forest
+from predict import export_shared_model
+from preprocessing import preprocess_pipeline
+
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'Customer_Churn.csv')
+
+
+def memory_stats():
+    """(RSS, PSS, USS) của process hiện tại, đơn vị MB"""
+    fields = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    uss = fields['Private_Clean'] + fields['Private_Dirty']
+    return fields['Rss'], fields['Pss'], uss
+
+
+def _worker(args):
+    path, X, barrier = args
+    warnings.simplefilter('ignore')
+    baseline = memory_stats()
+    model = load_object(path)
+    model.predict_proba(X)
+    loaded = memory_stats()
+    # Đợi mọi worker tải xong để PSS chia đúng số process đang map chung
+    barrier.wait()
+    shared = memory_stats()
+    return [after - before for before, after in zip(baseline, (loaded[0], shared[1], loaded[2]))]
+
+
+def run_workers(path, X, n_workers):
+    """Tổng bộ nhớ tăng thêm (RSS, PSS, USS) của n_workers process"""
+    ctx = mp.get_context('spawn')
+    with ctx.Manager() as manager:
+        barrier = manager.Barrier(n_workers)
+        with ctx.Pool(n_workers) as pool:
+            stats = pool.map(_worker, [(path, X, barrier)] * n_workers, chunksize=1)
+    return np.sum(stats, axis=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bộ nhớ mô hình dùng chung")
+    parser.add_argument('--trees', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        X_train, X_test, y_train, _, _ = preprocess_pipeline(DATA_PATH)
+        rf = train_random_forest(X_train, y_train, n_estimators=args.trees)
+    X = X_test.to_numpy(dtype=np.float32)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pkl_path = os.path.join(tmp, 'rf.pkl')
+        with contextlib.redirect_stdout(io.StringIO()):
+            save_model(rf, pkl_path)
+        shared_path = export_shared_model(rf, os.path.join(tmp, 'rf.artifact'))
+
+        print(f"🌲 Random Forest {args.trees} cây: .pkl {os.path.getsize(pkl_path) / 1e6:.0f} MB, "
+              f".artifact {os.path.getsize(shared_path) / 1e6:.0f} MB")
+        print(f"{'Định dạng':<11} {'Workers':>8} {'RSS (MB)':>10} {'PSS (MB)':>10} "
+              f"{'USS (MB)':>10} {'PSS/worker':>11}")
+        for label, path in (('.pkl', pkl_path), ('.artifact', shared_path)):
+            for n_workers in sorted({1, args.workers}):
+                rss, pss, uss = run_workers(path, X, n_workers)
+                print(f"{label:<11} {n_workers:>8} {rss:>10.0f} {pss:>10.0f} "
+                      f"{uss:>10.0f} {pss / n_workers:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark khởi động lạnh: thời gian import module và thời gian tới dự đoán đầu tiên
+Chạy: python benchmarks/bench_startup.py --repeat 5
+
+Mỗi phép đo chạy trong 1 tiến trình Python mới (tính cả thời gian khởi động
+trình thông dịch) và lấy giá trị nhỏ nhất qua --repeat lần. Bảng import liệt
+kê thêm các thư viện nặng (pandas, sklearn, matplotlib, ...) bị kéo theo.
+Dự đoán đầu tiên được đo với:
+    - logistic_model.pkl + scaler.pkl + feature_columns.pkl (unpickle cần sklearn)
+    - LinearScorer lưu dạng .artifact (chỉ cần NumPy)
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from artifacts import save_artifact
+from fast_scoring import LinearScorer
+from predict import (
+    DEFAULT_FEATURE_COLUMNS_PATH, DEFAULT_MODEL_PATH, DEFAULT_SCALER_PATH, load_model_and_scaler
+)
+
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'Customer_Churn.csv')
+
+MODULES = ['predict', 'service', 'thresholds', 'bundle', 'modeling']
+HEAVY_MODULES = ['pandas', 'scipy', 'sklearn', 'matplotlib', 'seaborn']
+
+IMPORT_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {src!r})
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, ','.join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+PKL_SCRIPT = """
+import sys, io, contextlib, warnings
+warnings.simplefilter('ignore')
+sys.path.insert(0, {src!r})
+from predict import build_encoder, load_model_and_scaler, predict_churn
+with contextlib.redirect_stdout(io.StringIO()):
+    model, scaler, feature_columns = load_model_and_scaler({model!r}, {scaler!r}, {columns!r})
+encoder = build_encoder(scaler, feature_columns)
+result = predict_churn(model, scaler, {customer!r}, feature_columns, encoder)
+print(result['churn_probability'])
+"""
+
+ARTIFACT_SCRIPT = """
+import sys
+sys.path.insert(0, {src!r})
+from artifacts import load_artifact
+from predict import predict_churn
+scorer = load_artifact({path!r})
+result = predict_churn(scorer, None, {customer!r}, encoder=scorer.encoder)
+print(result['churn_probability'])
+"""
+
+
+def run_python(script):
+    """Chạy script trong tiến trình mới, trả về (thời gian tổng, dòng output cuối)"""
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True,
+                            text=True, check=True).stdout
+    elapsed = time.perf_counter() - start
+    lines = output.strip().splitlines()
+    return elapsed, lines[-1] if lines else ''
+
+
+def best_of(script, repeat):
+    """Thời gian nhỏ nhất qua repeat lần và output của lần cuối"""
+    runs = [run_python(script) for _ in range(repeat)]
+    return min(elapsed for elapsed, _ in runs), runs[-1][1]
+
+
+def load_customer():
+    """Khách hàng đầu tiên trong file dữ liệu (không có cột Churn)"""
+    with open(DATA_PATH, newline='') as f:
+        row = next(csv.DictReader(f))
+    row.pop('Churn', None)
+    for col in ('SeniorCitizen', 'tenure'):
+        row[col] = int(row[col])
+    row['MonthlyCharges'] = float(row['MonthlyCharges'])
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import và dự đoán đầu tiên")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    baseline, _ = best_of("pass", args.repeat)
+    print(f"🐍 Khởi động trình thông dịch (python -c pass): {baseline * 1e3:.0f} ms\n")
+
+    print(f"{'Module':<12} {'Import (ms)':>12}  Thư viện nặng bị kéo theo")
+    for module in MODULES:
+        script = IMPORT_SCRIPT.format(src=SRC_DIR, module=module, heavy=HEAVY_MODULES)
+        outputs = [run_python(script)[1].split() for _ in range(args.repeat)]
+        seconds = min(float(output[0]) for output in outputs)
+        heavy = outputs[-1][1] if len(outputs[-1]) > 1 else '-'
+        print(f"{module:<12} {seconds * 1e3:>12.0f}  {heavy}")
+
+    customer = load_customer()
+    paths = [os.path.abspath(path) for path in
+             (DEFAULT_MODEL_PATH, DEFAULT_SCALER_PATH, DEFAULT_FEATURE_COLUMNS_PATH)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        model, scaler, feature_columns = load_model_and_scaler(*paths)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact_path = os.path.join(tmp, 'scorer.artifact')
+        save_artifact(LinearScorer.from_model(model, scaler, feature_columns), artifact_path)
+
+        scripts = {
+            'Logistic .pkl (sklearn)': PKL_SCRIPT.format(
+                src=SRC_DIR, model=paths[0], scaler=paths[1], columns=paths[2],
+                customer=customer),
+            'LinearScorer .artifact': ARTIFACT_SCRIPT.format(
+                src=SRC_DIR, path=artifact_path, customer=customer),
+        }
+
+        print(f"\n{'Mô hình':<26} {'Tới dự đoán đầu tiên (ms)':>26} {'Xác suất churn':>15}")
+        for label, script in scripts.items():
+            seconds, output = best_of(script, args.repeat)
+            print(f"{label:<26} {seconds * 1e3:>26.0f} {float(output):>15.4f}")
+
+
+if __name__ == "__main__":
+    main()
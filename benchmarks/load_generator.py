@@ -0,0 +1,112 @@
+"""
+Bộ tạo tải cho dịch vụ dự đoán (src/service.py)
+Chạy:
+    python src/service.py --port 8000
+    python benchmarks/load_generator.py --port 8000 --concurrency 64 --requests 20000
+
+Mỗi kết nối keep-alive gửi tuần tự các request POST /predict với khách hàng
+lấy mẫu từ data/Customer_Churn.csv. In ra throughput và độ trễ p50/p95/p99.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import time
+
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'Customer_Churn.csv')
+
+
+def load_payloads(n=1000, seed=0):
+    """Lấy mẫu n khách hàng từ file dữ liệu, mã hóa sẵn thành body JSON"""
+    with open(DATA_PATH, newline='') as f:
+        rows = list(csv.DictReader(f))
+    random.Random(seed).shuffle(rows)
+
+    payloads = []
+    for row in rows[:n]:
+        row.pop('Churn', None)
+        for col in ('SeniorCitizen', 'tenure'):
+            row[col] = int(row[col])
+        row['MonthlyCharges'] = float(row['MonthlyCharges'])
+        payloads.append(json.dumps(row).encode('utf-8'))
+    return payloads
+
+
+async def client(host, port, payloads, n_requests, latencies, errors):
+    """1 kết nối keep-alive gửi n_requests request tuần tự"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(n_requests):
+            body = payloads[i % len(payloads)]
+            start = time.perf_counter()
+            writer.write(
+                f"POST /predict HTTP/1.1\r\nHost: {host}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+            )
+            await writer.drain()
+
+            status = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.strip().lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+
+            latencies.append(time.perf_counter() - start)
+            if b' 200 ' not in status:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values, q):
+    """Phân vị q (0-100) của danh sách đã sắp xếp"""
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run(host, port, concurrency, n_requests):
+    payloads = load_payloads()
+    latencies, errors = [], []
+    per_client = [n_requests // concurrency + (i < n_requests % concurrency)
+                  for i in range(concurrency)]
+
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        client(host, port, payloads, n, latencies, errors) for n in per_client if n
+    ])
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"\n📊 {len(latencies):,} request, {concurrency} kết nối đồng thời, {elapsed:.2f}s")
+    print(f"   Throughput: {len(latencies) / elapsed:,.0f} req/s")
+    print(f"   Độ trễ p50: {percentile(latencies, 50) * 1e3:.2f} ms")
+    print(f"   Độ trễ p95: {percentile(latencies, 95) * 1e3:.2f} ms")
+    print(f"   Độ trễ p99: {percentile(latencies, 99) * 1e3:.2f} ms")
+    print(f"   Độ trễ max: {latencies[-1] * 1e3:.2f} ms")
+    if errors:
+        print(f"⚠️  {len(errors)} request lỗi, ví dụ: {errors[0]!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tạo tải cho dịch vụ dự đoán churn")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=10_000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.host, args.port, args.concurrency, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,8 @@ import os
 # Thêm đường dẫn src vào path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from predict import predict_churn, load_model_and_scaler
+from predict import predict_churn, load_scoring_model
+from thresholds import risk_level
 
 
 # Cấu hình trang
@@ -59,14 +60,12 @@ st.markdown("""
 
 @st.cache_resource
 def load_models():
-    """Tải mô hình, scaler và feature columns (cache để tăng tốc)"""
-    model_path = os.path.join(os.path.dirname(__file__), '..', 'models', 'logistic_model.pkl')
-    scaler_path = os.path.join(os.path.dirname(__file__), '..', 'models', 'scaler.pkl')
-    feature_cols_path = os.path.join(os.path.dirname(__file__), '..', 'models', 'feature_columns.pkl')
-    
+    """Tải mô hình, encoder và ngưỡng quyết định (cache để tăng tốc)"""
     try:
-        model, scaler, feature_columns = load_model_and_scaler(model_path, scaler_path, feature_cols_path)
-        return model, scaler, feature_columns, None
+        # Gói mô hình nếu có (1 file, kiểm tra SHA-256), ngược lại các file .pkl;
+        # Logistic Regression chấm điểm bằng NumPy (scaler đã gộp vào trọng số)
+        model, encoder, policy = load_scoring_model()
+        return model, encoder, policy, None
     except Exception as e:
         return None, None, None, str(e)
 
@@ -77,7 +76,7 @@ def main():
     st.markdown("---")
     
     # Tải mô hình
-    model, scaler, feature_columns, error = load_models()
+    model, encoder, policy, error = load_models()
     
     if error:
         st.error(f"❌ Lỗi khi tải mô hình: {error}")
@@ -179,18 +178,20 @@ def main():
         # Dự đoán
         with st.spinner("Đang phân tích..."):
             try:
-                result = predict_churn(model, scaler, customer_data, feature_columns)
+                result = predict_churn(model, None, customer_data, encoder=encoder,
+                                       threshold=policy['threshold'])
                 
                 # Hiển thị kết quả
                 st.header("📊 Kết quả dự đoán")
                 
                 churn_prob = result['churn_probability']
                 
-                # Xác định mức độ rủi ro
-                if churn_prob > 0.7:
+                # Xác định mức độ rủi ro (mặc định CAO > 0.7, TRUNG BÌNH > 0.5)
+                level = risk_level(churn_prob, policy['risk_bands'])
+                if level == 'high':
                     box_class = "churn-high"
                     icon = "🔴"
-                    risk_level = "CAO"
+                    risk_label = "CAO"
                     recommendation = """
                     **Khuyến nghị:**
                     - ⚠️ Liên hệ ngay với khách hàng
@@ -198,10 +199,10 @@ def main():
                     - 📞 Tăng cường chăm sóc khách hàng
                     - 🎁 Xem xét gói dịch vụ dài hạn với giảm giá
                     """
-                elif churn_prob > 0.5:
+                elif level == 'medium':
                     box_class = "churn-medium"
                     icon = "🟡"
-                    risk_level = "TRUNG BÌNH"
+                    risk_label = "TRUNG BÌNH"
                     recommendation = """
                     **Khuyến nghị:**
                     - 📧 Gửi email khảo sát sự hài lòng
@@ -211,7 +212,7 @@ def main():
                 else:
                     box_class = "churn-low"
                     icon = "🟢"
-                    risk_level = "THẤP"
+                    risk_label = "THẤP"
                     recommendation = """
                     **Khuyến nghị:**
                     - ✅ Duy trì chất lượng dịch vụ
@@ -223,7 +224,7 @@ def main():
                 st.markdown(f"""
                 <div class='result-box {box_class}'>
                     <h2>{icon} {result['prediction']}</h2>
-                    <h3>Mức độ rủi ro: {risk_level}</h3>
+                    <h3>Mức độ rủi ro: {risk_label}</h3>
                     <p style='font-size: 1.2rem;'>
                         Xác suất Churn: <strong>{churn_prob:.1%}</strong><br>
                         Xác suất No Churn: <strong>{result['no_churn_probability']:.1%}</strong>
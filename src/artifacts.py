@@ -0,0 +1,220 @@
+"""
+Module định dạng artifact nhị phân cho mô hình (tải bằng memory-map, không chép)
+Áp dụng theo CRISP-DM Phase 6: Deployment
+
+Cấu trúc file:
+    [magic 8 byte][độ dài header 8 byte][header JSON][pickle khung đối tượng]
+    [buffer 0][buffer 1]...   (mỗi buffer căn lề ALIGNMENT byte)
+
+Đối tượng được pickle protocol 5 với buffer out-of-band: mọi mảng NumPy liên
+tục (hệ số, mảng node của cây, thống kê scaler...) được ghi nguyên dạng nhị
+phân, không nén, ra ngoài luồng pickle. Khi tải, file được memory-map và các
+mảng được dựng lại trực tiếp trên vùng nhớ map (chỉ đọc), nên chi phí tải gần
+như chỉ còn phần khung đối tượng Python; các tiến trình cùng tải 1 file dùng
+chung page cache của hệ điều hành.
+
+Lưu ý: cây của sklearn (sklearn.tree._tree.Tree) tự chép mảng node vào bộ nhớ
+riêng khi unpickle; để tải Random Forest không chép, lưu FlatForest.from_model().
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+
+import numpy as np
+
+
+# Thư mục mặc định chứa mô hình, scaler, ngưỡng và gói mô hình đã lưu
+MODELS_DIR = os.path.join(os.path.dirname(__file__), '..', 'models')
+
+MAGIC = b'CHURNART'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+ARTIFACT_EXTENSION = '.artifact'
+
+_LENGTH = struct.Struct('<Q')
+
+
+def is_artifact_path(filepath):
+    """True nếu đường dẫn dùng định dạng artifact (theo phần mở rộng)"""
+    return str(filepath).endswith(ARTIFACT_EXTENSION)
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def file_sha256(filepath, chunk_size=1 << 20):
+    """
+    SHA-256 của toàn bộ nội dung file (đọc theo từng khối)
+
+    Args:
+        filepath: Đường dẫn file
+        chunk_size: Kích thước mỗi lần đọc (byte)
+
+    Returns:
+        str: Chuỗi hex SHA-256
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def save_artifact(obj, filepath, metadata=None):
+    """
+    Lưu đối tượng thành file artifact nhị phân
+
+    Args:
+        obj: Đối tượng cần lưu (mô hình, scaler, ...)
+        filepath: Đường dẫn file output
+        metadata: dict thông tin thêm ghi vào header (tùy chọn)
+
+    Returns:
+        dict: Header đã ghi
+    """
+    buffers = []
+    skeleton = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    raws = [buffer.raw() for buffer in buffers]
+
+    digest = hashlib.sha256(skeleton)
+    for raw in raws:
+        digest.update(raw)
+
+    header = {
+        'format_version': FORMAT_VERSION,
+        'class': f"{type(obj).__module__}.{type(obj).__qualname__}",
+        'numpy_version': np.__version__,
+        'metadata': metadata or {},
+        'sha256': digest.hexdigest(),
+        'skeleton': None,
+        'buffers': [],
+    }
+
+    # Độ dài header phụ thuộc các offset: tính offset sau khi cố định kích thước
+    # header bằng cách chừa chỗ (đệm khoảng trắng) rồi ghi lại đúng giá trị
+    def layout(header_size):
+        offset = _align(len(MAGIC) + _LENGTH.size + header_size)
+        skeleton_region = {'offset': offset, 'nbytes': len(skeleton)}
+        offset = _align(offset + len(skeleton))
+        regions = []
+        for raw in raws:
+            regions.append({'offset': offset, 'nbytes': raw.nbytes})
+            offset = _align(offset + raw.nbytes)
+        return skeleton_region, regions
+
+    header_size = 0
+    while True:
+        header['skeleton'], header['buffers'] = layout(header_size)
+        encoded = json.dumps(header).encode()
+        if len(encoded) <= header_size:
+            encoded = encoded.ljust(header_size)
+            break
+        header_size = len(encoded) + 64
+
+    tmp_path = f"{filepath}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_LENGTH.pack(len(encoded)))
+        f.write(encoded)
+        for region, data in [(header['skeleton'], skeleton)] + list(zip(header['buffers'], raws)):
+            f.seek(region['offset'])
+            f.write(data)
+    os.replace(tmp_path, filepath)
+    return header
+
+
+def _parse_header(data, filepath):
+    """Đọc header từ phần đầu file artifact (bytes hoặc vùng map)"""
+    prefix = len(MAGIC) + _LENGTH.size
+    if len(data) < prefix or bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"{filepath} không phải file artifact")
+    (header_size,) = _LENGTH.unpack(data[len(MAGIC):prefix])
+    header = json.loads(bytes(data[prefix:prefix + header_size]))
+    if header['format_version'] > FORMAT_VERSION:
+        raise ValueError(f"Artifact phiên bản {header['format_version']} mới hơn "
+                         f"phiên bản hỗ trợ ({FORMAT_VERSION})")
+    return header
+
+
+def read_artifact_header(filepath):
+    """
+    Đọc header của file artifact (không tải đối tượng)
+
+    Args:
+        filepath: Đường dẫn file artifact
+
+    Returns:
+        dict: Header
+    """
+    with open(filepath, 'rb') as f:
+        data = f.read(len(MAGIC) + _LENGTH.size)
+        if data[:len(MAGIC)] == MAGIC and len(data) == len(MAGIC) + _LENGTH.size:
+            data += f.read(_LENGTH.unpack(data[len(MAGIC):])[0])
+    return _parse_header(data, filepath)
+
+
+def map_artifact(filepath):
+    """
+    Mở và memory-map file artifact 1 lần; header được đọc từ chính vùng map
+
+    Dùng khi cần xem header trước khi tải (ví dụ kiểm tra phiên bản gói mô
+    hình) mà không mở file lần thứ 2: truyền kết quả vào load_artifact(mapped=...).
+
+    Args:
+        filepath: Đường dẫn file artifact
+
+    Returns:
+        tuple: (header, memoryview của toàn bộ file)
+    """
+    with open(filepath, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    return _parse_header(view, filepath), view
+
+
+def load_artifact(filepath, verify=False, mapped=None):
+    """
+    Tải đối tượng từ file artifact, các mảng NumPy được map trực tiếp từ file
+
+    Args:
+        filepath: Đường dẫn file artifact
+        verify: Kiểm tra SHA-256 của nội dung trước khi tải (phải đọc toàn bộ file)
+        mapped: Kết quả map_artifact(filepath) (None: map file tại đây)
+
+    Returns:
+        Đối tượng đã lưu (mảng bên trong là chỉ đọc)
+    """
+    header, view = mapped if mapped is not None else map_artifact(filepath)
+    region = header['skeleton']
+    skeleton = view[region['offset']:region['offset'] + region['nbytes']]
+    buffers = [view[r['offset']:r['offset'] + r['nbytes']] for r in header['buffers']]
+
+    if verify:
+        digest = hashlib.sha256(skeleton)
+        for buffer in buffers:
+            digest.update(buffer)
+        if digest.hexdigest() != header.get('sha256'):
+            raise ValueError(f"{filepath} bị hỏng hoặc đã bị sửa (sai SHA-256)")
+    return pickle.loads(skeleton, buffers=buffers)
+
+
+def save_object(obj, filepath):
+    """Lưu đối tượng: artifact nếu phần mở rộng là ARTIFACT_EXTENSION, ngược lại pickle"""
+    if is_artifact_path(filepath):
+        save_artifact(obj, filepath)
+    else:
+        with open(filepath, 'wb') as f:
+            pickle.dump(obj, f)
+
+
+def load_object(filepath):
+    """Tải đối tượng đã lưu bằng save_object (chọn định dạng theo phần mở rộng)"""
+    if is_artifact_path(filepath):
+        return load_artifact(filepath)
+    with open(filepath, 'rb') as f:
+        return pickle.load(f)
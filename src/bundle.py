@@ -0,0 +1,108 @@
+"""
+Module gói mô hình: 1 file duy nhất cho mô hình, scaler, schema đặc trưng,
+vocabulary và ngưỡng quyết định
+Áp dụng theo CRISP-DM Phase 6: Deployment
+
+Gói được lưu bằng định dạng artifact (src/artifacts.py): file được mở và
+memory-map 1 lần (header và nội dung đọc từ cùng vùng map), mảng NumPy được
+dựng trực tiếp trên vùng map, header ghi phiên bản gói và SHA-256 nội dung để
+phát hiện file hỏng. Các thành phần được kiểm tra khớp nhau khi lưu và khi
+tải, tránh trường hợp ghép nhầm mô hình với feature_columns của lần train khác.
+"""
+
+import os
+import time
+
+from artifacts import MODELS_DIR, load_artifact, map_artifact, save_artifact
+from thresholds import DEFAULT_POLICY
+
+
+BUNDLE_VERSION = 1
+DEFAULT_BUNDLE_PATH = os.path.join(MODELS_DIR, 'churn_model.bundle')
+
+
+def _check_consistency(model, scaler, feature_columns):
+    """Báo lỗi nếu mô hình, scaler và feature_columns không khớp nhau"""
+    n_features = getattr(model, 'n_features_in_', None)
+    if n_features is not None and n_features != len(feature_columns):
+        raise ValueError(f"Mô hình cần {n_features} đặc trưng nhưng feature_columns "
+                         f"có {len(feature_columns)} cột")
+
+    model_columns = getattr(model, 'feature_names_in_', None)
+    if model_columns is not None and list(model_columns) != list(feature_columns):
+        raise ValueError("Thứ tự cột của mô hình khác feature_columns")
+
+    scaled_columns = getattr(scaler, 'feature_names_in_', None)
+    if scaled_columns is not None:
+        missing = [col for col in scaled_columns if col not in feature_columns]
+        if missing:
+            raise ValueError(f"Scaler chuẩn hóa các cột không có trong feature_columns: {missing}")
+
+
+def save_bundle(filepath, model, scaler, feature_columns, policy=None, vocabulary=None):
+    """
+    Lưu mô hình và mọi thành phần cần để dự đoán vào 1 file
+
+    Args:
+        filepath: Đường dẫn file gói
+        model: Mô hình đã huấn luyện
+        scaler: Scaler đã fit
+        feature_columns: Danh sách tên cột từ lúc train
+        policy: Ngưỡng quyết định từ thresholds.py (None: mặc định 0.5 / 0.7)
+        vocabulary: Schema category (None: CATEGORICAL_SCHEMA), dùng để dựng
+            FeatureEncoder khi tải (build_encoder(..., bundle['vocabulary']))
+
+    Returns:
+        dict: Header của file gói (phiên bản, SHA-256, ...)
+    """
+    # Schema nằm trong preprocessing (kéo theo pandas, sklearn): chỉ cần khi lưu
+    from preprocessing import CATEGORICAL_SCHEMA
+
+    feature_columns = list(feature_columns)
+    _check_consistency(model, scaler, feature_columns)
+
+    payload = {
+        'model': model,
+        'scaler': scaler,
+        'feature_columns': feature_columns,
+        'vocabulary': vocabulary or CATEGORICAL_SCHEMA,
+        'thresholds': policy or DEFAULT_POLICY,
+    }
+    metadata = {
+        'bundle_version': BUNDLE_VERSION,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'model_class': type(model).__name__,
+        'n_features': len(feature_columns),
+    }
+    header = save_artifact(payload, filepath, metadata=metadata)
+    print(f"✅ Đã lưu gói mô hình tại: {filepath} (SHA-256 {header['sha256'][:12]}...)")
+    return header
+
+
+def load_bundle(filepath=DEFAULT_BUNDLE_PATH, verify=True):
+    """
+    Tải gói mô hình (1 file, kiểm tra phiên bản, SHA-256 và độ khớp)
+
+    Args:
+        filepath: Đường dẫn file gói
+        verify: Kiểm tra SHA-256 nội dung (tắt để tải nhanh hơn với mô hình lớn)
+
+    Returns:
+        dict: model, scaler, feature_columns, vocabulary, thresholds, metadata
+    """
+    mapped = map_artifact(filepath)
+    header = mapped[0]
+    metadata = header.get('metadata', {})
+    version = metadata.get('bundle_version')
+    if version is None:
+        raise ValueError(f"{filepath} không phải gói mô hình")
+    if version > BUNDLE_VERSION:
+        raise ValueError(f"Gói mô hình phiên bản {version} mới hơn phiên bản hỗ trợ "
+                         f"({BUNDLE_VERSION})")
+
+    # Dùng lại vùng map vừa mở: file chỉ được mở 1 lần
+    bundle = load_artifact(filepath, verify=verify, mapped=mapped)
+    _check_consistency(bundle['model'], bundle['scaler'], bundle['feature_columns'])
+    bundle['metadata'] = metadata
+    print(f"✅ Đã tải gói mô hình {metadata['model_class']} từ: {filepath}")
+    return bundle
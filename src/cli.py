@@ -0,0 +1,244 @@
+"""
+Công cụ dòng lệnh dự đoán Customer Churn hàng loạt theo chế độ streaming
+Áp dụng theo CRISP-DM Phase 6: Deployment
+
+Đọc CSV hoặc JSON-lines từ file hay stdin theo từng chunk, dự đoán và ghi
+ngay kết quả của từng chunk ra stdout hoặc file. Bộ nhớ chỉ phụ thuộc
+chunksize (và số worker), nên dùng được trong pipeline Unix với file rất lớn:
+
+    python src/cli.py data/Customer_Churn.csv -o predictions.csv
+    zcat extract.csv.gz | python src/cli.py --workers 4 > predictions.csv
+    python src/cli.py customers.jsonl --columns customerID,risk_level | head
+
+Thông báo trạng thái được in ra stderr để stdout chỉ chứa kết quả.
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from bundle import DEFAULT_BUNDLE_PATH
+from predict import (
+    DEFAULT_FEATURE_COLUMNS_PATH, DEFAULT_MODEL_PATH, DEFAULT_SCALER_PATH, WORKER_STATE,
+    encode_features, init_worker, load_scoring_model, predict_with_threshold
+)
+from thresholds import DEFAULT_POLICY
+
+
+FORMATS = ('csv', 'jsonl')
+JSONL_EXTENSIONS = ('.jsonl', '.ndjson', '.json')
+
+# Cột kết quả tính từ mô hình; các tên cột khác được lấy nguyên từ dữ liệu đầu vào
+RESULT_COLUMNS = ('prediction', 'churn_probability', 'no_churn_probability', 'risk_level')
+DEFAULT_COLUMNS = ('customerID', 'prediction', 'churn_probability')
+
+
+def detect_format(path):
+    """Định dạng theo phần mở rộng file ('csv' cho stdin và đuôi khác)"""
+    if path and path != '-' and path.lower().endswith(JSONL_EXTENSIONS):
+        return 'jsonl'
+    return 'csv'
+
+
+def read_chunks(source, fmt, chunksize):
+    """
+    Đọc dữ liệu theo từng chunk DataFrame
+
+    Args:
+        source: Đường dẫn hoặc file object (stdin)
+        fmt: 'csv' hoặc 'jsonl'
+        chunksize: Số dòng mỗi chunk
+
+    Returns:
+        Iterator các DataFrame
+    """
+    import pandas as pd
+
+    if fmt == 'jsonl':
+        reader = pd.read_json(source, lines=True, chunksize=chunksize, dtype=False)
+    else:
+        reader = pd.read_csv(source, chunksize=chunksize)
+    with reader:
+        yield from reader
+
+
+def score_chunk(model, encoder, chunk, threshold, columns=None, risk_bands=None):
+    """
+    Dự đoán 1 chunk và tạo DataFrame kết quả với các cột yêu cầu
+
+    Args:
+        model: Mô hình từ predict.load_scoring_model()
+        encoder: FeatureEncoder tương ứng
+        chunk: DataFrame dữ liệu thô
+        threshold: Ngưỡng quyết định cho xác suất churn
+        columns: Danh sách cột output (None: DEFAULT_COLUMNS có trong dữ liệu)
+        risk_bands: Mức rủi ro cho cột risk_level (None: mặc định)
+
+    Returns:
+        pd.DataFrame: Kết quả theo đúng thứ tự columns
+    """
+    import pandas as pd
+
+    X = encode_features(model, None, chunk, encoder=encoder)
+    is_churn, probabilities = predict_with_threshold(model, X, threshold)
+    churn_probability = probabilities[:, 1]
+
+    if columns is None:
+        columns = [col for col in DEFAULT_COLUMNS if col in RESULT_COLUMNS or col in chunk.columns]
+
+    results = {}
+    for col in columns:
+        if col == 'prediction':
+            results[col] = np.where(is_churn, 'Churn', 'No Churn')
+        elif col == 'churn_probability':
+            results[col] = churn_probability
+        elif col == 'no_churn_probability':
+            results[col] = probabilities[:, 0]
+        elif col == 'risk_level':
+            # Giống thresholds.risk_level() nhưng vector hóa cho cả chunk
+            bands = risk_bands or DEFAULT_POLICY['risk_bands']
+            results[col] = np.select(
+                [churn_probability > bands['high'], churn_probability > bands['medium']],
+                ['high', 'medium'], default='low'
+            )
+        elif col in chunk.columns:
+            results[col] = chunk[col].to_numpy()
+        else:
+            raise KeyError(f"Không có cột '{col}' trong dữ liệu đầu vào")
+    return pd.DataFrame(results, columns=list(columns))
+
+
+def _score_chunk_worker(task):
+    """Worker: dự đoán 1 chunk với mô hình đã gán bởi predict.init_worker"""
+    chunk, columns, risk_bands = task
+    state = WORKER_STATE
+    return score_chunk(state['model'], state['encoder'], chunk, state['threshold'],
+                       columns, risk_bands)
+
+
+def iter_results(model, encoder, chunks, threshold, columns=None, risk_bands=None,
+                 n_workers=1):
+    """
+    Dự đoán lần lượt các chunk, trả kết quả theo đúng thứ tự đầu vào
+
+    Với n_workers > 1 các chunk được gửi tới process pool, tối đa
+    2 * n_workers chunk đang xử lý cùng lúc để bộ nhớ vẫn bị chặn.
+
+    Returns:
+        Iterator các DataFrame kết quả
+    """
+    if n_workers <= 1:
+        for chunk in chunks:
+            yield score_chunk(model, encoder, chunk, threshold, columns, risk_bands)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=n_workers, initializer=init_worker,
+        initargs=(model, None, None, encoder, threshold)
+    ) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_score_chunk_worker, (chunk, columns, risk_bands)))
+            if len(pending) >= 2 * n_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_chunk(results, out, fmt, header):
+    """Ghi 1 chunk kết quả (CSV hoặc JSON-lines) và flush ngay"""
+    if fmt == 'jsonl':
+        text = results.to_json(orient='records', lines=True, force_ascii=False,
+                               double_precision=15)
+        out.write(text if text.endswith('\n') or not text else text + '\n')
+    else:
+        results.to_csv(out, header=header, index=False)
+    out.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Dự đoán Customer Churn hàng loạt (CSV/JSON-lines, file hoặc stdin)"
+    )
+    parser.add_argument('input', nargs='?', default='-',
+                        help="File dữ liệu khách hàng ('-' hoặc bỏ trống: stdin)")
+    parser.add_argument('-o', '--output', default='-',
+                        help="File kết quả ('-' hoặc bỏ trống: stdout)")
+    parser.add_argument('--input-format', choices=FORMATS, default=None,
+                        help="Mặc định theo phần mở rộng file, stdin là csv")
+    parser.add_argument('--output-format', choices=FORMATS, default=None,
+                        help="Mặc định giống định dạng đầu vào")
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Số process dự đoán song song (1: trong process hiện tại)")
+    parser.add_argument('--threshold', type=float, default=None,
+                        help="Ngưỡng quyết định (mặc định 0.5, hoặc từ --thresholds / "
+                             "--bundle-threshold)")
+    parser.add_argument('--columns', default=None,
+                        help="Các cột output, cách nhau bởi dấu phẩy: "
+                             f"{', '.join(RESULT_COLUMNS)} hoặc cột bất kỳ của đầu vào "
+                             f"(mặc định: {','.join(DEFAULT_COLUMNS)})")
+    parser.add_argument('--bundle', default=DEFAULT_BUNDLE_PATH,
+                        help="Gói mô hình (dùng nếu tồn tại, thay cho các file bên dưới)")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--scaler', default=DEFAULT_SCALER_PATH)
+    parser.add_argument('--feature-columns', default=DEFAULT_FEATURE_COLUMNS_PATH)
+    parser.add_argument('--thresholds', default=None,
+                        help="File ngưỡng từ src/thresholds.py cho đúng --model "
+                             "(mặc định: 0.5 / 0.7)")
+    parser.add_argument('--bundle-threshold', action='store_true',
+                        help="Dùng ngưỡng đã chọn lưu trong gói mô hình")
+    args = parser.parse_args(argv)
+
+    if args.chunksize < 1:
+        parser.error("--chunksize phải >= 1")
+    columns = [col.strip() for col in args.columns.split(',')] if args.columns else None
+    input_format = args.input_format or detect_format(args.input)
+    output_format = args.output_format or input_format
+
+    # Các hàm tải mô hình in thông báo ra stdout: chuyển sang stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            model, encoder, policy = load_scoring_model(
+                args.bundle, args.model, args.scaler, args.feature_columns, args.thresholds,
+                bundle_policy=args.bundle_threshold
+            )
+        except (OSError, ValueError) as e:
+            parser.error(f"Không tải được mô hình: {e}")
+    threshold = args.threshold if args.threshold is not None else policy['threshold']
+
+    source = sys.stdin if args.input == '-' else args.input
+    owns_output = args.output != '-'
+    out = open(args.output, 'w', newline='') if owns_output else sys.stdout
+
+    n_rows = 0
+    try:
+        chunks = read_chunks(source, input_format, args.chunksize)
+        for results in iter_results(model, encoder, chunks, threshold, columns,
+                                    policy.get('risk_bands'), args.workers):
+            write_chunk(results, out, output_format, header=(n_rows == 0))
+            n_rows += len(results)
+    except KeyError as e:
+        parser.error(e.args[0])
+    except ValueError as e:
+        parser.error(f"Dữ liệu đầu vào không hợp lệ (sau {n_rows} dòng): {e}")
+    except BrokenPipeError:
+        # Đầu đọc của pipe đã đóng (ví dụ | head): dừng im lặng
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    finally:
+        if owns_output:
+            out.close()
+
+    print(f"✅ Đã dự đoán {n_rows} khách hàng (ngưỡng {threshold:.4f})", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Module encoder biên dịch sẵn (fixed-schema) cho dự án Customer Churn
+Áp dụng theo CRISP-DM Phase 6: Deployment
+"""
+
+import numpy as np
+
+
+# Các cột số được scaler chuẩn hóa (giống preprocess_input)
+NUMERIC_COLS_TO_SCALE = ['tenure', 'MonthlyCharges', 'TotalCharges']
+
+
+class FeatureEncoder:
+    """
+    Encoder với schema cố định, được "biên dịch" một lần từ feature_columns
+    (và scaler) lúc train.
+
+    Thay cho pd.get_dummies + align cột trong preprocess_input: mỗi bản ghi
+    thô được ghi thẳng vào ma trận float cấp phát sẵn theo đúng thứ tự cột
+    lúc train, không tạo DataFrame trung gian trên đường dự đoán.
+
+    Kết quả khớp với preprocess_input(data, scaler, feature_columns):
+    - Các cột số được chuẩn hóa bằng mean/scale của scaler
+    - TotalCharges không phải số (chuỗi rỗng) được coi là 0
+    - Category không có trong feature_columns (category gốc bị drop_first
+      hoặc giá trị lạ) cho toàn bộ cột dummy bằng 0
+    - Trường số bị thiếu trong bản ghi được coi là 0 trước khi chuẩn hóa
+    """
+
+    def __init__(self, feature_columns, scaler=None, vocabulary=None):
+        """
+        Args:
+            feature_columns: Danh sách tên cột từ lúc train
+            scaler: Scaler đã fit (None nếu không cần chuẩn hóa)
+            vocabulary: {cột gốc: [giá trị category]} lúc train (ví dụ
+                CATEGORICAL_SCHEMA hoặc bundle['vocabulary']). None: suy ra từ
+                tên cột dummy '<cột>_<giá trị>' (tách ở dấu '_' đầu tiên)
+        """
+        self.feature_columns = list(feature_columns)
+        self.n_features = len(self.feature_columns)
+
+        # Tên cột dummy -> (cột gốc, giá trị) theo vocabulary khai báo, để tên
+        # cột hay giá trị chứa '_' vẫn được nhận đúng
+        dummies = {}
+        if vocabulary is not None:
+            dummies = {f"{column}_{value}": (column, value)
+                       for column, values in vocabulary.items() for value in values}
+
+        # Vocabulary: {cột gốc: {giá trị category: vị trí cột dummy}}
+        self.vocabulary = {}
+        # Cột số: [(tên cột, vị trí)]
+        self.numeric_columns = []
+        for idx, name in enumerate(self.feature_columns):
+            if vocabulary is not None:
+                column, value = dummies.get(name, (name, None))
+                is_dummy = value is not None
+            else:
+                column, sep, value = name.partition('_')
+                is_dummy = bool(sep)
+            if is_dummy:
+                self.vocabulary.setdefault(column, {})[value] = idx
+            else:
+                self.numeric_columns.append((name, idx))
+
+        # Tham số chuẩn hóa cho từng vị trí cột số (mean=0, scale=1 nếu không scale)
+        self.mean = np.zeros(self.n_features)
+        self.scale = np.ones(self.n_features)
+        if scaler is not None:
+            scaled_cols = list(getattr(scaler, 'feature_names_in_', NUMERIC_COLS_TO_SCALE))
+            for name, idx in self.numeric_columns:
+                if name in scaled_cols:
+                    pos = scaled_cols.index(name)
+                    self.mean[idx] = scaler.mean_[pos]
+                    self.scale[idx] = scaler.scale_[pos]
+
+    def transform(self, data):
+        """
+        Mã hóa dữ liệu thô thành ma trận đặc trưng
+
+        Args:
+            data: dict (1 khách hàng), list các dict hoặc DataFrame
+
+        Returns:
+            np.ndarray: Ma trận float64 shape (n_rows, n_features)
+        """
+        if isinstance(data, dict):
+            data = [data]
+        if isinstance(data, list):
+            return self._transform_records(data)
+        return self._transform_frame(data)
+
+    def validate_record(self, record):
+        """
+        Kiểm tra 1 bản ghi trước khi đưa vào batch
+
+        Các trường mô hình dùng phải là giá trị đơn (chuỗi, số, bool hoặc
+        None); giá trị khác (list, dict, ...) làm transform() lỗi cho cả batch.
+
+        Args:
+            record: dict dữ liệu 1 khách hàng
+
+        Raises:
+            ValueError: Nếu bản ghi không phải dict hoặc có trường không hợp lệ
+        """
+        if not isinstance(record, dict):
+            raise ValueError("Bản ghi phải là object (dict) của 1 khách hàng")
+        names = [name for name, _ in self.numeric_columns] + list(self.vocabulary)
+        for name in names:
+            value = record.get(name)
+            if value is not None and not isinstance(value, (str, int, float)):
+                raise ValueError(
+                    f"Trường '{name}' phải là chuỗi hoặc số, nhận {type(value).__name__}"
+                )
+
+    def _transform_records(self, records):
+        """Mã hóa list các dict (đường nhanh cho dự đoán online)"""
+        X = np.zeros((len(records), self.n_features))
+
+        for i, record in enumerate(records):
+            row = X[i]
+            for name, idx in self.numeric_columns:
+                value = record.get(name)
+                if value is None:
+                    continue
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    value = 0.0
+                if value != value:  # NaN
+                    value = 0.0
+                row[idx] = value
+
+            for column, mapping in self.vocabulary.items():
+                idx = mapping.get(record.get(column))
+                if idx is not None:
+                    row[idx] = 1.0
+
+        X -= self.mean
+        X /= self.scale
+        return X
+
+    def _transform_frame(self, df):
+        """Mã hóa DataFrame theo từng cột (vector hóa)"""
+        import pandas as pd
+
+        X = np.zeros((len(df), self.n_features))
+
+        for name, idx in self.numeric_columns:
+            if name in df.columns:
+                values = pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=float)
+                X[:, idx] = np.nan_to_num(values, nan=0.0)
+
+        rows = np.arange(len(df))
+        for column, mapping in self.vocabulary.items():
+            if column not in df.columns:
+                continue
+            codes = df[column].map(mapping).to_numpy(dtype=float)
+            hit = ~np.isnan(codes)
+            X[rows[hit], codes[hit].astype(np.intp)] = 1.0
+
+        X -= self.mean
+        X /= self.scale
+        return X
@@ -0,0 +1,118 @@
+"""
+Module mô hình Ensemble từ các mô hình đã huấn luyện sẵn
+Áp dụng theo CRISP-DM Phase 4: Modeling
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.utils.validation import check_is_fitted
+
+
+# Thread pool dùng chung cho mọi ensemble trong tiến trình: tạo 1 lần khi cần,
+# thread nhàn rỗi được dùng lại nên không cần đóng theo từng mô hình
+_THREAD_PREFIX = 'ensemble'
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _shared_executor():
+    """Thread pool dùng chung (tạo lại trong tiến trình con sau fork)"""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(thread_name_prefix=_THREAD_PREFIX)
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _predict_members(estimators, X):
+    return [est.predict_proba(X) for est in estimators]
+
+
+class PrefitVotingClassifier(ClassifierMixin, BaseEstimator):
+    """
+    Soft voting từ các mô hình ĐÃ huấn luyện (không clone, không fit lại)
+
+    Khác với sklearn VotingClassifier (luôn clone và fit lại mọi thành viên),
+    lớp này chỉ kết hợp xác suất: predict_proba là trung bình (có trọng số)
+    predict_proba của các thành viên, predict là lớp có xác suất lớn nhất.
+    Với cùng thành viên và trọng số, kết quả giống VotingClassifier(voting='soft').
+
+    Với n_jobs > 1 các thành viên được chấm điểm đồng thời trên thread pool
+    dùng chung của module (NumPy/sklearn nhả GIL khi tính toán), nên độ trễ
+    mỗi batch xấp xỉ max(thành viên) thay vì tổng các thành viên.
+    """
+
+    def __init__(self, estimators, weights=None, n_jobs=None):
+        """
+        Args:
+            estimators: List (tên, mô hình đã fit)
+            weights: Trọng số cho từng thành viên (None: bằng nhau)
+            n_jobs: Số thread chấm điểm thành viên song song (None/1: tuần tự,
+                -1: mỗi thành viên 1 thread)
+        """
+        self.estimators = estimators
+        self.weights = weights
+        self.n_jobs = n_jobs
+
+    def fit(self, X=None, y=None):
+        """
+        Kiểm tra các thành viên đã được huấn luyện và cùng tập nhãn
+
+        Không huấn luyện lại thành viên nào; X, y chỉ để tương thích API sklearn.
+        """
+        if not self.estimators:
+            raise ValueError("Cần ít nhất 1 mô hình thành viên")
+        if self.weights is not None and len(self.weights) != len(self.estimators):
+            raise ValueError("Số trọng số phải bằng số mô hình thành viên")
+
+        for name, est in self.estimators:
+            check_is_fitted(est)
+        self.classes_ = self.estimators[0][1].classes_
+        for name, est in self.estimators[1:]:
+            if not np.array_equal(est.classes_, self.classes_):
+                raise ValueError(f"Mô hình '{name}' có classes_ khác các mô hình còn lại")
+
+        self.named_estimators_ = dict(self.estimators)
+        return self
+
+    def _n_threads(self):
+        """Số nhóm thành viên chấm điểm song song (1: tuần tự)"""
+        n_threads = len(self.estimators) if self.n_jobs == -1 else (self.n_jobs or 1)
+        return min(n_threads, len(self.estimators))
+
+    def _member_probas(self, X):
+        """predict_proba của từng thành viên, shape (n_members, n_rows, n_classes)"""
+        estimators = [est for _, est in self.estimators]
+        n_threads = self._n_threads()
+        # Trong thread của pool (ensemble lồng nhau) chạy tuần tự để không chờ
+        # chính pool đang bận
+        if n_threads <= 1 or threading.current_thread().name.startswith(_THREAD_PREFIX):
+            return np.asarray(_predict_members(estimators, X))
+
+        # Chia thành viên thành n_threads nhóm, mỗi nhóm 1 task trên pool dùng chung
+        executor = _shared_executor()
+        futures = [executor.submit(_predict_members, estimators[i::n_threads], X)
+                   for i in range(n_threads)]
+        probas = [None] * len(estimators)
+        for i, future in enumerate(futures):
+            probas[i::n_threads] = future.result()
+        return np.asarray(probas)
+
+    def predict_proba(self, X):
+        """
+        Xác suất từng lớp = trung bình có trọng số xác suất các thành viên
+        """
+        check_is_fitted(self, 'classes_')
+        return np.average(self._member_probas(X), axis=0, weights=self.weights)
+
+    def predict(self, X):
+        """
+        Nhãn dự đoán (lớp có xác suất trung bình lớn nhất)
+        """
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
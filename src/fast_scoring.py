@@ -0,0 +1,257 @@
+"""
+Module dự đoán nhanh chỉ dùng NumPy cho dự án Customer Churn
+Áp dụng theo CRISP-DM Phase 6: Deployment
+"""
+
+import numpy as np
+
+from encoder import FeatureEncoder
+
+
+def sigmoid(z):
+    """Hàm sigmoid ổn định số học (không overflow với |z| lớn)"""
+    return np.exp(-np.logaddexp(0.0, -z))
+
+
+class LinearScorer:
+    """
+    Bộ chấm điểm cho mô hình Logistic Regression đã lưu, chỉ dùng NumPy
+
+    Hệ số của scaler được gộp vào trọng số của mô hình:
+        coef * (x - mean) / scale + b = (coef / scale) * x + (b - coef * mean / scale)
+    nên mỗi dòng chỉ cần 1 phép nhân vô hướng với dữ liệu đã mã hóa CHƯA
+    chuẩn hóa (self.encoder) và 1 lần sigmoid.
+
+    Có predict / predict_proba giống sklearn nên dùng được trực tiếp với
+    predict_churn(scorer, None, data, encoder=scorer.encoder).
+    """
+
+    def __init__(self, weights, intercept, feature_columns, classes=(0, 1), vocabulary=None):
+        """
+        Args:
+            weights: Vector trọng số đã gộp scaler (n_features,)
+            intercept: Hệ số tự do đã gộp scaler
+            feature_columns: Danh sách tên cột từ lúc train
+            classes: Nhãn lớp (giống model.classes_)
+            vocabulary: Vocabulary category cho encoder (xem FeatureEncoder)
+        """
+        self.weights = np.asarray(weights, dtype=float)
+        self.intercept = float(intercept)
+        self.feature_columns = list(feature_columns)
+        self.classes_ = np.asarray(classes)
+        self.encoder = FeatureEncoder(self.feature_columns, vocabulary=vocabulary)
+
+    @classmethod
+    def from_model(cls, model, scaler, feature_columns, vocabulary=None):
+        """
+        Tạo scorer từ LogisticRegression và StandardScaler đã huấn luyện
+
+        Args:
+            model: LogisticRegression nhị phân đã fit
+            scaler: Scaler dùng lúc train (None nếu dữ liệu không chuẩn hóa)
+            feature_columns: Danh sách tên cột từ lúc train
+            vocabulary: Vocabulary category (None: suy ra từ feature_columns)
+
+        Returns:
+            LinearScorer: Scorer đã gộp trọng số
+        """
+        if not hasattr(model, 'coef_') or model.coef_.shape[0] != 1:
+            raise TypeError("LinearScorer chỉ hỗ trợ mô hình tuyến tính nhị phân (có coef_)")
+
+        # FeatureEncoder(feature_columns, scaler) đã biết mean/scale theo từng cột
+        scaled = FeatureEncoder(feature_columns, scaler, vocabulary)
+        coef = model.coef_[0].astype(float)
+
+        weights = coef / scaled.scale
+        intercept = model.intercept_[0] - np.dot(coef, scaled.mean / scaled.scale)
+
+        return cls(weights, intercept, feature_columns, classes=model.classes_,
+                   vocabulary=vocabulary)
+
+    def decision_function(self, X):
+        """
+        Tính điểm tuyến tính cho dữ liệu đã mã hóa (chưa chuẩn hóa)
+
+        Args:
+            X: Ma trận từ self.encoder.transform()
+
+        Returns:
+            np.ndarray: Điểm quyết định (n_rows,)
+        """
+        return np.asarray(X, dtype=float) @ self.weights + self.intercept
+
+    def predict_proba(self, X):
+        """
+        Xác suất từng lớp, giống LogisticRegression.predict_proba
+
+        Returns:
+            np.ndarray: shape (n_rows, 2), cột 1 là xác suất Churn
+        """
+        p = sigmoid(self.decision_function(X))
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, X):
+        """
+        Nhãn dự đoán (ngưỡng 0.5, tức điểm quyết định > 0)
+        """
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+
+class FlatForest:
+    """
+    Random Forest đã "làm phẳng" thành các mảng NumPy liên tục
+
+    Mọi node của mọi cây được nối vào cùng các mảng feature, threshold,
+    children (trái/phải) và leaf_values; roots[k] là vị trí node gốc của cây
+    thứ k. Node lá trỏ children về chính nó nên việc duyệt cây được vector hóa
+    cho nhiều dòng x nhiều cây cùng lúc, không có vòng lặp Python theo cây.
+
+    Kết quả predict_proba khớp RandomForestClassifier.predict_proba (sai số
+    làm tròn float do thứ tự cộng các cây). Nhanh hơn sklearn nhiều lần cho
+    batch nhỏ (dự đoán online); với batch rất lớn thì vòng duyệt Cython của
+    sklearn vẫn nhanh hơn (xem benchmarks/bench_forest.py).
+    """
+
+    # Số cặp (dòng, cây) tối đa duyệt cùng lúc, giới hạn bộ nhớ tạm
+    BLOCK_SIZE = 1 << 20
+
+    def __init__(self, feature, threshold, children, leaf_values, roots,
+                 max_depth, classes=(0, 1)):
+        """
+        Args:
+            feature: Chỉ số đặc trưng tại mỗi node (n_nodes,)
+            threshold: Ngưỡng tách tại mỗi node (n_nodes,)
+            children: Node con trái/phải (n_nodes, 2), lá trỏ về chính nó
+            leaf_values: Xác suất từng lớp tại mỗi node (n_nodes, n_classes)
+            roots: Vị trí node gốc của từng cây (n_trees,)
+            max_depth: Độ sâu lớn nhất trong các cây
+            classes: Nhãn lớp (giống model.classes_)
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.leaf_values = leaf_values
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.classes_ = np.asarray(classes)
+        self.is_leaf = children[:, 0] == np.arange(len(children))
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        Xuất RandomForestClassifier đã huấn luyện sang mảng phẳng
+
+        Args:
+            model: RandomForestClassifier (hoặc ensemble cây có estimators_)
+
+        Returns:
+            FlatForest: Engine dự đoán dạng mảng
+        """
+        if not hasattr(model, 'estimators_'):
+            raise TypeError("FlatForest cần mô hình rừng cây đã fit (có estimators_)")
+
+        trees = [est.tree_ for est in model.estimators_]
+        n_nodes = sum(t.node_count for t in trees)
+        index_dtype = np.int32 if n_nodes < np.iinfo(np.int32).max else np.int64
+
+        feature, threshold, children, leaf_values, roots = [], [], [], [], []
+        offset = 0
+        for t in trees:
+            nodes = np.arange(t.node_count)
+            is_leaf = t.children_left == -1
+
+            # Lá: feature 0, children trỏ về chính nó
+            feature.append(np.where(is_leaf, 0, t.feature))
+            threshold.append(t.threshold)
+            left = np.where(is_leaf, nodes, t.children_left) + offset
+            right = np.where(is_leaf, nodes, t.children_right) + offset
+            children.append(np.column_stack([left, right]))
+
+            # Chuẩn hóa value thành xác suất giống DecisionTreeClassifier.predict_proba
+            value = t.value[:, 0, :].astype(float)
+            normalizer = value.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            leaf_values.append(value / normalizer)
+
+            roots.append(offset)
+            offset += t.node_count
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(feature), dtype=index_dtype),
+            threshold=np.ascontiguousarray(np.concatenate(threshold), dtype=np.float64),
+            children=np.ascontiguousarray(np.concatenate(children), dtype=index_dtype),
+            leaf_values=np.ascontiguousarray(np.concatenate(leaf_values)),
+            roots=np.asarray(roots, dtype=index_dtype),
+            max_depth=max(t.max_depth for t in trees),
+            classes=model.classes_
+        )
+
+    def apply(self, X):
+        """
+        Tìm node lá của mỗi dòng trên mỗi cây
+
+        Args:
+            X: Ma trận đặc trưng (n_rows, n_features)
+
+        Returns:
+            np.ndarray: Vị trí node lá (n_rows, n_trees)
+        """
+        # sklearn so sánh đặc trưng ở dạng float32 với ngưỡng float64
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        X_flat = X.ravel()
+
+        leaves = np.empty((n_rows, self.n_trees), dtype=self.roots.dtype)
+        block_rows = max(1, self.BLOCK_SIZE // self.n_trees)
+        children = self.children.ravel()
+
+        for start in range(0, n_rows, block_rows):
+            stop = min(start + block_rows, n_rows)
+            n_block = stop - start
+            # Duyệt theo thứ tự cây-trước (các node của 1 cây nằm gần nhau trong cache)
+            row_base = np.tile(np.arange(start, stop) * n_features, self.n_trees)
+            nodes = np.repeat(self.roots, n_block)
+            # Vị trí trong block_leaves của các cặp (cây, dòng) chưa tới lá
+            block_leaves = np.empty(self.n_trees * n_block, dtype=self.roots.dtype)
+            pending = np.arange(self.n_trees * n_block)
+
+            while True:
+                values = X_flat[row_base + self.feature[nodes]]
+                go_right = values > self.threshold[nodes]
+                nodes = children[2 * nodes + go_right]
+
+                at_leaf = self.is_leaf[nodes]
+                n_at_leaf = np.count_nonzero(at_leaf)
+                if n_at_leaf == len(nodes):
+                    block_leaves[pending] = nodes
+                    break
+                # Khi đủ nhiều cặp đã tới lá thì ghi lại và chỉ duyệt tiếp phần còn lại
+                # (lá trỏ về chính nó nên các cặp chưa loại vẫn đứng yên ở lá)
+                if 4 * n_at_leaf >= len(nodes):
+                    block_leaves[pending[at_leaf]] = nodes[at_leaf]
+                    keep = ~at_leaf
+                    nodes, row_base, pending = nodes[keep], row_base[keep], pending[keep]
+
+            leaves[start:stop] = block_leaves.reshape(self.n_trees, n_block).T
+
+        return leaves
+
+    def predict_proba(self, X):
+        """
+        Xác suất từng lớp, giống RandomForestClassifier.predict_proba
+
+        Returns:
+            np.ndarray: shape (n_rows, n_classes)
+        """
+        leaves = self.apply(np.asarray(X))
+        return self.leaf_values[leaves].mean(axis=1)
+
+    def predict(self, X):
+        """
+        Nhãn dự đoán (lớp có xác suất lớn nhất, giống sklearn)
+        """
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
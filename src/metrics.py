@@ -0,0 +1,170 @@
+"""
+Module tính metrics phân loại nhị phân trong 1 lượt duyệt dữ liệu
+Áp dụng theo CRISP-DM Phase 5: Evaluation
+
+Mọi metric dựa trên nhãn (accuracy, precision, recall, F1, classification
+report) được suy ra từ 1 ma trận nhầm lẫn tính bằng np.bincount; AUC-ROC
+được tính từ 1 lần sắp xếp điểm số. Kết quả khớp với sklearn.metrics.
+"""
+
+import numpy as np
+
+
+TARGET_NAMES = ('No Churn', 'Churn')
+
+
+def _as_binary(y, name):
+    """Chuyển nhãn về mảng intp 0/1, báo lỗi nếu có nhãn khác"""
+    y = np.asarray(y)
+    if y.dtype == bool:
+        return y.astype(np.intp)
+    y = y.astype(np.intp, copy=False)
+    if y.size and (y.min() < 0 or y.max() > 1):
+        raise ValueError(f"{name} chỉ được chứa nhãn 0/1")
+    return y
+
+
+def confusion_counts(y_true, y_pred):
+    """
+    Ma trận nhầm lẫn 2x2 [[TN, FP], [FN, TP]] trong 1 lượt duyệt
+
+    Args:
+        y_true: Nhãn thực tế (0/1)
+        y_pred: Nhãn dự đoán (0/1)
+
+    Returns:
+        np.ndarray: Ma trận nhầm lẫn shape (2, 2), hàng là nhãn thực tế
+    """
+    y_true = _as_binary(y_true, 'y_true')
+    y_pred = _as_binary(y_pred, 'y_pred')
+    if len(y_true) != len(y_pred):
+        raise ValueError("y_true và y_pred phải cùng độ dài")
+    return np.bincount(2 * y_true + y_pred, minlength=4).reshape(2, 2)
+
+
+def _safe_divide(numerator, denominator):
+    # Cùng quy ước với sklearn (zero_division=0): mẫu số 0 cho kết quả 0
+    return numerator / denominator if denominator else 0.0
+
+
+def _class_scores(cm):
+    """Precision, recall, F1, support cho từng lớp từ ma trận nhầm lẫn"""
+    support = cm.sum(axis=1)
+    predicted = cm.sum(axis=0)
+    rows = []
+    for k in range(2):
+        tp = cm[k, k]
+        precision = _safe_divide(tp, predicted[k])
+        recall = _safe_divide(tp, support[k])
+        f1 = _safe_divide(2 * tp, support[k] + predicted[k])
+        rows.append((float(precision), float(recall), float(f1), int(support[k])))
+    return rows
+
+
+def scores_from_confusion(cm):
+    """
+    Accuracy, precision, recall, F1 (lớp dương) từ ma trận nhầm lẫn
+
+    Args:
+        cm: Ma trận nhầm lẫn [[TN, FP], [FN, TP]]
+
+    Returns:
+        dict: accuracy, precision, recall, f1
+    """
+    precision, recall, f1, _ = _class_scores(cm)[1]
+    return {
+        'accuracy': float(_safe_divide(np.trace(cm), cm.sum())),
+        'precision': precision,
+        'recall': recall,
+        'f1': f1
+    }
+
+
+def roc_auc(y_true, y_score):
+    """
+    AUC-ROC từ 1 lần sắp xếp điểm số
+
+    Duyệt điểm giảm dần, cộng dồn TP/FP tại mỗi ngưỡng phân biệt rồi lấy
+    diện tích hình thang (các điểm bằng nhau được tính nửa, như sklearn).
+
+    Args:
+        y_true: Nhãn thực tế (0/1)
+        y_score: Điểm số / xác suất lớp dương
+
+    Returns:
+        float: AUC-ROC
+    """
+    y_true = _as_binary(y_true, 'y_true')
+    y_score = np.asarray(y_score, dtype=np.float64)
+
+    order = np.argsort(y_score)[::-1]
+    y_sorted = y_true[order]
+    score_sorted = y_score[order]
+
+    # Chỉ số cuối của mỗi nhóm điểm bằng nhau
+    last = np.r_[np.flatnonzero(np.diff(score_sorted)), len(score_sorted) - 1]
+    tps = np.r_[0, np.cumsum(y_sorted)[last]]
+    fps = np.r_[0, last + 1 - tps[1:]]
+
+    n_pos, n_neg = tps[-1], fps[-1]
+    if n_pos == 0 or n_neg == 0:
+        raise ValueError("Cần cả 2 lớp trong y_true để tính AUC-ROC")
+    area = np.sum(np.diff(fps) * (tps[1:] + tps[:-1])) / 2
+    return float(area / (n_pos * n_neg))
+
+
+def binary_metrics(y_true, y_pred, y_score):
+    """
+    Toàn bộ metrics nhị phân với 1 ma trận nhầm lẫn và 1 lần sắp xếp
+
+    Args:
+        y_true: Nhãn thực tế (0/1)
+        y_pred: Nhãn dự đoán (0/1)
+        y_score: Xác suất lớp dương
+
+    Returns:
+        tuple: (dict metrics gồm accuracy/precision/recall/f1/auc, ma trận nhầm lẫn)
+    """
+    y_true = _as_binary(y_true, 'y_true')
+    cm = confusion_counts(y_true, y_pred)
+    metrics = scores_from_confusion(cm)
+    metrics['auc'] = roc_auc(y_true, y_score)
+    return metrics, cm
+
+
+def classification_report_from_confusion(cm, target_names=TARGET_NAMES, digits=2):
+    """
+    Classification report (cùng định dạng sklearn) từ ma trận nhầm lẫn
+
+    Args:
+        cm: Ma trận nhầm lẫn [[TN, FP], [FN, TP]]
+        target_names: Tên 2 lớp
+        digits: Số chữ số thập phân
+
+    Returns:
+        str: Báo cáo dạng văn bản
+    """
+    rows = _class_scores(cm)
+    total = int(cm.sum())
+    accuracy = _safe_divide(np.trace(cm), total)
+    macro = [float(np.mean([row[i] for row in rows])) for i in range(3)]
+    weighted = [_safe_divide(sum(row[i] * row[3] for row in rows), total) for i in range(3)]
+
+    headers = ["precision", "recall", "f1-score", "support"]
+    width = max(max(len(name) for name in target_names), len("weighted avg"), digits)
+    head_fmt = "{:>{width}s} " + " {:>9}" * len(headers)
+    row_fmt = "{:>{width}s} " + " {:>9.{digits}f}" * 3 + " {:>9}\n"
+
+    report = head_fmt.format("", *headers, width=width) + "\n\n"
+    for name, (precision, recall, f1, support) in zip(target_names, rows):
+        report += row_fmt.format(name, precision, recall, f1, support,
+                                 width=width, digits=digits)
+    report += "\n"
+
+    accuracy_fmt = "{:>{width}s} " + " {:>9.{digits}}" * 2 + " {:>9.{digits}f}" + " {:>9}\n"
+    report += accuracy_fmt.format("accuracy", "", "", float(accuracy), total,
+                                  width=width, digits=digits)
+    report += row_fmt.format("macro avg", *macro, total, width=width, digits=digits)
+    report += row_fmt.format("weighted avg", *map(float, weighted), total,
+                             width=width, digits=digits)
+    return report
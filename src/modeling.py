@@ -5,17 +5,22 @@ Module huấn luyện mô hình cho dự án Customer Churn
 
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier, VotingClassifier
-from sklearn.model_selection import GridSearchCV
-from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, 
-    f1_score, roc_auc_score, confusion_matrix, 
-    classification_report, roc_curve
-)
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import GridSearchCV, ParameterGrid, StratifiedKFold
+from joblib import Parallel, delayed
+from sklearn.metrics import f1_score
+import os
 import pickle
-import matplotlib.pyplot as plt
-import seaborn as sns
+import time
+from sklearn.base import clone
+import joblib
+from artifacts import load_object, save_object
+from bundle import save_bundle
+from ensemble import PrefitVotingClassifier
+from metrics import binary_metrics, classification_report_from_confusion
+from thresholds import build_decision_policy, validation_scores
+from preprocessing import fit_scaler_incremental, iter_encoded_chunks, schema_feature_columns
 
 
 def train_logistic_regression(X_train, y_train, max_iter=1000):
@@ -37,6 +42,48 @@ def train_logistic_regression(X_train, y_train, max_iter=1000):
     return model
 
 
+def train_logistic_regression_incremental(filepath, chunksize=100_000, n_epochs=5,
+                                          alpha=1e-4, eta0=0.01, random_state=42):
+    """
+    Huấn luyện Logistic Regression out-of-core trên file CSV lớn hơn RAM
+    
+    Lượt 1: fit StandardScaler bằng partial_fit (chỉ đọc các cột số).
+    Các lượt sau: mã hóa + chuẩn hóa từng chunk rồi cập nhật
+    SGDClassifier(loss='log_loss') bằng partial_fit. Bộ nhớ chỉ phụ thuộc
+    chunksize, không phụ thuộc kích thước file.
+    
+    Args:
+        filepath: Đường dẫn file CSV dữ liệu thô (có cột Churn)
+        chunksize: Số dòng mỗi chunk
+        n_epochs: Số lượt duyệt file khi huấn luyện
+        alpha: Hệ số regularization L2 của SGD
+        eta0: Learning rate của SGD
+        random_state: Random seed (xáo trộn dòng trong chunk)
+        
+    Returns:
+        tuple: (model, scaler, feature_columns) dùng trực tiếp với predict.py
+    """
+    print("🔄 Đang huấn luyện Logistic Regression (incremental)...")
+    scaler = fit_scaler_incremental(filepath, chunksize)
+    feature_columns = schema_feature_columns()
+    print(f"✅ Đã fit scaler trên {int(scaler.n_samples_seen_):,} dòng")
+    
+    # Learning rate cố định nhỏ: xác suất gần LogisticRegression hơn lịch 'optimal'
+    # mặc định (bước đầu rất lớn) khi số lượt cập nhật ít
+    model = SGDClassifier(loss='log_loss', alpha=alpha, learning_rate='constant',
+                          eta0=eta0, random_state=random_state)
+    rng = np.random.default_rng(random_state)
+    for epoch in range(n_epochs):
+        for X, y in iter_encoded_chunks(filepath, scaler, chunksize, feature_columns):
+            # File có thể được sắp xếp theo thời gian/khu vực: xáo trộn trong chunk
+            order = rng.permutation(len(y))
+            model.partial_fit(X[order], y[order], classes=[0, 1])
+        print(f"   Epoch {epoch + 1}/{n_epochs} xong")
+    
+    print("✅ Hoàn tất huấn luyện Logistic Regression (incremental)")
+    return model, scaler, feature_columns
+
+
 def train_random_forest(X_train, y_train, n_estimators=100):
     """
     Huấn luyện mô hình Random Forest
@@ -56,66 +103,357 @@ def train_random_forest(X_train, y_train, n_estimators=100):
     return model
 
 
-def optimize_random_forest(X_train, y_train):
+# Lưới siêu tham số cho Random Forest
+RF_PARAM_GRID = {
+    'n_estimators': [50, 100, 200],
+    'max_depth': [10, 20, None],
+    'min_samples_split': [2, 5, 10]
+}
+
+
+class FoldCache:
+    """
+    Cache các fold cross-validation dùng chung cho mọi ứng viên siêu tham số
+    
+    Mỗi fold chỉ được chia train/validation và fit transform (ví dụ
+    StandardScaler, fit trên phần train của fold) đúng 1 lần; mọi ứng viên của
+    mọi lần tìm kiếm dùng lại kết quả. Với cache_dir, các fold được lưu xuống
+    đĩa và các lần chạy sau tải lại bằng memory-map.
+    
+    Thống kê: build_seconds là thời gian dựng toàn bộ fold 1 lần, uses là số
+    lần (ứng viên x fold) đã dùng fold từ cache; time_saved() ước lượng thời
+    gian tiết kiệm so với việc dựng lại fold cho mỗi lần dùng.
     """
-    Tối ưu hóa siêu tham số cho Random Forest bằng GridSearchCV
+    
+    def __init__(self, X, y, cv=5, transformer=None, cache_dir=None):
+        """
+        Args:
+            X, y: Dữ liệu huấn luyện
+            cv: Số fold (StratifiedKFold không xáo trộn, giống GridSearchCV)
+            transformer: Transformer sklearn fit riêng trên từng fold (tùy chọn)
+            cache_dir: Thư mục lưu fold xuống đĩa (None: chỉ giữ trong bộ nhớ)
+        """
+        self.X = X
+        self.y = y
+        self.cv = cv
+        self.transformer = transformer
+        self.cache_dir = cache_dir
+        self.splits = list(StratifiedKFold(n_splits=cv).split(X, y))
+        
+        self.transformers_ = []
+        self.build_seconds = 0.0
+        self.load_seconds = 0.0
+        self.uses = 0
+        self._folds = None
+    
+    def _cache_path(self):
+        key = joblib.hash((self.X, self.y, self.cv, repr(self.transformer)))
+        return os.path.join(self.cache_dir, f"folds-{key}.joblib")
+    
+    def _build(self):
+        """Chia fold và fit transform 1 lần cho mỗi fold"""
+        X = np.asarray(self.X, dtype=np.float64)
+        y = np.asarray(self.y)
+        
+        folds = []
+        for train_idx, val_idx in self.splits:
+            X_tr, X_val = X[train_idx], X[val_idx]
+            transformer = None
+            if self.transformer is not None:
+                transformer = clone(self.transformer)
+                X_tr = transformer.fit_transform(X_tr)
+                X_val = transformer.transform(X_val)
+            folds.append((X_tr, y[train_idx], X_val, y[val_idx]))
+            self.transformers_.append(transformer)
+        return folds
+    
+    def get_folds(self, n_uses=1):
+        """
+        Lấy các fold đã tính sẵn (dựng hoặc tải ở lần gọi đầu tiên)
+        
+        Args:
+            n_uses: Số ứng viên sẽ dùng các fold này (để thống kê)
+            
+        Returns:
+            list: [(X_tr, y_tr, X_val, y_val), ...] dạng mảng NumPy
+        """
+        if self._folds is None:
+            path = self._cache_path() if self.cache_dir else None
+            start = time.perf_counter()
+            if path and os.path.exists(path):
+                cached = joblib.load(path, mmap_mode='r')
+                self._folds = cached['folds']
+                self.transformers_ = cached['transformers']
+                self.build_seconds = cached['build_seconds']
+                self.load_seconds = time.perf_counter() - start
+            else:
+                self._folds = self._build()
+                self.build_seconds = time.perf_counter() - start
+                if path:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    joblib.dump({'folds': self._folds, 'transformers': self.transformers_,
+                                 'build_seconds': self.build_seconds}, path)
+        
+        self.uses += n_uses * len(self._folds)
+        return self._folds
+    
+    def time_saved(self):
+        """Thời gian (giây) tiết kiệm so với dựng lại fold cho mỗi lần dùng"""
+        if not self.uses:
+            return 0.0
+        per_fold = self.build_seconds / len(self.splits)
+        spent = self.load_seconds if self.load_seconds else self.build_seconds
+        return per_fold * self.uses - spent
+    
+    def report(self):
+        """In thống kê sử dụng cache"""
+        source = "tải từ đĩa" if self.load_seconds else "dựng mới"
+        print(f"📦 FoldCache: {len(self.splits)} fold ({source}), {self.uses} lần dùng, "
+              f"dựng {self.build_seconds:.3f}s, tải {self.load_seconds:.3f}s, "
+              f"tiết kiệm ~{self.time_saved():.3f}s")
+
+
+def _fit_and_score_fold(estimator, X_train, y_train, X_val, y_val):
+    """Huấn luyện 1 ứng viên trên 1 fold và trả về F1 trên validation"""
+    estimator.fit(X_train, y_train)
+    return f1_score(y_val, estimator.predict(X_val))
+
+
+def search_with_fold_cache(estimator, param_grid, fold_cache, n_jobs=-1):
+    """
+    Tìm kiếm lưới siêu tham số trên các fold của FoldCache (scoring F1)
+    
+    Các ứng viên được xếp hạng giống GridSearchCV: theo thứ tự ParameterGrid,
+    điểm trung bình các fold, bằng điểm thì lấy ứng viên đầu tiên.
+    
+    Args:
+        estimator: Mô hình sklearn gốc (sẽ được clone cho mỗi ứng viên)
+        param_grid: Lưới siêu tham số
+        fold_cache: FoldCache dùng chung
+        n_jobs: Số process chạy song song
+        
+    Returns:
+        tuple: (best_params, best_score, mean_scores theo thứ tự ParameterGrid)
+    """
+    candidates = list(ParameterGrid(param_grid))
+    folds = fold_cache.get_folds(n_uses=len(candidates))
+    
+    print(f"Fitting {len(folds)} cached folds for each of {len(candidates)} candidates")
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_and_score_fold)(clone(estimator).set_params(**params), *fold)
+        for params in candidates for fold in folds
+    )
+    mean_scores = np.array(scores).reshape(len(candidates), len(folds)).mean(axis=1)
+    best_index = int(np.argmax(mean_scores))
+    return candidates[best_index], mean_scores[best_index], mean_scores
+
+
+def optimize_random_forest(X_train, y_train, search='grid', cv=5, n_jobs=-1,
+                           fold_cache=None):
+    """
+    Tối ưu hóa siêu tham số cho Random Forest
     
     Args:
         X_train: Dữ liệu huấn luyện
         y_train: Nhãn huấn luyện
+        search: Cách tìm kiếm
+            - 'grid': GridSearchCV vét cạn toàn bộ RF_PARAM_GRID
+            - 'halving': Successive halving theo n_estimators - mọi ứng viên
+              (max_depth, min_samples_split) bắt đầu với ít cây, chỉ nửa tốt
+              nhất được tăng gấp đôi số cây ở vòng sau
+            - 'warm_start': Kết quả giống hệt 'grid' nhưng mỗi cặp
+              (max_depth, min_samples_split) chỉ trồng 1 rừng trên mỗi fold,
+              thêm cây dần (warm start) và đánh giá tại từng mốc n_estimators
+        cv: Số fold cross-validation
+        n_jobs: Số process chạy song song
+        fold_cache: FoldCache dùng chung giữa các lần tìm kiếm (tùy chọn); khi
+            có transformer, mô hình trả về là Pipeline(transformer, rf)
         
     Returns:
         best_model: Mô hình tốt nhất sau tối ưu
     """
-    print("🔄 Đang tối ưu hóa Random Forest với GridSearchCV...")
+    rf = RandomForestClassifier(random_state=42)
     
-    param_grid = {
-        'n_estimators': [50, 100, 200],
-        'max_depth': [10, 20, None],
-        'min_samples_split': [2, 5, 10]
-    }
+    if fold_cache is not None and search in ('grid', 'warm_start'):
+        if search == 'grid':
+            print("🔄 Đang tối ưu hóa Random Forest (tìm kiếm lưới trên FoldCache)...")
+            best_params, best_score, _ = search_with_fold_cache(
+                rf, RF_PARAM_GRID, fold_cache, n_jobs
+            )
+            print(f"✅ Tham số tốt nhất: {best_params}")
+            print(f"✅ F1 Score tốt nhất (CV): {best_score:.4f}")
+            best_model = clone(rf).set_params(**best_params)
+        else:
+            print("🔄 Đang tối ưu hóa Random Forest với warm start trên FoldCache...")
+            best_model = _warm_start_search(X_train, y_train, n_jobs=n_jobs,
+                                             fold_cache=fold_cache, refit=False)
+        fold_cache.report()
+        
+        if fold_cache.transformer is not None:
+            from sklearn.pipeline import make_pipeline
+            best_model = make_pipeline(clone(fold_cache.transformer), best_model)
+        best_model.fit(X_train, y_train)
+        return best_model
+    
+    if search == 'grid':
+        print("🔄 Đang tối ưu hóa Random Forest với GridSearchCV...")
+        searcher = GridSearchCV(
+            rf, RF_PARAM_GRID, cv=cv, 
+            scoring='f1', n_jobs=n_jobs, verbose=1
+        )
+    elif search == 'halving':
+        print("🔄 Đang tối ưu hóa Random Forest với Successive Halving...")
+        if fold_cache is not None:
+            if fold_cache.transformer is not None:
+                raise ValueError("Chế độ 'halving' chỉ dùng được FoldCache không có transformer")
+            # Dùng lại các chỉ số fold đã chia sẵn
+            cv = fold_cache.splits
+        from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+        from sklearn.model_selection import HalvingGridSearchCV
+        
+        n_estimators = RF_PARAM_GRID['n_estimators']
+        param_grid = {k: v for k, v in RF_PARAM_GRID.items() if k != 'n_estimators'}
+        searcher = HalvingGridSearchCV(
+            rf, param_grid, cv=cv, scoring='f1', n_jobs=n_jobs, verbose=1,
+            resource='n_estimators', factor=2,
+            min_resources=min(n_estimators) // 2, max_resources=max(n_estimators),
+            random_state=42
+        )
+    elif search == 'warm_start':
+        print("🔄 Đang tối ưu hóa Random Forest với warm start theo n_estimators...")
+        return _warm_start_search(X_train, y_train, cv, n_jobs)
+    else:
+        raise ValueError(
+            f"search không hợp lệ: {search!r} (chọn 'grid', 'halving' hoặc 'warm_start')"
+        )
+    
+    searcher.fit(X_train, y_train)
+    
+    print(f"✅ Tham số tốt nhất: {searcher.best_params_}")
+    print(f"✅ F1 Score tốt nhất (CV): {searcher.best_score_:.4f}")
+    
+    return searcher.best_estimator_
+
+
+def _take_rows(X, indices):
+    """Lấy các dòng theo vị trí (DataFrame/Series hoặc mảng NumPy)"""
+    return X.iloc[indices] if hasattr(X, 'iloc') else X[indices]
+
+
+def _grow_forest_on_fold(X_train, y_train, X_val, y_val, n_estimators_list, params):
+    """
+    Trồng 1 rừng với warm start trên 1 fold, đánh giá F1 tại mỗi mốc số cây
     
-    rf = RandomForestClassifier(random_state=42)
-    grid_search = GridSearchCV(
-        rf, param_grid, cv=5, 
-        scoring='f1', n_jobs=-1, verbose=1
-    )
+    Với cùng random_state, rừng N cây trồng thêm bằng warm start giống hệt
+    rừng N cây huấn luyện từ đầu (sklearn sinh seed cho từng cây theo thứ tự).
+    
+    Returns:
+        list: F1 trên tập validation tương ứng với từng n_estimators
+    """
+    rf = RandomForestClassifier(random_state=42, warm_start=True, **params)
+    scores = []
+    for n_estimators in n_estimators_list:
+        rf.set_params(n_estimators=n_estimators)
+        rf.fit(X_train, y_train)
+        scores.append(f1_score(y_val, rf.predict(X_val)))
+    return scores
+
+
+def _warm_start_search(X_train, y_train, cv=5, n_jobs=-1, fold_cache=None, refit=True):
+    """
+    Tìm kiếm lưới RF_PARAM_GRID với warm start theo n_estimators
     
-    grid_search.fit(X_train, y_train)
+    Cho cùng điểm CV, cùng tham số tốt nhất (kể cả cách chọn khi bằng điểm) và
+    cùng mô hình cuối như GridSearchCV(cv=cv, scoring='f1'), nhưng tổng số cây
+    phải huấn luyện mỗi fold là max(n_estimators) thay vì sum(n_estimators).
     
-    print(f"✅ Tham số tốt nhất: {grid_search.best_params_}")
-    print(f"✅ F1 Score tốt nhất (CV): {grid_search.best_score_:.4f}")
+    Args:
+        X_train, y_train: Dữ liệu huấn luyện
+        cv: Số fold (StratifiedKFold không xáo trộn, giống GridSearchCV)
+        n_jobs: Số process chạy song song
+        fold_cache: FoldCache chứa các fold tính sẵn (tùy chọn)
+        refit: Huấn luyện lại mô hình tốt nhất trên toàn bộ X_train
+        
+    Returns:
+        best_model: Mô hình tốt nhất (đã huấn luyện lại nếu refit=True)
+    """
+    n_estimators_list = sorted(RF_PARAM_GRID['n_estimators'])
+    tree_grid = list(ParameterGrid(
+        {k: v for k, v in RF_PARAM_GRID.items() if k != 'n_estimators'}
+    ))
+    
+    if fold_cache is not None:
+        # Mỗi rừng warm start thay cho len(n_estimators_list) ứng viên
+        folds = fold_cache.get_folds(n_uses=len(tree_grid) * len(n_estimators_list))
+    else:
+        splits = StratifiedKFold(n_splits=cv).split(X_train, y_train)
+        folds = [
+            (_take_rows(X_train, tr), _take_rows(y_train, tr),
+             _take_rows(X_train, va), _take_rows(y_train, va))
+            for tr, va in splits
+        ]
+    
+    print(f"Fitting {len(folds)} folds for each of {len(tree_grid)} forests, "
+          f"growing {n_estimators_list} trees")
+    fold_scores = Parallel(n_jobs=n_jobs)(
+        delayed(_grow_forest_on_fold)(*fold, n_estimators_list, params)
+        for params in tree_grid for fold in folds
+    )
     
-    return grid_search.best_estimator_
+    # Điểm trung bình theo đúng thứ tự ParameterGrid(RF_PARAM_GRID) của GridSearchCV
+    results = {}
+    for i, params in enumerate(tree_grid):
+        scores = np.array(fold_scores[i * len(folds):(i + 1) * len(folds)])
+        for j, n_estimators in enumerate(n_estimators_list):
+            key = tuple(sorted({**params, 'n_estimators': n_estimators}.items()))
+            results[key] = scores[:, j].mean()
+    
+    candidates = list(ParameterGrid(RF_PARAM_GRID))
+    mean_scores = [results[tuple(sorted(c.items()))] for c in candidates]
+    best_index = int(np.argmax(mean_scores))
+    best_params = candidates[best_index]
+    
+    print(f"✅ Tham số tốt nhất: {best_params}")
+    print(f"✅ F1 Score tốt nhất (CV): {mean_scores[best_index]:.4f}")
+    
+    best_model = RandomForestClassifier(random_state=42, **best_params)
+    if refit:
+        best_model.fit(X_train, y_train)
+    return best_model
 
 
-def train_ensemble(X_train, y_train, lr_model, rf_model):
+def train_ensemble(X_train, y_train, lr_model, rf_model, weights=None, n_jobs=-1):
     """
     Tạo mô hình Ensemble Voting từ Logistic Regression và Random Forest
     
+    Các mô hình thành viên đã được huấn luyện nên chỉ kết hợp xác suất của
+    chúng (soft voting), không clone và huấn luyện lại như VotingClassifier.
+    
     Args:
-        X_train: Dữ liệu huấn luyện
-        y_train: Nhãn huấn luyện
-        lr_model: Mô hình Logistic Regression
-        rf_model: Mô hình Random Forest
+        X_train: Dữ liệu huấn luyện (không dùng để huấn luyện lại)
+        y_train: Nhãn huấn luyện (không dùng để huấn luyện lại)
+        lr_model: Mô hình Logistic Regression đã huấn luyện
+        rf_model: Mô hình Random Forest đã huấn luyện
+        weights: Trọng số soft voting cho [lr, rf] (None: bằng nhau)
+        n_jobs: Số thread chấm điểm thành viên song song (-1: mỗi mô hình 1 thread)
         
     Returns:
         ensemble_model: Mô hình Ensemble
     """
     print("🔄 Đang tạo Ensemble Voting Classifier...")
     
-    ensemble = VotingClassifier(
+    ensemble = PrefitVotingClassifier(
         estimators=[('lr', lr_model), ('rf', rf_model)],
-        voting='soft'
+        weights=weights, n_jobs=n_jobs
     )
     
-    ensemble.fit(X_train, y_train)
-    print("✅ Hoàn tất huấn luyện Ensemble")
+    ensemble.fit()
+    print("✅ Hoàn tất tạo Ensemble (dùng lại mô hình đã huấn luyện)")
     
     return ensemble
 
 
-def evaluate_model(model, X_test, y_test, model_name="Model"):
+def evaluate_model(model, X_test, y_test, model_name="Model", cache=None):
     """
     Đánh giá mô hình và in ra các metrics
     
@@ -124,6 +462,8 @@ def evaluate_model(model, X_test, y_test, model_name="Model"):
         X_test: Dữ liệu kiểm tra
         y_test: Nhãn thực tế
         model_name: Tên mô hình
+        cache: PredictionCache dùng lại xác suất giữa các lần đánh giá
+            (None: luôn chấm điểm lại, không giữ kết quả trong bộ nhớ)
         
     Returns:
         dict: Dictionary chứa các metrics
@@ -131,16 +471,13 @@ def evaluate_model(model, X_test, y_test, model_name="Model"):
     print(f"\n📊 Đánh giá {model_name}:")
     print("="*50)
     
-    y_pred = model.predict(X_test)
-    y_proba = model.predict_proba(X_test)[:, 1]
+    # 1 lần predict_proba (hoặc lấy từ cache): nhãn dự đoán là lớp có xác suất lớn nhất
+    proba = cache.predict_proba(model, X_test) if cache is not None else model.predict_proba(X_test)
+    y_pred = model.classes_[np.argmax(proba, axis=1)]
+    y_proba = proba[:, 1]
     
-    metrics = {
-        'accuracy': accuracy_score(y_test, y_pred),
-        'precision': precision_score(y_test, y_pred),
-        'recall': recall_score(y_test, y_pred),
-        'f1': f1_score(y_test, y_pred),
-        'auc': roc_auc_score(y_test, y_proba)
-    }
+    # 1 ma trận nhầm lẫn + 1 lần sắp xếp điểm cho mọi metrics
+    metrics, cm = binary_metrics(y_test, y_pred, y_proba)
     
     print(f"Accuracy:  {metrics['accuracy']:.4f}")
     print(f"Precision: {metrics['precision']:.4f}")
@@ -149,13 +486,12 @@ def evaluate_model(model, X_test, y_test, model_name="Model"):
     print(f"AUC-ROC:   {metrics['auc']:.4f}")
     
     print("\n📋 Classification Report:")
-    print(classification_report(y_test, y_pred, 
-                                target_names=['No Churn', 'Churn']))
+    print(classification_report_from_confusion(cm, target_names=['No Churn', 'Churn']))
     
     return metrics
 
 
-def compare_models(models_dict, X_test, y_test):
+def compare_models(models_dict, X_test, y_test, cache=None):
     """
     So sánh nhiều mô hình
     
@@ -163,14 +499,18 @@ def compare_models(models_dict, X_test, y_test):
         models_dict: Dictionary {tên_mô_hình: mô_hình}
         X_test: Dữ liệu kiểm tra
         y_test: Nhãn thực tế
+        cache: PredictionCache dùng lại xác suất giữa các lần đánh giá
+            (None: luôn chấm điểm lại)
         
     Returns:
         pd.DataFrame: Bảng so sánh metrics
     """
     results = []
+    # Chuyển nhãn về ndarray 1 lần cho mọi mô hình
+    y_test = np.asarray(y_test)
     
     for name, model in models_dict.items():
-        metrics = evaluate_model(model, X_test, y_test, name)
+        metrics = evaluate_model(model, X_test, y_test, name, cache=cache)
         metrics['model'] = name
         results.append(metrics)
     
@@ -187,14 +527,13 @@ def compare_models(models_dict, X_test, y_test):
 
 def save_model(model, filepath):
     """
-    Lưu mô hình vào file .pkl
+    Lưu mô hình vào file .pkl (hoặc .artifact: mảng nhị phân, tải bằng memory-map)
     
     Args:
         model: Mô hình cần lưu
         filepath: Đường dẫn file output
     """
-    with open(filepath, 'wb') as f:
-        pickle.dump(model, f)
+    save_object(model, filepath)
     print(f"✅ Đã lưu mô hình tại: {filepath}")
 
 
@@ -213,7 +552,7 @@ def save_feature_columns(columns, filepath):
 
 def load_model(filepath):
     """
-    Tải mô hình từ file .pkl
+    Tải mô hình từ file .pkl hoặc .artifact
     
     Args:
         filepath: Đường dẫn file mô hình
@@ -221,8 +560,7 @@ def load_model(filepath):
     Returns:
         model: Mô hình đã tải
     """
-    with open(filepath, 'rb') as f:
-        model = pickle.load(f)
+    model = load_object(filepath)
     print(f"✅ Đã tải mô hình từ: {filepath}")
     return model
 
@@ -233,7 +571,10 @@ if __name__ == "__main__":
     
     # Tiền xử lý dữ liệu
     filepath = "../WA_Fn-UseC_-Telco-Customer-Churn.csv"
-    X_train, X_test, y_train, y_test, scaler = preprocess_pipeline(filepath)
+    # Cache dữ liệu đã mã hóa: các lần chạy sau bỏ qua bước đọc/parse CSV
+    X_train, X_test, y_train, y_test, scaler = preprocess_pipeline(
+        filepath, cache_dir="../.cache"
+    )
     
     # Huấn luyện các mô hình
     lr_model = train_logistic_regression(X_train, y_train)
@@ -259,3 +600,13 @@ if __name__ == "__main__":
     save_model(best_rf, "../models/best_rf_model.pkl")
     save_model(scaler, "../models/scaler.pkl")
     save_feature_columns(X_train.columns.tolist(), "../models/feature_columns.pkl")
+    
+    # Ngưỡng quyết định + mức rủi ro chọn trên xác suất out-of-fold của tập train
+    # (tập test chỉ dùng để báo cáo metrics); chỉ lưu trong gói cùng mô hình
+    y_score = validation_scores(best_rf, X_train, y_train)
+    policy = build_decision_policy(y_train, y_score)
+    
+    # Gói 1 file cho triển khai (predict.py, service.py, demo/app.py); ngưỡng
+    # trong gói chỉ được dùng khi chỉ định (--bundle-threshold)
+    save_bundle("../models/churn_model.bundle", best_rf, scaler,
+                X_train.columns.tolist(), policy)
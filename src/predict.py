@@ -1,11 +1,37 @@
 """
 Module dự đoán cho dự án Customer Churn
 Áp dụng theo CRISP-DM Phase 6: Deployment
+
+Đường dự đoán (tải mô hình, FeatureEncoder, predict_churn với encoder) chỉ cần
+NumPy: pandas chỉ được import trong các hàm đọc/ghi DataFrame, CSV, nên
+import module này (và service.py) khởi động nhanh.
 """
 
-import pandas as pd
+import io
+import os
+import shutil
+import tempfile
 import numpy as np
-import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from artifacts import ARTIFACT_EXTENSION, MODELS_DIR, load_object, save_artifact
+from bundle import DEFAULT_BUNDLE_PATH, load_bundle
+from encoder import FeatureEncoder
+from fast_scoring import FlatForest, LinearScorer
+from thresholds import default_decision_policy, load_decision_policy, risk_level
+
+
+# Ngưỡng quyết định mặc định: Churn khi xác suất churn > ngưỡng
+# (0.5 cho kết quả giống model.predict() của sklearn)
+DEFAULT_THRESHOLD = 0.5
+
+# Thư mục tạm trên RAM (tmpfs) cho mô hình dùng chung giữa các worker
+SHARED_MEMORY_DIR = '/dev/shm'
+
+# Các file mô hình riêng lẻ (dùng khi không có gói mô hình)
+DEFAULT_MODEL_PATH = os.path.join(MODELS_DIR, 'logistic_model.pkl')
+DEFAULT_SCALER_PATH = os.path.join(MODELS_DIR, 'scaler.pkl')
+DEFAULT_FEATURE_COLUMNS_PATH = os.path.join(MODELS_DIR, 'feature_columns.pkl')
 
 
 def load_model_and_scaler(model_path, scaler_path, feature_cols_path=None):
@@ -13,24 +39,20 @@ def load_model_and_scaler(model_path, scaler_path, feature_cols_path=None):
     Tải mô hình, scaler và danh sách feature columns
     
     Args:
-        model_path: Đường dẫn đến file mô hình .pkl
-        scaler_path: Đường dẫn đến file scaler .pkl
+        model_path: Đường dẫn đến file mô hình .pkl hoặc .artifact
+        scaler_path: Đường dẫn đến file scaler .pkl hoặc .artifact
         feature_cols_path: Đường dẫn đến file feature_columns.pkl
         
     Returns:
         tuple: (model, scaler, feature_columns)
     """
-    with open(model_path, 'rb') as f:
-        model = pickle.load(f)
-    
-    with open(scaler_path, 'rb') as f:
-        scaler = pickle.load(f)
+    model = load_object(model_path)
+    scaler = load_object(scaler_path)
     
     feature_columns = None
     if feature_cols_path:
         try:
-            with open(feature_cols_path, 'rb') as f:
-                feature_columns = pickle.load(f)
+            feature_columns = load_object(feature_cols_path)
         except FileNotFoundError:
             print("⚠️  Không tìm thấy file feature_columns.pkl")
     
@@ -50,13 +72,14 @@ def preprocess_input(data, scaler, feature_columns=None):
     Returns:
         pd.DataFrame: Dữ liệu đã xử lý sẵn sàng cho dự đoán
     """
+    import pandas as pd
+    
     if isinstance(data, dict):
         data = pd.DataFrame([data])
     
     # Xử lý TotalCharges
     if 'TotalCharges' in data.columns:
-        data['TotalCharges'] = pd.to_numeric(data['TotalCharges'], errors='coerce')
-        data['TotalCharges'].fillna(0, inplace=True)
+        data['TotalCharges'] = pd.to_numeric(data['TotalCharges'], errors='coerce').fillna(0)
     
     # Xóa customerID nếu có
     if 'customerID' in data.columns:
@@ -69,22 +92,154 @@ def preprocess_input(data, scaler, feature_columns=None):
         data[numeric_cols_to_scale] = scaler.transform(data[numeric_cols_to_scale])
     
     # One-Hot Encoding SAU KHI đã scale
-    data = pd.get_dummies(data, drop_first=True)
+    # Khi đã có feature_columns thì không drop_first: cột của category gốc
+    # không có trong feature_columns nên sẽ bị loại ở bước align. Nhờ vậy kết
+    # quả không phụ thuộc vào việc dữ liệu đầu vào có đủ mọi category hay không
+    # (1 khách hàng, hoặc 1 chunk khi dự đoán streaming).
+    data = pd.get_dummies(data, drop_first=feature_columns is None)
     
     # Align columns với training data
     if feature_columns is not None:
-        # Thêm các cột thiếu với giá trị 0
-        for col in feature_columns:
-            if col not in data.columns:
-                data[col] = 0
-        
-        # Giữ lại và sắp xếp theo đúng thứ tự các cột từ training
-        data = data[feature_columns]
+        # Align 1 lần bằng reindex: thêm các cột thiếu với giá trị 0, bỏ cột
+        # thừa và sắp xếp theo đúng thứ tự các cột từ training
+        data = data.reindex(columns=feature_columns, fill_value=0)
     
     return data
 
 
-def predict_churn(model, scaler, customer_data, feature_columns=None):
+def build_encoder(scaler, feature_columns, vocabulary=None):
+    """
+    Biên dịch encoder schema cố định từ scaler và feature_columns
+    
+    Nên gọi 1 lần sau load_model_and_scaler() rồi truyền vào predict_churn()
+    / predict_batch() qua tham số encoder để bỏ qua pd.get_dummies.
+    
+    Args:
+        scaler: Scaler đã fit từ tập huấn luyện
+        feature_columns: Danh sách tên cột từ lúc train
+        vocabulary: Vocabulary category lúc train, ví dụ bundle['vocabulary']
+            (None: suy ra từ tên cột dummy)
+        
+    Returns:
+        FeatureEncoder: Encoder đã biên dịch
+    """
+    return FeatureEncoder(feature_columns, scaler, vocabulary)
+
+
+def prepare_scoring_model(model, scaler, feature_columns, vocabulary=None, flat_forest=False):
+    """
+    Chọn engine dự đoán cho mô hình đã tải và encoder tương ứng
+    
+    Logistic Regression nhị phân được gộp với scaler thành LinearScorer (chỉ
+    cần NumPy). Random Forest được chuyển sang FlatForest nếu flat_forest=True
+    (nhanh hơn với batch nhỏ, chậm hơn sklearn với chunk lớn). Mô hình khác
+    giữ nguyên và dùng FeatureEncoder.
+    
+    Args:
+        model: Mô hình đã huấn luyện
+        scaler: Scaler dùng lúc train
+        feature_columns: Danh sách tên cột từ lúc train
+        vocabulary: Vocabulary category từ gói mô hình (None: suy ra từ feature_columns)
+        flat_forest: Dùng FlatForest cho Random Forest
+        
+    Returns:
+        tuple: (model, encoder) dùng với predict_with_threshold / predict_churn
+    """
+    if hasattr(model, 'coef_') and model.coef_.shape[0] == 1:
+        scorer = LinearScorer.from_model(model, scaler, feature_columns, vocabulary)
+        return scorer, scorer.encoder
+    if flat_forest and hasattr(model, 'estimators_') and hasattr(model.estimators_[0], 'tree_'):
+        model = FlatForest.from_model(model)
+    return model, build_encoder(scaler, feature_columns, vocabulary)
+
+
+def load_scoring_model(bundle_path=DEFAULT_BUNDLE_PATH, model_path=DEFAULT_MODEL_PATH,
+                       scaler_path=DEFAULT_SCALER_PATH,
+                       feature_cols_path=DEFAULT_FEATURE_COLUMNS_PATH,
+                       thresholds_path=None, flat_forest=False, bundle_policy=False):
+    """
+    Tải mô hình đã lưu, sẵn sàng để dự đoán (dùng chung cho CLI, dịch vụ và demo)
+    
+    Dùng gói mô hình nếu tồn tại; ngược lại dùng các file .pkl riêng lẻ. Ngưỡng
+    quyết định mặc định là 0.5 / 0.7; ngưỡng đã chọn bằng thresholds.py chỉ
+    được dùng khi chỉ định rõ.
+    
+    Args:
+        bundle_path: Đường dẫn gói mô hình (None: bỏ qua gói)
+        model_path, scaler_path, feature_cols_path: Các file riêng lẻ
+        thresholds_path: File ngưỡng từ thresholds.py, phải được chọn cho đúng
+            model_path (chỉ dùng với các file riêng lẻ)
+        flat_forest: Xem prepare_scoring_model()
+        bundle_policy: Dùng ngưỡng lưu trong gói mô hình
+        
+    Returns:
+        tuple: (model, encoder, policy)
+    """
+    policy = default_decision_policy()
+    if bundle_path and os.path.exists(bundle_path):
+        if thresholds_path:
+            raise ValueError("File ngưỡng chỉ dùng với các file mô hình riêng lẻ; "
+                             "gói mô hình có ngưỡng riêng (bundle_policy)")
+        bundle = load_bundle(bundle_path)
+        model, scaler, feature_columns = bundle['model'], bundle['scaler'], bundle['feature_columns']
+        vocabulary = bundle['vocabulary']
+        if bundle_policy:
+            policy = bundle['thresholds']
+    else:
+        if bundle_policy:
+            raise ValueError(f"Không tìm thấy gói mô hình {bundle_path}")
+        model, scaler, feature_columns = load_model_and_scaler(
+            model_path, scaler_path, feature_cols_path
+        )
+        if feature_columns is None:
+            raise ValueError("Cần feature_columns.pkl để mã hóa dữ liệu")
+        vocabulary = None
+        if thresholds_path:
+            policy = load_decision_policy(thresholds_path, model_path)
+    
+    model, encoder = prepare_scoring_model(model, scaler, feature_columns, vocabulary, flat_forest)
+    return model, encoder, policy
+
+
+def encode_features(model, scaler, data, feature_columns=None, encoder=None):
+    """
+    Tiền xử lý dữ liệu thô thành input cho mô hình
+    
+    Dùng encoder biên dịch sẵn nếu có, ngược lại dùng preprocess_input.
+    """
+    if encoder is None:
+        return preprocess_input(data, scaler, feature_columns)
+    
+    X = encoder.transform(data)
+    # Mô hình fit bằng DataFrame cần tên cột (bọc ma trận, không copy)
+    if hasattr(model, 'feature_names_in_'):
+        import pandas as pd
+        X = pd.DataFrame(X, columns=encoder.feature_columns, copy=False)
+    return X
+
+
+def predict_with_threshold(model, X, threshold=DEFAULT_THRESHOLD):
+    """
+    Dự đoán 1 lần duy nhất: tính xác suất rồi suy ra nhãn từ ngưỡng
+    
+    Thay cho việc gọi model.predict() rồi model.predict_proba() (chạy mô hình
+    2 lần, ví dụ mọi cây của Random Forest).
+    
+    Args:
+        model: Mô hình đã huấn luyện (có predict_proba, lớp 1 = Churn)
+        X: Dữ liệu đã tiền xử lý
+        threshold: Ngưỡng quyết định cho xác suất churn
+        
+    Returns:
+        tuple: (is_churn, probabilities) - mảng bool và ma trận xác suất (n, 2)
+    """
+    probabilities = model.predict_proba(X)
+    is_churn = probabilities[:, 1] > threshold
+    return is_churn, probabilities
+
+
+def predict_churn(model, scaler, customer_data, feature_columns=None, encoder=None,
+                  threshold=DEFAULT_THRESHOLD):
     """
     Dự đoán khả năng churn cho khách hàng
     
@@ -93,19 +248,21 @@ def predict_churn(model, scaler, customer_data, feature_columns=None):
         scaler: Scaler để chuẩn hóa dữ liệu
         customer_data: Dữ liệu khách hàng (dict hoặc DataFrame)
         feature_columns: Danh sách tên cột từ lúc train
+        encoder: FeatureEncoder từ build_encoder() (tùy chọn, nhanh hơn)
+        threshold: Ngưỡng quyết định cho xác suất churn
         
     Returns:
         dict: Kết quả dự đoán {prediction, probability}
     """
     # Tiền xử lý
-    X = preprocess_input(customer_data, scaler, feature_columns)
+    X = encode_features(model, scaler, customer_data, feature_columns, encoder)
     
-    # Dự đoán
-    prediction = model.predict(X)[0]
-    probability = model.predict_proba(X)[0]
+    # Dự đoán (1 lần)
+    is_churn, probabilities = predict_with_threshold(model, X, threshold)
+    probability = probabilities[0]
     
     result = {
-        'prediction': 'Churn' if prediction == 1 else 'No Churn',
+        'prediction': 'Churn' if is_churn[0] else 'No Churn',
         'churn_probability': probability[1],
         'no_churn_probability': probability[0]
     }
@@ -113,48 +270,277 @@ def predict_churn(model, scaler, customer_data, feature_columns=None):
     return result
 
 
-def predict_batch(model, scaler, filepath, feature_columns=None):
+def _score_frame(model, scaler, df, feature_columns=None, encoder=None,
+                 threshold=DEFAULT_THRESHOLD):
     """
-    Dự đoán hàng loạt từ file CSV
+    Dự đoán cho một DataFrame dữ liệu thô (dùng chung cho batch và streaming)
     
     Args:
         model: Mô hình đã huấn luyện
         scaler: Scaler để chuẩn hóa
-        filepath: Đường dẫn file CSV chứa dữ liệu khách hàng
+        df: DataFrame dữ liệu khách hàng (sẽ bị sửa trực tiếp)
         feature_columns: Danh sách tên cột từ lúc train
+        encoder: FeatureEncoder từ build_encoder() (tùy chọn)
+        threshold: Ngưỡng quyết định cho xác suất churn
         
     Returns:
         pd.DataFrame: DataFrame kết quả với cột dự đoán và xác suất
     """
-    # Tải dữ liệu
-    df = pd.read_csv(filepath)
+    import pandas as pd
     
     # Lưu customerID nếu có
     customer_ids = df['customerID'] if 'customerID' in df.columns else None
     
     # Tiền xử lý
-    X = preprocess_input(df.copy(), scaler, feature_columns)
+    X = encode_features(model, scaler, df, feature_columns, encoder)
     
-    # Dự đoán
-    predictions = model.predict(X)
-    probabilities = model.predict_proba(X)[:, 1]
+    # Dự đoán (1 lần)
+    is_churn, probabilities = predict_with_threshold(model, X, threshold)
     
     # Tạo DataFrame kết quả
     results = pd.DataFrame({
         'customerID': customer_ids,
-        'prediction': ['Churn' if p == 1 else 'No Churn' for p in predictions],
-        'churn_probability': probabilities
+        'prediction': np.where(is_churn, 'Churn', 'No Churn'),
+        'churn_probability': probabilities[:, 1]
     })
     
     return results
 
 
-def display_prediction(result):
+def predict_batch(model, scaler, filepath, feature_columns=None, encoder=None,
+                  threshold=DEFAULT_THRESHOLD):
+    """
+    Dự đoán hàng loạt từ file CSV
+    
+    Args:
+        model: Mô hình đã huấn luyện
+        scaler: Scaler để chuẩn hóa
+        filepath: Đường dẫn file CSV chứa dữ liệu khách hàng
+        feature_columns: Danh sách tên cột từ lúc train
+        encoder: FeatureEncoder từ build_encoder() (tùy chọn)
+        threshold: Ngưỡng quyết định cho xác suất churn
+        
+    Returns:
+        pd.DataFrame: DataFrame kết quả với cột dự đoán và xác suất
+    """
+    import pandas as pd
+    
+    # Tải dữ liệu (df chỉ dùng nội bộ nên không cần copy)
+    df = pd.read_csv(filepath)
+    
+    return _score_frame(model, scaler, df, feature_columns, encoder, threshold)
+
+
+def predict_batch_stream(model, scaler, filepath, output, feature_columns,
+                         chunksize=100_000, encoder=None, threshold=DEFAULT_THRESHOLD):
+    """
+    Dự đoán hàng loạt theo chế độ streaming cho file CSV rất lớn
+    
+    Đọc file theo từng chunk, dự đoán từng chunk và ghi kết quả nối tiếp vào
+    output, nên bộ nhớ chỉ phụ thuộc vào chunksize chứ không phụ thuộc kích
+    thước file. Kết quả ghi ra khớp từng dòng với predict_batch() (xác suất chỉ
+    có thể lệch ở mức sai số làm tròn float do BLAS tính theo khối khác nhau).
+    
+    Args:
+        model: Mô hình đã huấn luyện
+        scaler: Scaler để chuẩn hóa
+        filepath: Đường dẫn (hoặc file object) CSV chứa dữ liệu khách hàng
+        output: Đường dẫn file CSV kết quả hoặc file object đang mở để ghi
+        feature_columns: Danh sách tên cột từ lúc train (bắt buộc để mọi
+            chunk có cùng cột)
+        chunksize: Số dòng mỗi chunk
+        encoder: FeatureEncoder từ build_encoder() (tùy chọn)
+        threshold: Ngưỡng quyết định cho xác suất churn
+        
+    Returns:
+        int: Tổng số khách hàng đã dự đoán
+    """
+    if feature_columns is None:
+        raise ValueError("Chế độ streaming cần feature_columns để align các chunk")
+    
+    import pandas as pd
+    
+    owns_output = isinstance(output, (str, os.PathLike))
+    out = open(output, 'w', newline='') if owns_output else output
+    
+    n_rows = 0
+    try:
+        for chunk in pd.read_csv(filepath, chunksize=chunksize):
+            results = _score_frame(model, scaler, chunk, feature_columns, encoder, threshold)
+            results.to_csv(out, header=(n_rows == 0), index=False)
+            n_rows += len(results)
+    finally:
+        if owns_output:
+            out.close()
+    
+    return n_rows
+
+
+# Trạng thái của mỗi process worker, được gán 1 lần bởi init_worker
+WORKER_STATE = {}
+
+
+def export_shared_model(model, filepath):
+    """
+    Lưu mô hình thành artifact mà nhiều process map chung được (không chép)
+    
+    Random Forest được lưu dạng FlatForest vì cây sklearn tự chép mảng node
+    vào bộ nhớ riêng khi tải; mô hình khác được lưu nguyên dạng.
+    
+    Args:
+        model: Mô hình đã huấn luyện
+        filepath: Đường dẫn file .artifact
+        
+    Returns:
+        str: filepath
+    """
+    if hasattr(model, 'estimators_') and hasattr(model.estimators_[0], 'tree_'):
+        model = FlatForest.from_model(model)
+    save_artifact(model, filepath)
+    return filepath
+
+
+def init_worker(model, scaler, feature_columns, encoder, threshold):
+    """
+    Khởi tạo worker: giữ mô hình trong biến toàn cục của process
+    
+    Mô hình chỉ được truyền 1 lần cho mỗi worker (không pickle lại theo từng
+    shard); với start method 'fork' worker dùng chung bộ nhớ với process cha.
+    Nếu model là đường dẫn file .artifact, mỗi worker memory-map cùng 1 file:
+    các mảng số chỉ có 1 bản trong page cache cho mọi worker.
+    """
+    if isinstance(model, (str, os.PathLike)):
+        model = load_object(model)
+    WORKER_STATE.update(
+        model=model, scaler=scaler, feature_columns=feature_columns,
+        encoder=encoder, threshold=threshold
+    )
+
+
+def _shard_offsets(filepath, n_shards):
+    """
+    Chia file CSV thành các khoảng byte, mỗi khoảng bắt đầu ở đầu 1 dòng
+    
+    Giả định không có trường nào chứa ký tự xuống dòng (đúng với dữ liệu Telco).
+    
+    Returns:
+        tuple: (header, [(start, end), ...])
+    """
+    size = os.path.getsize(filepath)
+    with open(filepath, 'rb') as f:
+        header = f.readline()
+        data_start = f.tell()
+        
+        bounds = [data_start]
+        step = max(1, (size - data_start) // n_shards)
+        for i in range(1, n_shards):
+            f.seek(max(data_start + i * step, bounds[-1]))
+            f.readline()
+            bounds.append(min(f.tell(), size))
+        bounds.append(size)
+    
+    shards = [(start, end) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+    return header, shards
+
+
+def _score_shard(task):
+    """Worker: đọc 1 khoảng byte của file CSV, tiền xử lý và dự đoán"""
+    import pandas as pd
+    
+    filepath, header, start, end = task
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        raw = f.read(end - start)
+    
+    df = pd.read_csv(io.BytesIO(header + raw))
+    state = WORKER_STATE
+    return _score_frame(state['model'], state['scaler'], df, state['feature_columns'],
+                        state['encoder'], state['threshold'])
+
+
+def predict_batch_parallel(model, scaler, filepath, feature_columns, output=None,
+                           n_workers=None, shard_size=50_000_000, encoder=None,
+                           threshold=DEFAULT_THRESHOLD, shared_model=False, mp_context=None):
+    """
+    Dự đoán hàng loạt song song trên nhiều core bằng process pool
+    
+    File CSV được chia thành các shard theo khoảng byte; mỗi worker tự đọc,
+    tiền xử lý và dự đoán shard của mình (pandas giữ GIL nên cần process chứ
+    không phải thread). Kết quả được ghép lại đúng thứ tự dòng của file.
+    
+    Args:
+        model: Mô hình đã huấn luyện, hoặc đường dẫn file .artifact (mỗi worker
+            tự map file, xem export_shared_model)
+        scaler: Scaler để chuẩn hóa
+        filepath: Đường dẫn file CSV chứa dữ liệu khách hàng
+        feature_columns: Danh sách tên cột từ lúc train (bắt buộc)
+        output: Đường dẫn/file object CSV để ghi dần kết quả (None: trả về DataFrame)
+        n_workers: Số process (mặc định: số core)
+        shard_size: Kích thước xấp xỉ (byte) của mỗi shard
+        encoder: FeatureEncoder từ build_encoder() (tùy chọn)
+        threshold: Ngưỡng quyết định cho xác suất churn
+        shared_model: True để ghi mô hình ra artifact tạm (trên /dev/shm nếu
+            có) cho mọi worker map chung thay vì mỗi worker giữ 1 bản riêng.
+            Random Forest khi đó chạy bằng FlatForest (ít bộ nhớ hơn nhiều
+            worker, nhưng chậm hơn sklearn với shard lớn)
+        mp_context: multiprocessing context cho process pool (None: mặc định)
+        
+    Returns:
+        pd.DataFrame hoặc int: DataFrame kết quả, hoặc số dòng đã ghi nếu có output
+    """
+    if feature_columns is None:
+        raise ValueError("Chế độ song song cần feature_columns để align các shard")
+    
+    n_workers = n_workers or os.cpu_count() or 1
+    size = os.path.getsize(filepath)
+    # Ít nhất mỗi worker 1 shard, các shard không lớn hơn shard_size
+    n_shards = max(n_workers, -(-size // shard_size))
+    header, shards = _shard_offsets(filepath, n_shards)
+    tasks = [(filepath, header, start, end) for start, end in shards]
+    
+    shared_dir = None
+    if shared_model and not isinstance(model, (str, os.PathLike)):
+        shared_dir = tempfile.mkdtemp(
+            dir=SHARED_MEMORY_DIR if os.path.isdir(SHARED_MEMORY_DIR) else None
+        )
+        model = export_shared_model(model, os.path.join(shared_dir, 'model' + ARTIFACT_EXTENSION))
+    
+    owns_output = isinstance(output, (str, os.PathLike))
+    out = open(output, 'w', newline='') if owns_output else output
+    
+    parts = []
+    n_rows = 0
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_workers, mp_context=mp_context, initializer=init_worker,
+            initargs=(model, scaler, feature_columns, encoder, threshold)
+        ) as executor:
+            # executor.map trả kết quả theo đúng thứ tự shard
+            for results in executor.map(_score_shard, tasks):
+                if out is None:
+                    parts.append(results)
+                else:
+                    results.to_csv(out, header=(n_rows == 0), index=False)
+                n_rows += len(results)
+    finally:
+        if owns_output:
+            out.close()
+        if shared_dir:
+            shutil.rmtree(shared_dir, ignore_errors=True)
+    
+    if out is not None:
+        return n_rows
+    import pandas as pd
+    return pd.concat(parts, ignore_index=True)
+
+
+def display_prediction(result, risk_bands=None):
     """
     Hiển thị kết quả dự đoán đẹp mắt
     
     Args:
         result: Dictionary kết quả từ predict_churn()
+        risk_bands: Mức rủi ro từ chính sách quyết định (None: 0.7 / 0.5)
     """
     print("\n" + "="*50)
     print("🔮 KẾT QUẢ DỰ ĐOÁN CHURN")
@@ -164,9 +550,10 @@ def display_prediction(result):
     print(f"Xác suất No Churn: {result['no_churn_probability']:.2%}")
     print("="*50)
     
-    if result['churn_probability'] > 0.7:
+    level = risk_level(result['churn_probability'], risk_bands)
+    if level == 'high':
         print("⚠️  Cảnh báo: Khả năng rời bỏ CAO - Cần can thiệp ngay!")
-    elif result['churn_probability'] > 0.5:
+    elif level == 'medium':
         print("⚡ Cảnh báo: Khả năng rời bỏ TRUNG BÌNH - Theo dõi sát")
     else:
         print("✅ An toàn: Khả năng rời bỏ THẤP")
@@ -176,11 +563,8 @@ if __name__ == "__main__":
     # Ví dụ 1: Dự đoán cho 1 khách hàng
     print("📌 Ví dụ 1: Dự đoán cho 1 khách hàng\n")
     
-    model, scaler, feature_columns = load_model_and_scaler(
-        "../models/best_rf_model.pkl",
-        "../models/scaler.pkl",
-        "../models/feature_columns.pkl"
-    )
+    # Gói mô hình (hoặc các file .pkl riêng lẻ): mô hình, encoder và ngưỡng 0.5 / 0.7
+    model, encoder, policy = load_scoring_model()
     
     # Dữ liệu mẫu của 1 khách hàng
     customer = {
@@ -205,17 +589,18 @@ if __name__ == "__main__":
         'TotalCharges': 844.2
     }
     
-    result = predict_churn(model, scaler, customer, feature_columns)
-    display_prediction(result)
+    result = predict_churn(model, None, customer, encoder=encoder,
+                           threshold=policy['threshold'])
+    display_prediction(result, policy['risk_bands'])
     
     # Ví dụ 2: Dự đoán hàng loạt
     print("\n\n📌 Ví dụ 2: Dự đoán hàng loạt từ file CSV\n")
     
     try:
         batch_results = predict_batch(
-            model, scaler, 
+            model, None,
             "../WA_Fn-UseC_-Telco-Customer-Churn.csv",
-            feature_columns
+            encoder=encoder, threshold=policy['threshold']
         )
         
         print(f"✅ Đã dự đoán cho {len(batch_results)} khách hàng")
@@ -0,0 +1,148 @@
+"""
+Module cache kết quả dự đoán cho việc đánh giá / so sánh mô hình lặp lại
+Áp dụng theo CRISP-DM Phase 5: Evaluation
+
+Khóa cache = fingerprint mô hình (hash nội dung đã huấn luyện) + hash tập dữ
+liệu, nên chạy lại compare_models, quét ngưỡng hay vẽ biểu đồ trên cùng tập
+holdout không phải chấm điểm lại mô hình.
+
+Cache chỉ dùng khi được truyền vào (evaluate_model(..., cache=...)): mỗi lần
+tra cứu phải hash toàn bộ dữ liệu và mỗi mục giữ 1 mảng xác suất đầy đủ, nên
+không nên bật mặc định cho tập đánh giá rất lớn.
+"""
+
+import os
+import weakref
+from collections import OrderedDict
+
+import joblib
+import numpy as np
+
+
+def _state_signature(obj):
+    """
+    Chữ ký rẻ của trạng thái mô hình (id các mảng/đối tượng đã fit)
+
+    sklearn gán đối tượng mới cho thuộc tính khi fit lại, nên chữ ký thay đổi
+    mỗi lần huấn luyện; dùng để biết khi nào phải tính lại fingerprint.
+    Sửa mảng tại chỗ (ví dụ model.coef_ *= -1) KHÔNG đổi chữ ký: khi đó phải
+    gọi PredictionCache.clear().
+    Thuộc tính private ('_...', ví dụ thread pool) không thuộc trạng thái mô hình.
+    """
+    if isinstance(obj, (str, int, float, bool, type(None))):
+        return obj
+    if isinstance(obj, np.ndarray):
+        return ('ndarray', id(obj), obj.shape, obj.dtype.str)
+    if isinstance(obj, (list, tuple)):
+        return tuple(_state_signature(item) for item in obj)
+    if isinstance(obj, dict):
+        return tuple((key, _state_signature(value)) for key, value in obj.items())
+    if hasattr(obj, 'get_params'):
+        return (type(obj).__name__,
+                tuple((key, _state_signature(value)) for key, value in vars(obj).items()
+                      if not key.startswith('_')))
+    return id(obj)
+
+
+class PredictionCache:
+    """
+    Cache predict_proba theo (fingerprint mô hình, hash dữ liệu)
+
+    Giữ tối đa max_entries kết quả trong bộ nhớ (LRU). Nếu có cache_dir, kết
+    quả còn được lưu thành file .npy và tải lại (memory-mapped) ở các lần
+    chạy sau, kể cả từ tiến trình khác.
+    """
+
+    def __init__(self, max_entries=32, cache_dir=None):
+        """
+        Args:
+            max_entries: Số kết quả tối đa giữ trong bộ nhớ
+            cache_dir: Thư mục lưu kết quả trên đĩa (None: chỉ bộ nhớ)
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._fingerprints = weakref.WeakKeyDictionary()
+
+    def fingerprint(self, model):
+        """
+        Hash nội dung mô hình đã huấn luyện
+
+        Hash đầy đủ chỉ được tính lại khi mô hình được fit lại (chữ ký trạng
+        thái thay đổi); các lần gọi khác chỉ tốn chi phí so sánh chữ ký.
+        """
+        signature = _state_signature(model)
+        try:
+            cached = self._fingerprints.get(model)
+        except TypeError:
+            cached = None
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        fingerprint = joblib.hash(model)
+        try:
+            self._fingerprints[model] = (signature, fingerprint)
+        except TypeError:
+            pass
+        return fingerprint
+
+    def key(self, model, X):
+        """Khóa cache cho cặp (mô hình, dữ liệu)"""
+        return f"{self.fingerprint(model)}-{joblib.hash(X)}"
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"proba_{key}.npy")
+
+    def _remember(self, key, proba):
+        self._entries[key] = proba
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def predict_proba(self, model, X):
+        """
+        predict_proba của mô hình trên X, chỉ chấm điểm nếu chưa có trong cache
+
+        Args:
+            model: Mô hình đã huấn luyện
+            X: Dữ liệu cần dự đoán
+
+        Returns:
+            np.ndarray: Xác suất từng lớp (chỉ đọc, dùng chung giữa các lần gọi)
+        """
+        key = self.key(model, X)
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        path = self._path(key) if self.cache_dir else None
+        if path and os.path.exists(path):
+            self.disk_hits += 1
+            proba = np.load(path, mmap_mode='r')
+        else:
+            self.misses += 1
+            proba = np.asarray(model.predict_proba(X))
+            proba.setflags(write=False)
+            if path:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+                np.save(tmp_path, proba)
+                os.replace(tmp_path, path)
+
+        self._remember(key, proba)
+        return proba
+
+    def clear(self):
+        """Xóa cache trong bộ nhớ (file trên đĩa được giữ lại)"""
+        self._entries.clear()
+        self._fingerprints = weakref.WeakKeyDictionary()
+
+    def report(self):
+        """In thống kê sử dụng cache"""
+        print(f"📦 PredictionCache: {len(self._entries)}/{self.max_entries} mục, "
+              f"{self.hits} hit bộ nhớ, {self.disk_hits} hit đĩa, {self.misses} lần chấm điểm")
+
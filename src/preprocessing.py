@@ -3,27 +3,229 @@ Module xử lý tiền xử lý dữ liệu cho dự án Customer Churn
 Áp dụng theo CRISP-DM Phase 3: Data Preparation
 """
 
+import hashlib
+import json
+import os
+import shutil
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 
+from encoder import FeatureEncoder, NUMERIC_COLS_TO_SCALE
 
-def load_data(filepath):
+
+# Tăng khi thay đổi các bước tiền xử lý để cache cũ tự động bị bỏ qua
+CACHE_VERSION = 2
+
+# Schema dữ liệu Telco: các giá trị (vocabulary) của từng cột phân loại,
+# sắp xếp theo thứ tự chữ cái giống pd.get_dummies trên cột object
+CATEGORICAL_SCHEMA = {
+    'gender': ['Female', 'Male'],
+    'Partner': ['No', 'Yes'],
+    'Dependents': ['No', 'Yes'],
+    'PhoneService': ['No', 'Yes'],
+    'MultipleLines': ['No', 'No phone service', 'Yes'],
+    'InternetService': ['DSL', 'Fiber optic', 'No'],
+    'OnlineSecurity': ['No', 'No internet service', 'Yes'],
+    'OnlineBackup': ['No', 'No internet service', 'Yes'],
+    'DeviceProtection': ['No', 'No internet service', 'Yes'],
+    'TechSupport': ['No', 'No internet service', 'Yes'],
+    'StreamingTV': ['No', 'No internet service', 'Yes'],
+    'StreamingMovies': ['No', 'No internet service', 'Yes'],
+    'Contract': ['Month-to-month', 'One year', 'Two year'],
+    'PaperlessBilling': ['No', 'Yes'],
+    'PaymentMethod': [
+        'Bank transfer (automatic)', 'Credit card (automatic)',
+        'Electronic check', 'Mailed check'
+    ],
+    'Churn': ['No', 'Yes'],
+}
+
+# Kiểu dữ liệu gọn cho các cột số
+NUMERIC_SCHEMA = {
+    'SeniorCitizen': 'int8',
+    'tenure': 'int16',
+    'MonthlyCharges': 'float32',
+    'TotalCharges': 'float32',
+}
+
+
+def telco_dtypes():
+    """
+    Schema kiểu dữ liệu cho pd.read_csv
+    
+    Returns:
+        dict: {tên cột: dtype} (category với vocabulary cố định cho cột phân loại)
+    """
+    dtypes = {col: pd.CategoricalDtype(values) for col, values in CATEGORICAL_SCHEMA.items()}
+    dtypes.update(NUMERIC_SCHEMA)
+    return dtypes
+
+
+def schema_feature_columns():
+    """
+    Tên cột đặc trưng suy ra từ schema (giống encode_categorical_features)
+    
+    Cột số theo thứ tự file, sau đó các cột dummy (bỏ category đầu tiên như
+    drop_first=True), nên không cần đọc dữ liệu để biết cột lúc train.
+    
+    Returns:
+        list: Danh sách tên cột đặc trưng
+    """
+    columns = list(NUMERIC_SCHEMA)
+    for column, values in CATEGORICAL_SCHEMA.items():
+        if column != 'Churn':
+            columns.extend(f"{column}_{value}" for value in values[1:])
+    return columns
+
+
+def read_csv_chunks(filepath, chunksize=100_000, usecols=None):
+    """
+    Đọc file CSV theo từng chunk với schema khai báo (bộ nhớ giới hạn)
+    
+    Args:
+        filepath (str): Đường dẫn file dữ liệu
+        chunksize (int): Số dòng mỗi chunk
+        usecols (list): Chỉ đọc các cột này (None: tất cả)
+        
+    Returns:
+        Iterator[pd.DataFrame]: Các chunk dữ liệu
+    """
+    dtypes = telco_dtypes()
+    if usecols is not None:
+        dtypes = {col: dtype for col, dtype in dtypes.items() if col in usecols}
+    return pd.read_csv(
+        filepath, dtype=dtypes, usecols=usecols, chunksize=chunksize,
+        na_values={'TotalCharges': [' ', '']}
+    )
+
+
+def fit_scaler_incremental(filepath, chunksize=100_000, columns=NUMERIC_COLS_TO_SCALE):
+    """
+    Fit StandardScaler bằng partial_fit trên từng chunk của file CSV
+    
+    Chỉ đọc các cột cần chuẩn hóa; TotalCharges trống được coi là 0 (giống
+    FeatureEncoder lúc dự đoán).
+    
+    Args:
+        filepath (str): Đường dẫn file dữ liệu
+        chunksize (int): Số dòng mỗi chunk
+        columns (list): Các cột cần chuẩn hóa
+        
+    Returns:
+        StandardScaler: Scaler đã fit trên toàn bộ file
+    """
+    scaler = StandardScaler()
+    for chunk in read_csv_chunks(filepath, chunksize, usecols=list(columns)):
+        scaler.partial_fit(chunk[list(columns)].astype('float64').fillna(0.0))
+    return scaler
+
+
+def iter_encoded_chunks(filepath, scaler=None, chunksize=100_000, feature_columns=None):
+    """
+    Mã hóa file CSV theo từng chunk thành (X, y) dạng mảng NumPy
+    
+    Dùng FeatureEncoder với cột từ schema, nên mọi chunk có cùng cột bất kể
+    chunk chứa những category nào. Dòng có nhãn Churn ngoài schema bị bỏ qua.
+    
+    Args:
+        filepath (str): Đường dẫn file dữ liệu
+        scaler: Scaler đã fit (None: không chuẩn hóa)
+        chunksize (int): Số dòng mỗi chunk
+        feature_columns (list): Cột đặc trưng (None: schema_feature_columns())
+        
+    Returns:
+        Iterator[tuple]: (X float64 (n, n_features), y int (n,)) cho mỗi chunk
+    """
+    encoder = FeatureEncoder(feature_columns or schema_feature_columns(), scaler)
+    for chunk in read_csv_chunks(filepath, chunksize):
+        y = chunk['Churn'].cat.codes.to_numpy()
+        labeled = y >= 0
+        if not labeled.all():
+            chunk, y = chunk[labeled], y[labeled]
+        yield encoder.transform(chunk), y.astype(np.int64)
+
+
+def _values_outside_schema(filepath, columns):
+    """
+    Đọc lại các cột phân loại dạng chuỗi, trả về giá trị ngoài schema
+
+    Returns:
+        dict: {tên cột: [giá trị ngoài schema]}
+    """
+    raw = pd.read_csv(filepath, usecols=columns, dtype=str, keep_default_na=False)
+    return {
+        col: sorted(set(raw[col][~raw[col].isin(CATEGORICAL_SCHEMA[col])]))
+        for col in columns
+    }
+
+
+def load_data(filepath, use_schema=True):
     """
     Tải dữ liệu từ file CSV
     
     Args:
         filepath (str): Đường dẫn đến file dữ liệu
+        use_schema (bool): Đọc theo schema khai báo (category, int nhỏ,
+            float32, TotalCharges trống -> NaN) thay vì để pandas tự suy luận
         
     Returns:
         pd.DataFrame: DataFrame chứa dữ liệu
+        
+    Raises:
+        ValueError: Nếu use_schema và có giá trị phân loại (kể cả nhãn Churn)
+            ngoài schema hoặc bị trống
     """
-    df = pd.read_csv(filepath)
-    print(f"Đã tải dữ liệu: {df.shape[0]} hàng, {df.shape[1]} cột")
+    if use_schema:
+        df = pd.read_csv(
+            filepath, dtype=telco_dtypes(),
+            na_values={'TotalCharges': [' ', '']}
+        )
+        # Giá trị ngoài vocabulary bị đọc thành NaN: đọc lại các cột đó để báo lỗi
+        unknown = df[list(CATEGORICAL_SCHEMA)].isnull().any()
+        if unknown.any():
+            bad = _values_outside_schema(filepath, unknown[unknown].index.tolist())
+            raise ValueError(f"Giá trị phân loại ngoài schema trong {filepath}: {bad}")
+    else:
+        df = pd.read_csv(filepath)
+    
+    print(f"Đã tải dữ liệu: {df.shape[0]} hàng, {df.shape[1]} cột "
+          f"({df.memory_usage(deep=True).sum() / 1e6:.2f} MB)")
     return df
 
 
+def memory_usage_report(filepath):
+    """
+    So sánh bộ nhớ và thời gian tải dữ liệu khi không/có dùng schema
+    
+    Args:
+        filepath (str): Đường dẫn đến file dữ liệu
+        
+    Returns:
+        pd.DataFrame: Bộ nhớ (MB) theo từng cột và tổng, trước và sau
+    """
+    import time
+    
+    timings = {}
+    usage = {}
+    for label, use_schema in (('Trước (suy luận)', False), ('Sau (schema)', True)):
+        start = time.perf_counter()
+        df = load_data(filepath, use_schema=use_schema)
+        timings[label] = time.perf_counter() - start
+        usage[label] = df.memory_usage(deep=True, index=False) / 1e6
+    
+    report = pd.DataFrame(usage)
+    report.loc['TỔNG'] = report.sum()
+    
+    before, after = report.loc['TỔNG']
+    print("\n📊 BỘ NHỚ DỮ LIỆU (MB)")
+    print(report.round(3).to_string())
+    print(f"\nGiảm {before / after:.1f} lần bộ nhớ; thời gian tải: "
+          f"{timings['Trước (suy luận)']:.3f}s -> {timings['Sau (schema)']:.3f}s")
+    return report
+
+
 def handle_missing_values(df):
     """
     Xử lý giá trị thiếu trong dữ liệu
@@ -38,7 +240,7 @@ def handle_missing_values(df):
     df['TotalCharges'] = pd.to_numeric(df['TotalCharges'], errors='coerce')
     
     # Điền giá trị thiếu bằng median
-    df['TotalCharges'].fillna(df['TotalCharges'].median(), inplace=True)
+    df['TotalCharges'] = df['TotalCharges'].fillna(df['TotalCharges'].median())
     
     print(f"Số giá trị thiếu sau xử lý: {df.isnull().sum().sum()}")
     return df
@@ -59,10 +261,14 @@ def encode_categorical_features(df):
         df = df.drop('customerID', axis=1)
     
     # Mã hóa biến đích (Churn)
-    df['Churn'] = df['Churn'].map({'Yes': 1, 'No': 0})
+    target = df['Churn'].map({'Yes': 1, 'No': 0})
+    if target.isnull().any():
+        bad = sorted(map(str, df.loc[target.isnull(), 'Churn'].unique()))
+        raise ValueError(f"Cột Churn chỉ nhận 'Yes'/'No', có giá trị khác: {bad}")
+    df['Churn'] = target.astype(int)
     
     # One-Hot Encoding cho các đặc trưng phân loại khác
-    categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
+    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
     df = pd.get_dummies(df, columns=categorical_cols, drop_first=True)
     
     print(f"Số đặc trưng sau mã hóa: {df.shape[1]}")
@@ -89,13 +295,17 @@ def split_features_target(df):
     return X, y
 
 
-def scale_features(X_train, X_test):
+def scale_features(X_train, X_test, chunksize=None, copy=True):
     """
     Chuẩn hóa đặc trưng số
     
     Args:
         X_train (pd.DataFrame): Tập huấn luyện
         X_test (pd.DataFrame): Tập kiểm tra
+        chunksize (int): Fit scaler bằng partial_fit trên từng khối chunksize
+            dòng thay vì chép toàn bộ cột số 1 lần (None: fit 1 lần)
+        copy (bool): False để chuẩn hóa trực tiếp trên X_train/X_test (không
+            chép DataFrame; chỉ cấp phát thêm 1 cột mỗi lần)
         
     Returns:
         tuple: (X_train_scaled, X_test_scaled, scaler)
@@ -105,31 +315,161 @@ def scale_features(X_train, X_test):
     # Chỉ chuẩn hóa các cột số
     numeric_cols = X_train.select_dtypes(include=[np.number]).columns.tolist()
     
-    X_train_scaled = X_train.copy()
-    X_test_scaled = X_test.copy()
+    if chunksize:
+        for start in range(0, len(X_train), chunksize):
+            scaler.partial_fit(X_train.iloc[start:start + chunksize][numeric_cols])
+    else:
+        scaler.fit(X_train[numeric_cols])
+    
+    if copy:
+        X_train = X_train.copy()
+        X_test = X_test.copy()
     
-    X_train_scaled[numeric_cols] = scaler.fit_transform(X_train[numeric_cols])
-    X_test_scaled[numeric_cols] = scaler.transform(X_test[numeric_cols])
+    # Chuẩn hóa từng cột thay vì tạo thêm 1 ma trận cho toàn bộ cột số.
+    # Cột int/float32 được tính và lưu dạng float32 như scaler.transform
+    # trên các cột đó (mean/scale float64, kết quả ép về float32)
+    for pos, col in enumerate(numeric_cols):
+        for X in (X_train, X_test):
+            values = X[col].to_numpy(dtype=np.result_type(X[col].dtype, np.float32), copy=True)
+            values -= scaler.mean_[pos]
+            values /= scaler.scale_[pos]
+            X[col] = values
     
-    return X_train_scaled, X_test_scaled, scaler
+    return X_train, X_test, scaler
 
 
-def preprocess_pipeline(filepath, test_size=0.2, random_state=42):
+def file_hash(filepath, block_size=1 << 20):
     """
-    Pipeline đầy đủ cho tiền xử lý dữ liệu
+    Tính SHA-256 nội dung file (đọc theo khối, không tải cả file vào RAM)
+    
+    Args:
+        filepath (str): Đường dẫn file
+        block_size (int): Kích thước mỗi khối đọc (byte)
+        
+    Returns:
+        str: Chuỗi hex của hash
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(filepath, **params):
+    """
+    Khóa cache từ nội dung file nguồn và các tham số tiền xử lý
     
     Args:
         filepath (str): Đường dẫn file dữ liệu
-        test_size (float): Tỷ lệ tập test
-        random_state (int): Random seed
+        **params: Các tham số ảnh hưởng tới dữ liệu đã mã hóa
         
     Returns:
-        tuple: (X_train, X_test, y_train, y_test, scaler)
+        str: Khóa cache (hex)
     """
-    print("=== BẮT ĐẦU TIỀN XỬ LÝ DỮ LIỆU ===\n")
+    payload = json.dumps(
+        {'file': file_hash(filepath), 'version': CACHE_VERSION, **params},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+def save_encoded_cache(df, cache_path):
+    """
+    Lưu DataFrame đã mã hóa dạng cột: mỗi cột 1 file .npy + meta.json
+    
+    Ghi vào thư mục tạm rồi đổi tên để không để lại cache hỏng nếu bị ngắt.
+    
+    Args:
+        df (pd.DataFrame): DataFrame đã mã hóa (chỉ gồm cột số/bool)
+        cache_path (str): Thư mục cache
+    """
+    tmp_path = f"{cache_path}.tmp-{os.getpid()}"
+    os.makedirs(tmp_path, exist_ok=True)
+    
+    meta = {'n_rows': len(df), 'columns': []}
+    for i, col in enumerate(df.columns):
+        values = df[col].to_numpy()
+        if values.dtype == object:
+            raise TypeError(f"Cột '{col}' chưa được mã hóa, không thể lưu cache")
+        filename = f"{i:04d}.npy"
+        np.save(os.path.join(tmp_path, filename), values)
+        meta['columns'].append({'name': col, 'file': filename, 'dtype': values.dtype.str})
+    
+    with open(os.path.join(tmp_path, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    
+    if os.path.exists(cache_path):
+        shutil.rmtree(cache_path)
+    os.replace(tmp_path, cache_path)
+    print(f"✅ Đã lưu cache dữ liệu đã mã hóa tại: {cache_path}")
+
+
+def load_encoded_cache(cache_path):
+    """
+    Tải DataFrame đã mã hóa từ cache, các cột được memory-map (không parse lại)
+    
+    Args:
+        cache_path (str): Thư mục cache
+        
+    Returns:
+        pd.DataFrame: DataFrame đã mã hóa (các cột trỏ vào file .npy)
+    """
+    with open(os.path.join(cache_path, 'meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    
+    columns = {
+        col['name']: np.load(os.path.join(cache_path, col['file']), mmap_mode='r')
+        for col in meta['columns']
+    }
+    df = pd.DataFrame(columns, copy=False)
+    print(f"✅ Đã tải dữ liệu đã mã hóa từ cache: {df.shape[0]} hàng, {df.shape[1]} cột")
+    return df
+
+
+def encoding_params(use_schema=True):
+    """
+    Các tham số quyết định dữ liệu đã mã hóa của load_encoded_data (cho cache_key)
+    
+    Chuẩn hóa (scaler) chạy sau bước cache nên không nằm trong khóa.
+    
+    Args:
+        use_schema (bool): Đọc theo schema khai báo (xem load_data)
+        
+    Returns:
+        dict: Tham số dạng JSON được
+    """
+    return {
+        'use_schema': use_schema,
+        'categorical_schema': CATEGORICAL_SCHEMA if use_schema else None,
+        'numeric_schema': NUMERIC_SCHEMA if use_schema else None,
+        'target': 'Churn',
+        'drop_first': True,
+        'fill_total_charges': 'median',
+    }
+
+
+def load_encoded_data(filepath, cache_dir=None, use_schema=True):
+    """
+    Tải và mã hóa dữ liệu (Bước 1-3 của pipeline), có dùng cache nếu được
+    
+    Args:
+        filepath (str): Đường dẫn file dữ liệu
+        cache_dir (str): Thư mục cache (None: không dùng cache)
+        use_schema (bool): Đọc theo schema khai báo (xem load_data)
+        
+    Returns:
+        pd.DataFrame: DataFrame đã mã hóa, gồm cả cột Churn
+    """
+    cache_path = None
+    if cache_dir is not None:
+        key = cache_key(filepath, **encoding_params(use_schema))
+        cache_path = os.path.join(cache_dir, key)
+        if os.path.exists(os.path.join(cache_path, 'meta.json')):
+            return load_encoded_cache(cache_path)
     
     # Bước 1: Tải dữ liệu
-    df = load_data(filepath)
+    df = load_data(filepath, use_schema=use_schema)
     
     # Bước 2: Xử lý giá trị thiếu
     df = handle_missing_values(df)
@@ -137,6 +477,35 @@ def preprocess_pipeline(filepath, test_size=0.2, random_state=42):
     # Bước 3: Mã hóa đặc trưng phân loại
     df = encode_categorical_features(df)
     
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        save_encoded_cache(df, cache_path)
+    
+    return df
+
+
+def preprocess_pipeline(filepath, test_size=0.2, random_state=42, cache_dir=None,
+                        use_schema=True):
+    """
+    Pipeline đầy đủ cho tiền xử lý dữ liệu
+    
+    Args:
+        filepath (str): Đường dẫn file dữ liệu
+        test_size (float): Tỷ lệ tập test
+        random_state (int): Random seed
+        cache_dir (str): Thư mục cache dữ liệu đã mã hóa; các lần chạy sau
+            với cùng file nguồn và cùng tham số mã hóa sẽ bỏ qua bước đọc CSV
+            và mã hóa
+        use_schema (bool): Đọc theo schema khai báo (xem load_data)
+        
+    Returns:
+        tuple: (X_train, X_test, y_train, y_test, scaler)
+    """
+    print("=== BẮT ĐẦU TIỀN XỬ LÝ DỮ LIỆU ===\n")
+    
+    # Bước 1-3: Tải, xử lý giá trị thiếu và mã hóa (hoặc tải từ cache)
+    df = load_encoded_data(filepath, cache_dir, use_schema)
+    
     # Bước 4: Tách X và y
     X, y = split_features_target(df)
     
@@ -146,8 +515,8 @@ def preprocess_pipeline(filepath, test_size=0.2, random_state=42):
     )
     print(f"\nĐã chia dữ liệu: Train={len(X_train)}, Test={len(X_test)}")
     
-    # Bước 6: Chuẩn hóa
-    X_train, X_test, scaler = scale_features(X_train, X_test)
+    # Bước 6: Chuẩn hóa (train_test_split đã tạo bản sao, chuẩn hóa trực tiếp)
+    X_train, X_test, scaler = scale_features(X_train, X_test, copy=False)
     
     print("\n=== HOÀN TẤT TIỀN XỬ LÝ ===")
     
@@ -157,6 +526,7 @@ def preprocess_pipeline(filepath, test_size=0.2, random_state=42):
 if __name__ == "__main__":
     # Test module
     filepath = "../WA_Fn-UseC_-Telco-Customer-Churn.csv"
+    memory_usage_report(filepath)
     X_train, X_test, y_train, y_test, scaler = preprocess_pipeline(filepath)
     
     print("\n📊 Tóm tắt dữ liệu:")
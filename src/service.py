@@ -0,0 +1,336 @@
+"""
+Dịch vụ HTTP dự đoán Customer Churn (asyncio) với micro-batching
+Áp dụng theo CRISP-DM Phase 6: Deployment
+
+Chạy: python src/service.py --port 8000
+Gửi yêu cầu:
+    curl -X POST localhost:8000/predict -d '{"gender": "Female", "tenure": 12, ...}'
+
+Mô hình được tải 1 lần khi khởi động. Các yêu cầu đơn lẻ được xếp hàng và
+gom thành micro-batch: batch được gửi tới mô hình khi đủ max_batch_size
+yêu cầu hoặc khi yêu cầu đầu tiên trong batch đã chờ quá max_wait_ms.
+
+Bản ghi không hợp lệ bị từ chối (400) trước khi vào hàng đợi; body lớn hơn
+max_body_bytes bị từ chối (413) và khi hàng đợi đầy yêu cầu mới nhận 503.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from bundle import DEFAULT_BUNDLE_PATH
+from predict import (
+    DEFAULT_FEATURE_COLUMNS_PATH, DEFAULT_MODEL_PATH, DEFAULT_SCALER_PATH, DEFAULT_THRESHOLD,
+    load_scoring_model, predict_with_threshold
+)
+
+
+HTTP_STATUS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+    500: 'Internal Server Error', 503: 'Service Unavailable'
+}
+
+# Giới hạn mặc định: kích thước body 1 request và số yêu cầu chờ trong hàng đợi
+DEFAULT_MAX_BODY_BYTES = 64 * 1024
+DEFAULT_MAX_QUEUE_SIZE = 10_000
+
+
+class QueueFullError(Exception):
+    """Hàng đợi micro-batch đã đầy (dịch vụ quá tải)"""
+
+
+class MicroBatcher:
+    """
+    Hàng đợi gom các yêu cầu đơn lẻ thành micro-batch theo chính sách
+    kích thước-hoặc-hạn chờ (size-or-deadline)
+    """
+
+    def __init__(self, model, encoder, threshold=DEFAULT_THRESHOLD,
+                 max_batch_size=64, max_wait_ms=5.0, max_queue_size=DEFAULT_MAX_QUEUE_SIZE):
+        """
+        Args:
+            model: Mô hình có predict_proba (nhận ma trận từ encoder)
+            encoder: FeatureEncoder tương ứng với mô hình
+            threshold: Ngưỡng quyết định cho xác suất churn
+            max_batch_size: Số yêu cầu tối đa mỗi batch
+            max_wait_ms: Thời gian chờ tối đa (ms) tính từ yêu cầu đầu tiên
+            max_queue_size: Số yêu cầu tối đa đang chờ trong hàng đợi
+        """
+        self.model = model
+        self.encoder = encoder
+        self.threshold = threshold
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = asyncio.Queue(maxsize=max_queue_size)
+        self.stats = {'requests': 0, 'batches': 0, 'rejected': 0}
+        self._worker = None
+
+    def start(self):
+        """Khởi động vòng lặp gom batch (gọi trong event loop)"""
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Dừng vòng lặp gom batch"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, record):
+        """
+        Gửi 1 khách hàng vào hàng đợi và chờ kết quả
+
+        Args:
+            record: dict dữ liệu 1 khách hàng
+
+        Returns:
+            dict: Kết quả dự đoán giống predict_churn()
+
+        Raises:
+            QueueFullError: Hàng đợi đã đầy
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((record, future))
+        except asyncio.QueueFull:
+            self.stats['rejected'] += 1
+            raise QueueFullError("Hàng đợi dự đoán đã đầy, thử lại sau") from None
+        return await future
+
+    async def _collect(self):
+        """Lấy 1 batch: chờ yêu cầu đầu tiên, rồi gom thêm tới khi đủ hoặc hết hạn"""
+        batch = [await self.queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _score(self, records):
+        """Dự đoán cho cả batch"""
+        X = self.encoder.transform(records)
+        is_churn, probabilities = predict_with_threshold(self.model, X, self.threshold)
+        return [
+            {
+                'prediction': 'Churn' if churn else 'No Churn',
+                'churn_probability': float(proba[1]),
+                'no_churn_probability': float(proba[0])
+            }
+            for churn, proba in zip(is_churn, probabilities)
+        ]
+
+    def _score_batch(self, records):
+        """
+        Dự đoán cho cả batch (chạy trong thread để không chặn event loop)
+
+        Nếu cả batch lỗi, dự đoán lại từng bản ghi để lỗi của 1 bản ghi không
+        làm hỏng các yêu cầu khác trong cùng batch.
+
+        Returns:
+            list: Kết quả (dict) hoặc exception cho từng bản ghi
+        """
+        try:
+            return self._score(records)
+        except Exception:
+            if len(records) == 1:
+                raise
+        results = []
+        for record in records:
+            try:
+                results.extend(self._score([record]))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            records = [record for record, _ in batch]
+            try:
+                results = await loop.run_in_executor(None, self._score_batch, records)
+            except Exception as e:
+                results = [e]
+
+            self.stats['requests'] += len(batch)
+            self.stats['batches'] += 1
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+
+class ScoringService:
+    """
+    Máy chủ HTTP/1.1 tối giản (keep-alive) trên asyncio, không cần thư viện ngoài
+
+    Endpoint:
+        POST /predict  - body JSON của 1 khách hàng, trả về kết quả dự đoán
+        GET  /health   - trạng thái và số liệu micro-batching
+    """
+
+    def __init__(self, batcher, max_body_bytes=DEFAULT_MAX_BODY_BYTES):
+        """
+        Args:
+            batcher: MicroBatcher đã khởi động
+            max_body_bytes: Kích thước body tối đa của 1 request
+        """
+        self.batcher = batcher
+        self.max_body_bytes = max_body_bytes
+
+    async def handle_connection(self, reader, writer):
+        """Xử lý các request trên 1 kết nối cho tới khi client đóng"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                if length < 0:
+                    raise ValueError("Content-Length âm")
+                if length > self.max_body_bytes:
+                    # Không đọc body: trả lỗi rồi đóng kết nối
+                    await self.respond(writer, 413, {
+                        'error': f"Body lớn hơn giới hạn {self.max_body_bytes} byte"
+                    })
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                status, payload = await self.route(method, path, body)
+                await self.respond(writer, status, payload)
+
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload):
+        """Ghi 1 response JSON"""
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status} {HTTP_STATUS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n\r\n".encode('latin-1') + data
+        )
+        await writer.drain()
+
+    async def route(self, method, path, body):
+        """Định tuyến request, trả về (status, payload)"""
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok', **self.batcher.stats}
+
+        if method == 'POST' and path == '/predict':
+            try:
+                record = json.loads(body)
+            except json.JSONDecodeError as e:
+                return 400, {'error': f"JSON không hợp lệ: {e}"}
+            try:
+                self.batcher.encoder.validate_record(record)
+            except ValueError as e:
+                return 400, {'error': str(e)}
+            try:
+                return 200, await self.batcher.submit(record)
+            except QueueFullError as e:
+                return 503, {'error': str(e)}
+            except Exception as e:
+                return 500, {'error': str(e)}
+
+        return 404, {'error': f"Không có endpoint {method} {path}"}
+
+
+async def serve(model, encoder, host='127.0.0.1', port=8000, threshold=DEFAULT_THRESHOLD,
+                max_batch_size=64, max_wait_ms=5.0, max_queue_size=DEFAULT_MAX_QUEUE_SIZE,
+                max_body_bytes=DEFAULT_MAX_BODY_BYTES):
+    """
+    Chạy dịch vụ dự đoán cho tới khi bị dừng
+
+    Args:
+        model, encoder: Kết quả của predict.load_scoring_model()
+        host, port: Địa chỉ lắng nghe
+        threshold: Ngưỡng quyết định cho xác suất churn
+        max_batch_size, max_wait_ms: Chính sách micro-batching
+        max_queue_size: Số yêu cầu tối đa đang chờ (vượt quá: 503)
+        max_body_bytes: Kích thước body tối đa (vượt quá: 413)
+    """
+    batcher = MicroBatcher(model, encoder, threshold, max_batch_size, max_wait_ms,
+                           max_queue_size)
+    batcher.start()
+    service = ScoringService(batcher, max_body_bytes)
+
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"✅ Dịch vụ dự đoán đang chạy tại http://{host}:{port} "
+          f"(batch ≤ {max_batch_size}, chờ ≤ {max_wait_ms} ms)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dịch vụ HTTP dự đoán Customer Churn")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--bundle', default=DEFAULT_BUNDLE_PATH,
+                        help="Gói mô hình (dùng nếu tồn tại, thay cho các file bên dưới)")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--scaler', default=DEFAULT_SCALER_PATH)
+    parser.add_argument('--feature-columns', default=DEFAULT_FEATURE_COLUMNS_PATH)
+    parser.add_argument('--thresholds', default=None,
+                        help="File ngưỡng từ src/thresholds.py cho đúng --model "
+                             "(mặc định: 0.5 / 0.7)")
+    parser.add_argument('--bundle-threshold', action='store_true',
+                        help="Dùng ngưỡng đã chọn lưu trong gói mô hình")
+    parser.add_argument('--threshold', type=float, default=None,
+                        help="Ngưỡng quyết định (mặc định 0.5, hoặc từ --thresholds / "
+                             "--bundle-threshold)")
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    parser.add_argument('--max-queue-size', type=int, default=DEFAULT_MAX_QUEUE_SIZE)
+    parser.add_argument('--max-body-bytes', type=int, default=DEFAULT_MAX_BODY_BYTES)
+    args = parser.parse_args()
+
+    # Random Forest chạy bằng FlatForest: nhanh hơn với micro-batch nhỏ
+    try:
+        model, encoder, policy = load_scoring_model(args.bundle, args.model, args.scaler,
+                                                    args.feature_columns, args.thresholds,
+                                                    flat_forest=True,
+                                                    bundle_policy=args.bundle_threshold)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    threshold = args.threshold if args.threshold is not None else policy['threshold']
+
+    try:
+        asyncio.run(serve(model, encoder, args.host, args.port, threshold,
+                          args.max_batch_size, args.max_wait_ms, args.max_queue_size,
+                          args.max_body_bytes))
+    except KeyboardInterrupt:
+        print("\n👋 Đã dừng dịch vụ")
+
+
+if __name__ == "__main__":
+    main()
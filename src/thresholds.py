@@ -0,0 +1,333 @@
+"""
+Module chọn ngưỡng quyết định và mức rủi ro churn từ xác suất của mô hình
+Áp dụng theo CRISP-DM Phase 5: Evaluation
+
+Quét mọi ngưỡng phân biệt trong 1 lần sắp xếp + cộng dồn (không lặp từng
+ngưỡng), tính precision/recall/F1 và chi phí kinh doanh. Ngưỡng được chọn trên
+xác suất out-of-fold của tập train (validation_scores), không dùng tập test
+dùng để báo cáo metrics. Chính sách được lưu vào gói mô hình, hoặc thành file
+JSON kèm SHA-256 của file mô hình; bước dự đoán (predict.py, cli.py,
+service.py) chỉ dùng khi được chỉ định, mặc định vẫn là 0.5 / 0.7.
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from artifacts import MODELS_DIR, file_sha256
+
+
+DEFAULT_POLICY_PATH = os.path.join(MODELS_DIR, 'thresholds.json')
+
+# Chính sách mặc định khi không chỉ định ngưỡng: giống các hằng số trước đây
+# (Churn khi xác suất > 0.5; rủi ro CAO > 0.7, TRUNG BÌNH > 0.5)
+DEFAULT_POLICY = {
+    'threshold': 0.5,
+    'risk_bands': {'high': 0.7, 'medium': 0.5}
+}
+
+# Chi phí mặc định (đơn vị tùy ý): bỏ sót 1 khách hàng rời bỏ (FN) đắt gấp
+# 5 lần 1 ưu đãi giữ chân gửi nhầm cho khách hàng không rời bỏ (FP)
+DEFAULT_COST_FP = 1.0
+DEFAULT_COST_FN = 5.0
+
+
+def default_decision_policy():
+    """Bản sao chính sách mặc định (0.5 / 0.7)"""
+    return {'threshold': DEFAULT_POLICY['threshold'],
+            'risk_bands': dict(DEFAULT_POLICY['risk_bands'])}
+
+
+def validation_scores(model, X, y, cv=5):
+    """
+    Xác suất churn out-of-fold trên tập train để chọn ngưỡng
+
+    Mỗi mẫu được chấm bởi 1 bản sao của mô hình (cùng siêu tham số) fit trên
+    các fold còn lại, nên ngưỡng không được chọn trên chính tập test dùng để
+    báo cáo metrics, cũng không trên xác suất mô hình đã "thấy" nhãn.
+
+    Args:
+        model: Mô hình đã huấn luyện (chỉ dùng cấu hình, không dùng trọng số)
+        X: Đặc trưng tập train
+        y: Nhãn tập train (0/1)
+        cv: Số fold (StratifiedKFold không xáo trộn)
+
+    Returns:
+        np.ndarray: Xác suất churn cho từng mẫu của X
+    """
+    from sklearn.base import clone
+    from sklearn.model_selection import StratifiedKFold, cross_val_predict
+
+    proba = cross_val_predict(clone(model), X, y, cv=StratifiedKFold(n_splits=cv),
+                              method='predict_proba')
+    return proba[:, 1]
+
+
+def threshold_sweep(y_true, y_score, cost_fp=DEFAULT_COST_FP, cost_fn=DEFAULT_COST_FN):
+    """
+    Metrics tại mọi ngưỡng phân biệt trong 1 lần sắp xếp
+
+    Quy tắc quyết định giống predict_with_threshold: Churn khi xác suất > ngưỡng.
+    Mỗi dòng ứng với 1 cách cắt giữa 2 điểm số liền kề (ngưỡng là trung điểm),
+    cộng thêm 2 dòng biên: không dự đoán Churn nào / dự đoán Churn tất cả.
+
+    Args:
+        y_true: Nhãn thực tế (0/1)
+        y_score: Xác suất churn
+        cost_fp: Chi phí 1 dự đoán Churn sai (FP)
+        cost_fn: Chi phí 1 khách hàng rời bỏ bị bỏ sót (FN)
+
+    Returns:
+        pd.DataFrame: threshold, tp, fp, fn, tn, precision, recall, f1, cost
+            (ngưỡng tăng dần)
+    """
+    # pandas chỉ cần khi quét ngưỡng, không cần khi dự đoán (load_decision_policy)
+    import pandas as pd
+
+    y_true = np.asarray(y_true).astype(np.intp)
+    y_score = np.asarray(y_score, dtype=np.float64)
+    if len(y_true) != len(y_score):
+        raise ValueError("y_true và y_score phải cùng độ dài")
+    if len(y_true) == 0:
+        raise ValueError("Cần ít nhất 1 mẫu để quét ngưỡng")
+
+    order = np.argsort(y_score)[::-1]
+    y_sorted = y_true[order]
+    score_sorted = y_score[order]
+
+    # Chỉ số cuối của mỗi nhóm điểm bằng nhau (điểm giảm dần)
+    last = np.r_[np.flatnonzero(np.diff(score_sorted)), len(score_sorted) - 1]
+    distinct = score_sorted[last]
+
+    # Dòng k: dự đoán Churn cho k nhóm điểm cao nhất
+    tp = np.r_[0, np.cumsum(y_sorted)[last]]
+    predicted = np.r_[0, last + 1]
+    fp = predicted - tp
+    n_pos = tp[-1]
+    n_neg = len(y_true) - n_pos
+    fn = n_pos - tp
+    tn = n_neg - fp
+
+    thresholds = np.r_[distinct[0], (distinct[:-1] + distinct[1:]) / 2,
+                       np.nextafter(distinct[-1], -np.inf)]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(n_pos > 0, tp / max(n_pos, 1), 0.0)
+        f1 = np.where(n_pos + predicted > 0, 2 * tp / (n_pos + predicted), 0.0)
+
+    sweep = pd.DataFrame({
+        'threshold': thresholds,
+        'tp': tp, 'fp': fp, 'fn': fn, 'tn': tn,
+        'precision': precision,
+        'recall': recall,
+        'f1': f1,
+        'cost': cost_fp * fp + cost_fn * fn
+    })
+    return sweep.iloc[::-1].reset_index(drop=True)
+
+
+def optimal_threshold(sweep, objective='cost'):
+    """
+    Dòng tối ưu của bảng quét ngưỡng
+
+    Args:
+        sweep: Kết quả threshold_sweep()
+        objective: 'cost' (chi phí nhỏ nhất) hoặc 'f1' (F1 lớn nhất)
+
+    Returns:
+        pd.Series: Dòng tối ưu (threshold, metrics, cost)
+    """
+    if objective == 'cost':
+        return sweep.loc[sweep['cost'].idxmin()]
+    if objective == 'f1':
+        return sweep.loc[sweep['f1'].idxmax()]
+    raise ValueError(f"objective không hợp lệ: {objective!r} (chọn 'cost' hoặc 'f1')")
+
+
+def risk_bands(sweep, threshold, high_precision=0.7):
+    """
+    Các mức rủi ro từ bảng quét ngưỡng
+
+    TRUNG BÌNH bắt đầu từ ngưỡng quyết định; CAO bắt đầu từ ngưỡng thấp nhất
+    (>= ngưỡng quyết định) mà ít nhất high_precision khách hàng vượt ngưỡng
+    thực sự rời bỏ. Nếu không ngưỡng nào đạt, dùng ngưỡng có precision cao nhất.
+
+    Args:
+        sweep: Kết quả threshold_sweep()
+        threshold: Ngưỡng quyết định
+        high_precision: Precision tối thiểu của nhóm rủi ro CAO
+
+    Returns:
+        dict: {'high': ngưỡng CAO, 'medium': ngưỡng TRUNG BÌNH}
+    """
+    candidates = sweep[(sweep['threshold'] >= threshold) & (sweep['tp'] + sweep['fp'] > 0)]
+    if candidates.empty:
+        return {'high': float(threshold), 'medium': float(threshold)}
+
+    meets = candidates[candidates['precision'] >= high_precision]
+    if meets.empty:
+        high = candidates.loc[candidates['precision'].idxmax(), 'threshold']
+    else:
+        high = meets['threshold'].iloc[0]
+    return {'high': float(high), 'medium': float(threshold)}
+
+
+def build_decision_policy(y_true, y_score, objective='cost', cost_fp=DEFAULT_COST_FP,
+                          cost_fn=DEFAULT_COST_FN, high_precision=0.7):
+    """
+    Ngưỡng quyết định tối ưu + mức rủi ro từ xác suất churn
+
+    Args:
+        y_true: Nhãn thực tế (0/1)
+        y_score: Xác suất churn, nên lấy từ validation_scores() thay vì tập test
+        objective: 'cost' hoặc 'f1'
+        cost_fp: Chi phí 1 FP
+        cost_fn: Chi phí 1 FN
+        high_precision: Precision tối thiểu của nhóm rủi ro CAO
+
+    Returns:
+        dict: Chính sách quyết định (lưu bằng save_decision_policy hoặc save_bundle)
+    """
+    sweep = threshold_sweep(y_true, y_score, cost_fp, cost_fn)
+    best = optimal_threshold(sweep, objective)
+    threshold = float(best['threshold'])
+
+    return {
+        'threshold': threshold,
+        'risk_bands': risk_bands(sweep, threshold, high_precision),
+        'objective': objective,
+        'cost_fp': cost_fp,
+        'cost_fn': cost_fn,
+        'high_precision': high_precision,
+        'n_samples': int(len(y_score)),
+        'metrics': {k: float(best[k]) for k in ('precision', 'recall', 'f1', 'cost')}
+    }
+
+
+def save_decision_policy(policy, filepath=DEFAULT_POLICY_PATH, model_path=None):
+    """
+    Lưu chính sách quyết định thành file JSON
+
+    Args:
+        policy: Kết quả build_decision_policy()
+        filepath: Đường dẫn file output
+        model_path: File mô hình mà ngưỡng được chọn cho; SHA-256 của file được
+            ghi kèm để load_decision_policy() phát hiện ghép nhầm mô hình
+    """
+    if model_path is not None:
+        policy = dict(policy, model_sha256=file_sha256(model_path))
+    with open(filepath, 'w') as f:
+        json.dump(policy, f, indent=2)
+        f.write('\n')
+    print(f"✅ Đã lưu ngưỡng quyết định tại: {filepath}")
+
+
+def load_decision_policy(filepath=DEFAULT_POLICY_PATH, model_path=None):
+    """
+    Tải chính sách quyết định từ file JSON
+
+    Args:
+        filepath: Đường dẫn file thresholds.json
+        model_path: File mô hình sẽ dùng với ngưỡng này (None: không kiểm tra)
+
+    Returns:
+        dict: Chính sách quyết định với 'threshold' và 'risk_bands'
+
+    Raises:
+        ValueError: Nếu ngưỡng được chọn cho 1 mô hình khác model_path
+    """
+    with open(filepath) as f:
+        policy = json.load(f)
+    if model_path is not None:
+        expected = policy.get('model_sha256')
+        if expected is None:
+            raise ValueError(f"{filepath} không ghi mô hình mà ngưỡng được chọn cho; "
+                             f"chạy lại src/thresholds.py")
+        if expected != file_sha256(model_path):
+            raise ValueError(f"Ngưỡng trong {filepath} được chọn cho mô hình khác "
+                             f"{model_path}; chạy lại src/thresholds.py")
+    return policy
+
+
+def risk_level(churn_probability, bands=None):
+    """
+    Mức rủi ro của 1 xác suất churn
+
+    Args:
+        churn_probability: Xác suất churn
+        bands: {'high', 'medium'} từ chính sách quyết định (None: mặc định)
+
+    Returns:
+        str: 'high', 'medium' hoặc 'low'
+    """
+    bands = bands or DEFAULT_POLICY['risk_bands']
+    if churn_probability > bands['high']:
+        return 'high'
+    if churn_probability > bands['medium']:
+        return 'medium'
+    return 'low'
+
+
+def main():
+    from predict import (
+        DEFAULT_FEATURE_COLUMNS_PATH, DEFAULT_MODEL_PATH, DEFAULT_SCALER_PATH,
+        build_encoder, load_model_and_scaler
+    )
+
+    parser = argparse.ArgumentParser(
+        description="Chọn ngưỡng quyết định churn trên xác suất out-of-fold của tập train"
+    )
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--scaler', default=DEFAULT_SCALER_PATH)
+    parser.add_argument('--feature-columns', default=DEFAULT_FEATURE_COLUMNS_PATH)
+    parser.add_argument('--data', default=os.path.join(os.path.dirname(__file__), '..',
+                                                       'data', 'Customer_Churn.csv'))
+    parser.add_argument('--test-size', type=float, default=0.2)
+    parser.add_argument('--random-state', type=int, default=42)
+    parser.add_argument('--cv', type=int, default=5)
+    parser.add_argument('--objective', choices=['cost', 'f1'], default='cost')
+    parser.add_argument('--cost-fp', type=float, default=DEFAULT_COST_FP)
+    parser.add_argument('--cost-fn', type=float, default=DEFAULT_COST_FN)
+    parser.add_argument('--high-precision', type=float, default=0.7)
+    parser.add_argument('--output', default=DEFAULT_POLICY_PATH)
+    args = parser.parse_args()
+
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+
+    model, scaler, feature_columns = load_model_and_scaler(args.model, args.scaler,
+                                                           args.feature_columns)
+    if feature_columns is None:
+        parser.error("Cần feature_columns.pkl để mã hóa tập train")
+
+    # Tập train lấy từ dữ liệu thô (cùng cách chia với preprocess_pipeline, tập
+    # test để báo cáo metrics không được dùng) và mã hóa bằng scaler +
+    # feature_columns ĐÃ LƯU của mô hình, giống lúc dự đoán thật
+    df = pd.read_csv(args.data)
+    y = df['Churn'].map({'Yes': 1, 'No': 0}).to_numpy()
+    train, _, y_train, _ = train_test_split(
+        df, y, test_size=args.test_size, random_state=args.random_state, stratify=y
+    )
+    encoder = build_encoder(scaler, feature_columns)
+    X_train = pd.DataFrame(encoder.transform(train), columns=encoder.feature_columns)
+    y_score = validation_scores(model, X_train, y_train, args.cv)
+
+    policy = build_decision_policy(y_train, y_score, args.objective, args.cost_fp,
+                                   args.cost_fn, args.high_precision)
+    print(f"\n🎯 Ngưỡng tối ưu ({args.objective}, out-of-fold {args.cv} fold): "
+          f"{policy['threshold']:.4f}")
+    print(f"📊 Precision={policy['metrics']['precision']:.4f}, "
+          f"Recall={policy['metrics']['recall']:.4f}, F1={policy['metrics']['f1']:.4f}, "
+          f"Chi phí={policy['metrics']['cost']:.1f}")
+    print(f"🚦 Mức rủi ro: CAO > {policy['risk_bands']['high']:.4f}, "
+          f"TRUNG BÌNH > {policy['risk_bands']['medium']:.4f}")
+    save_decision_policy(policy, args.output, model_path=args.model)
+    print(f"💡 Dùng khi dự đoán: python src/cli.py ... --model {args.model} "
+          f"--thresholds {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Fixture dùng chung cho các test so khớp kết quả (chạy: python -m pytest tests)
+"""
+
+import contextlib
+import io
+import os
+import sys
+import warnings
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+DATA_PATH = os.path.join(ROOT, 'data', 'Customer_Churn.csv')
+
+
+@pytest.fixture(scope='session')
+def saved_model():
+    """(model, scaler, feature_columns) đã lưu trong models/"""
+    from predict import (
+        DEFAULT_FEATURE_COLUMNS_PATH, DEFAULT_MODEL_PATH, DEFAULT_SCALER_PATH,
+        load_model_and_scaler
+    )
+
+    with warnings.catch_warnings(), contextlib.redirect_stdout(io.StringIO()):
+        warnings.simplefilter('ignore')
+        return load_model_and_scaler(DEFAULT_MODEL_PATH, DEFAULT_SCALER_PATH,
+                                     DEFAULT_FEATURE_COLUMNS_PATH)
+
+
+@pytest.fixture(scope='session')
+def raw_data():
+    """Dữ liệu Telco thô (chưa tiền xử lý)"""
+    import pandas as pd
+
+    return pd.read_csv(DATA_PATH)
@@ -0,0 +1,73 @@
+"""
+Artifact nhị phân phải tải lại đúng đối tượng đã lưu, các mảng map từ file
+"""
+
+import numpy as np
+import pytest
+
+from artifacts import load_artifact, load_object, read_artifact_header, save_artifact
+from fast_scoring import FlatForest, LinearScorer
+
+
+def test_roundtrip_keeps_arrays_and_maps_them(tmp_path):
+    rng = np.random.default_rng(0)
+    obj = {
+        'weights': rng.random((50, 7)),
+        'codes': np.arange(1000, dtype=np.int32),
+        'columns': ['a', 'b'],
+        'empty': np.empty(0),
+    }
+    path = tmp_path / 'obj.artifact'
+    header = save_artifact(obj, path, metadata={'note': 'test'})
+
+    loaded = load_artifact(path, verify=True)
+    assert loaded['columns'] == obj['columns']
+    for key in ('weights', 'codes', 'empty'):
+        np.testing.assert_array_equal(loaded[key], obj[key])
+        assert loaded[key].dtype == obj[key].dtype
+    # Mảng lớn được dựng trên vùng map (chỉ đọc), không chép
+    assert not loaded['weights'].flags.writeable
+    assert len(header['buffers']) >= 2
+    assert read_artifact_header(path)['metadata'] == {'note': 'test'}
+
+
+def test_saved_scorer_predicts_like_original(saved_model, raw_data, tmp_path):
+    scorer = LinearScorer.from_model(*saved_model)
+    path = tmp_path / 'scorer.artifact'
+    save_artifact(scorer, path)
+
+    loaded = load_object(path)
+    X = scorer.encoder.transform(raw_data)
+    np.testing.assert_array_equal(loaded.predict_proba(X), scorer.predict_proba(X))
+
+
+def test_saved_flat_forest_predicts_like_original(tmp_path):
+    from sklearn.ensemble import RandomForestClassifier
+
+    rng = np.random.default_rng(1)
+    X = rng.random((200, 5))
+    y = (X[:, 0] > 0.5).astype(int)
+    forest = FlatForest.from_model(RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y))
+    path = tmp_path / 'forest.artifact'
+    save_artifact(forest, path)
+
+    np.testing.assert_array_equal(load_artifact(path).predict_proba(X), forest.predict_proba(X))
+
+
+def test_corrupted_artifact_fails_verification(tmp_path):
+    path = tmp_path / 'obj.artifact'
+    save_artifact({'weights': np.arange(100.0)}, path)
+    data = bytearray(path.read_bytes())
+    data[-8] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match='SHA-256'):
+        load_artifact(path, verify=True)
+
+
+def test_non_artifact_file_is_rejected(tmp_path):
+    path = tmp_path / 'model.artifact'
+    path.write_bytes(b'not an artifact file at all')
+
+    with pytest.raises(ValueError):
+        load_artifact(path)
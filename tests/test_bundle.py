@@ -0,0 +1,99 @@
+"""
+Gói mô hình: tải lại đúng thành phần, phát hiện file bị sửa và thành phần
+không khớp nhau
+"""
+
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from artifacts import save_artifact
+from bundle import BUNDLE_VERSION, load_bundle, save_bundle
+from predict import load_scoring_model, predict_churn
+
+
+def _save(path, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return save_bundle(path, *args, **kwargs)
+
+
+def _load(path, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return load_bundle(path, **kwargs)
+
+
+def test_roundtrip(saved_model, tmp_path):
+    model, scaler, feature_columns = saved_model
+    path = tmp_path / 'model.bundle'
+    policy = {'threshold': 0.3, 'risk_bands': {'high': 0.6, 'medium': 0.3}}
+    _save(path, model, scaler, feature_columns, policy)
+
+    bundle = _load(path)
+    assert bundle['feature_columns'] == list(feature_columns)
+    assert bundle['thresholds'] == policy
+    assert bundle['metadata']['model_class'] == type(model).__name__
+    np.testing.assert_array_equal(bundle['model'].coef_, model.coef_)
+    np.testing.assert_array_equal(bundle['scaler'].mean_, scaler.mean_)
+
+
+def test_scoring_model_from_bundle_matches_pkl(saved_model, raw_data, tmp_path):
+    model, scaler, feature_columns = saved_model
+    path = tmp_path / 'model.bundle'
+    _save(path, model, scaler, feature_columns,
+          {'threshold': 0.3, 'risk_bands': {'high': 0.6, 'medium': 0.3}})
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        scorer, encoder, policy = load_scoring_model(str(path))
+        _, _, bundle_policy = load_scoring_model(str(path), bundle_policy=True)
+    # Ngưỡng trong gói chỉ được dùng khi chỉ định
+    assert policy['threshold'] == 0.5
+    assert bundle_policy['threshold'] == 0.3
+
+    for customer in raw_data.head(20).to_dict('records'):
+        expected = predict_churn(model, scaler, dict(customer), feature_columns)
+        result = predict_churn(scorer, None, customer, encoder=encoder)
+        assert abs(result['churn_probability'] - expected['churn_probability']) < 1e-12
+
+
+def test_tampered_bundle_is_rejected(saved_model, tmp_path):
+    path = tmp_path / 'model.bundle'
+    _save(path, *saved_model)
+    data = bytearray(path.read_bytes())
+    data[-16] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match='SHA-256'):
+        _load(path)
+
+
+def test_inconsistent_components_are_rejected(saved_model, tmp_path):
+    model, scaler, feature_columns = saved_model
+
+    with pytest.raises(ValueError):
+        _save(tmp_path / 'short.bundle', model, scaler, feature_columns[:-1])
+    with pytest.raises(ValueError):
+        _save(tmp_path / 'missing.bundle', model, scaler,
+              [col for col in feature_columns if col != 'tenure'] + ['extra'])
+
+
+def test_inconsistent_bundle_file_is_rejected_on_load(saved_model, tmp_path):
+    model, scaler, feature_columns = saved_model
+    path = tmp_path / 'model.bundle'
+    # Ghi thẳng artifact (bỏ qua kiểm tra khi lưu) với feature_columns sai
+    payload = {'model': model, 'scaler': scaler, 'feature_columns': feature_columns[:-1],
+               'vocabulary': None, 'thresholds': None}
+    save_artifact(payload, path, metadata={'bundle_version': BUNDLE_VERSION,
+                                           'model_class': type(model).__name__})
+
+    with pytest.raises(ValueError, match='feature_columns'):
+        _load(path)
+
+
+def test_newer_bundle_version_is_rejected(tmp_path):
+    path = tmp_path / 'model.bundle'
+    save_artifact({}, path, metadata={'bundle_version': BUNDLE_VERSION + 1})
+
+    with pytest.raises(ValueError, match='phiên bản'):
+        _load(path)
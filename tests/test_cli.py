@@ -0,0 +1,68 @@
+"""
+CLI dự đoán hàng loạt: CSV và JSON-lines cho cùng kết quả với predict_churn
+"""
+
+import json
+import warnings
+
+import pandas as pd
+import pytest
+
+import cli
+from predict import predict_churn
+
+
+@pytest.fixture
+def sample(raw_data):
+    return raw_data.drop(columns='Churn').head(3)
+
+
+def _expected(saved_model, sample):
+    model, scaler, feature_columns = saved_model
+    return [predict_churn(model, scaler, dict(row), feature_columns)
+            for row in sample.to_dict('records')]
+
+
+def _run(tmp_path, *args):
+    # Không dùng gói mô hình (nếu có) để so với các file .pkl
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return cli.main([*args, '--bundle', str(tmp_path / 'no.bundle')])
+
+
+def test_csv_input(saved_model, sample, tmp_path):
+    source, output = tmp_path / 'customers.csv', tmp_path / 'out.csv'
+    sample.to_csv(source, index=False)
+
+    assert _run(tmp_path, str(source), '-o', str(output), '--chunksize', '2',
+                '--columns', 'customerID,prediction,churn_probability,risk_level') == 0
+    results = pd.read_csv(output)
+
+    assert results.columns.tolist() == ['customerID', 'prediction', 'churn_probability',
+                                        'risk_level']
+    assert results['customerID'].tolist() == sample['customerID'].tolist()
+    for row, expected in zip(results.itertuples(), _expected(saved_model, sample)):
+        assert row.prediction == expected['prediction']
+        assert abs(row.churn_probability - expected['churn_probability']) < 1e-12
+
+
+def test_jsonl_input(saved_model, sample, tmp_path):
+    source, output = tmp_path / 'customers.jsonl', tmp_path / 'out.jsonl'
+    sample.to_json(source, orient='records', lines=True)
+
+    assert _run(tmp_path, str(source), '-o', str(output)) == 0
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+
+    assert [row['customerID'] for row in results] == sample['customerID'].tolist()
+    for row, expected in zip(results, _expected(saved_model, sample)):
+        assert set(row) == {'customerID', 'prediction', 'churn_probability'}
+        assert row['prediction'] == expected['prediction']
+        assert abs(row['churn_probability'] - expected['churn_probability']) < 1e-12
+
+
+def test_unknown_column_is_an_error(sample, tmp_path):
+    source = tmp_path / 'customers.csv'
+    sample.to_csv(source, index=False)
+
+    with pytest.raises(SystemExit):
+        _run(tmp_path, str(source), '-o', str(tmp_path / 'out.csv'), '--columns', 'nope')
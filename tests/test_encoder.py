@@ -0,0 +1,60 @@
+"""
+FeatureEncoder phải cho cùng ma trận đặc trưng với preprocess_input
+"""
+
+import numpy as np
+
+from encoder import FeatureEncoder
+from predict import build_encoder, preprocess_input
+from preprocessing import CATEGORICAL_SCHEMA
+
+
+def _reference(raw_data, scaler, feature_columns):
+    expected = preprocess_input(raw_data.copy(), scaler, feature_columns)
+    return expected.to_numpy(dtype=float)
+
+
+def test_frame_matches_preprocess_input(saved_model, raw_data):
+    _, scaler, feature_columns = saved_model
+    encoder = build_encoder(scaler, feature_columns)
+
+    np.testing.assert_allclose(encoder.transform(raw_data),
+                               _reference(raw_data, scaler, feature_columns), atol=1e-12)
+
+
+def test_records_match_frame(saved_model, raw_data):
+    _, scaler, feature_columns = saved_model
+    encoder = build_encoder(scaler, feature_columns)
+    sample = raw_data.head(200)
+
+    np.testing.assert_allclose(encoder.transform(sample.to_dict('records')),
+                               encoder.transform(sample), atol=1e-12)
+
+
+def test_single_customer_matches_preprocess_input(saved_model, raw_data):
+    _, scaler, feature_columns = saved_model
+    encoder = build_encoder(scaler, feature_columns)
+    customer = raw_data.iloc[0].to_dict()
+
+    expected = preprocess_input(dict(customer), scaler, feature_columns).to_numpy(dtype=float)
+    np.testing.assert_allclose(encoder.transform(customer), expected, atol=1e-12)
+
+
+def test_unknown_category_encodes_as_zeros(saved_model, raw_data):
+    _, scaler, feature_columns = saved_model
+    encoder = build_encoder(scaler, feature_columns)
+    customer = raw_data.iloc[0].to_dict()
+    customer['Contract'] = 'Ten year'
+
+    X = encoder.transform(customer)
+    contract = [i for i, name in enumerate(feature_columns) if name.startswith('Contract_')]
+    assert not X[0, contract].any()
+
+
+def test_vocabulary_matches_name_parsing(saved_model, raw_data):
+    _, scaler, feature_columns = saved_model
+    parsed = FeatureEncoder(feature_columns, scaler)
+    declared = FeatureEncoder(feature_columns, scaler, CATEGORICAL_SCHEMA)
+
+    assert declared.vocabulary == parsed.vocabulary
+    np.testing.assert_array_equal(declared.transform(raw_data), parsed.transform(raw_data))
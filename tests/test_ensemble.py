@@ -0,0 +1,43 @@
+"""
+PrefitVotingClassifier song song phải cho cùng xác suất với chạy tuần tự và
+không tạo thêm thread theo từng mô hình
+"""
+
+import threading
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from ensemble import PrefitVotingClassifier
+
+
+def _members():
+    rng = np.random.default_rng(0)
+    X = rng.random((300, 4))
+    y = (X[:, 0] + X[:, 1] > 1).astype(int)
+    members = [
+        ('lr', LogisticRegression().fit(X, y)),
+        ('rf', RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)),
+        ('lr_strong', LogisticRegression(C=0.1).fit(X, y)),
+    ]
+    return members, X
+
+
+def test_parallel_matches_sequential():
+    members, X = _members()
+    expected = PrefitVotingClassifier(members, weights=[1, 2, 1]).fit().predict_proba(X)
+
+    for n_jobs in (2, 3, -1):
+        ensemble = PrefitVotingClassifier(members, weights=[1, 2, 1], n_jobs=n_jobs).fit()
+        np.testing.assert_array_equal(ensemble.predict_proba(X), expected)
+
+
+def test_models_share_one_thread_pool():
+    members, X = _members()
+    PrefitVotingClassifier(members, n_jobs=-1).fit().predict_proba(X)
+    n_threads = threading.active_count()
+
+    for _ in range(20):
+        PrefitVotingClassifier(members, n_jobs=-1).fit().predict_proba(X)
+    assert threading.active_count() == n_threads
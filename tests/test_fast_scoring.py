@@ -0,0 +1,29 @@
+"""
+LinearScorer phải cho cùng xác suất với LogisticRegression + preprocess_input
+"""
+
+import numpy as np
+
+from fast_scoring import LinearScorer
+from predict import predict_churn, preprocess_input
+
+
+def test_proba_matches_sklearn(saved_model, raw_data):
+    model, scaler, feature_columns = saved_model
+    scorer = LinearScorer.from_model(model, scaler, feature_columns)
+
+    expected = model.predict_proba(preprocess_input(raw_data.copy(), scaler, feature_columns))
+    np.testing.assert_allclose(scorer.predict_proba(scorer.encoder.transform(raw_data)),
+                               expected, rtol=0, atol=1e-12)
+
+
+def test_predict_churn_matches_sklearn(saved_model, raw_data):
+    model, scaler, feature_columns = saved_model
+    scorer = LinearScorer.from_model(model, scaler, feature_columns)
+
+    for customer in raw_data.head(50).to_dict('records'):
+        expected = predict_churn(model, scaler, dict(customer), feature_columns)
+        result = predict_churn(scorer, None, customer, encoder=scorer.encoder)
+
+        assert result['prediction'] == expected['prediction']
+        assert abs(result['churn_probability'] - expected['churn_probability']) < 1e-12
@@ -0,0 +1,55 @@
+"""
+Metrics tự tính từ ma trận nhầm lẫn phải khớp với sklearn.metrics
+"""
+
+import numpy as np
+import pytest
+from sklearn.metrics import (
+    accuracy_score, classification_report, confusion_matrix, f1_score,
+    precision_score, recall_score, roc_auc_score
+)
+
+from metrics import binary_metrics, classification_report_from_confusion, confusion_counts, roc_auc
+
+
+@pytest.fixture(params=[0, 1, 2])
+def labels_and_scores(request):
+    rng = np.random.default_rng(request.param)
+    y_true = rng.integers(0, 2, 5000)
+    # Làm tròn để có nhiều điểm bằng nhau (kiểm tra cách xử lý tie của AUC)
+    y_score = np.round(np.clip(0.3 * y_true + rng.random(5000) * 0.7, 0, 1), 2)
+    y_pred = (y_score > 0.5).astype(int)
+    return y_true, y_pred, y_score
+
+
+def test_confusion_counts_match_sklearn(labels_and_scores):
+    y_true, y_pred, _ = labels_and_scores
+    np.testing.assert_array_equal(confusion_counts(y_true, y_pred),
+                                  confusion_matrix(y_true, y_pred))
+
+
+def test_binary_metrics_match_sklearn(labels_and_scores):
+    y_true, y_pred, y_score = labels_and_scores
+    metrics, _ = binary_metrics(y_true, y_pred, y_score)
+
+    assert metrics['accuracy'] == pytest.approx(accuracy_score(y_true, y_pred), abs=1e-12)
+    assert metrics['precision'] == pytest.approx(precision_score(y_true, y_pred), abs=1e-12)
+    assert metrics['recall'] == pytest.approx(recall_score(y_true, y_pred), abs=1e-12)
+    assert metrics['f1'] == pytest.approx(f1_score(y_true, y_pred), abs=1e-12)
+    assert metrics['auc'] == pytest.approx(roc_auc_score(y_true, y_score), abs=1e-12)
+
+
+def test_roc_auc_without_ties_matches_sklearn():
+    rng = np.random.default_rng(3)
+    y_true = rng.integers(0, 2, 2000)
+    y_score = rng.random(2000)
+    assert roc_auc(y_true, y_score) == pytest.approx(roc_auc_score(y_true, y_score), abs=1e-12)
+
+
+def test_report_matches_sklearn(labels_and_scores):
+    y_true, y_pred, _ = labels_and_scores
+    names = ['No Churn', 'Churn']
+    for digits in (2, 4):
+        assert classification_report_from_confusion(
+            confusion_counts(y_true, y_pred), target_names=names, digits=digits
+        ) == classification_report(y_true, y_pred, target_names=names, digits=digits)
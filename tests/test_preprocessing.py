@@ -0,0 +1,63 @@
+"""
+Cache dữ liệu đã mã hóa phải phân biệt các tham số mã hóa; giá trị phân loại
+ngoài schema bị báo lỗi rõ ràng
+"""
+
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+import preprocessing
+from conftest import DATA_PATH
+from preprocessing import cache_key, encoding_params, load_data, load_encoded_data
+
+
+def _load(cache_dir, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return load_encoded_data(DATA_PATH, str(cache_dir), **kwargs)
+
+
+def test_cache_key_depends_on_encoding_params(monkeypatch):
+    schema_key = cache_key(DATA_PATH, **encoding_params(use_schema=True))
+    assert schema_key != cache_key(DATA_PATH, **encoding_params(use_schema=False))
+
+    schema = dict(preprocessing.CATEGORICAL_SCHEMA, Contract=['Month-to-month', 'One year'])
+    monkeypatch.setattr(preprocessing, 'CATEGORICAL_SCHEMA', schema)
+    assert cache_key(DATA_PATH, **encoding_params(use_schema=True)) != schema_key
+
+
+def test_cached_data_matches_fresh_encoding(tmp_path):
+    for use_schema in (True, False):
+        fresh = _load(tmp_path, use_schema=use_schema)
+        cached = _load(tmp_path, use_schema=use_schema)
+        assert cached.columns.tolist() == fresh.columns.tolist()
+        assert cached.dtypes.tolist() == fresh.dtypes.tolist()
+        np.testing.assert_array_equal(cached.to_numpy(), fresh.to_numpy())
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def _write_sample(raw_data, tmp_path, **overrides):
+    sample = raw_data.head(20).copy()
+    for column, value in overrides.items():
+        sample.loc[3, column] = value
+    path = tmp_path / 'sample.csv'
+    sample.to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize('column', ['Churn', 'Contract'])
+def test_value_outside_schema_is_rejected(raw_data, tmp_path, column):
+    path = _write_sample(raw_data, tmp_path, **{column: 'Maybe'})
+
+    with pytest.raises(ValueError, match=rf"{column}.*Maybe"):
+        load_data(path)
+
+
+def test_unknown_churn_label_is_rejected_without_schema(raw_data, tmp_path):
+    path = _write_sample(raw_data, tmp_path, Churn='Maybe')
+
+    with pytest.raises(ValueError, match="Churn.*Maybe"), \
+            contextlib.redirect_stdout(io.StringIO()):
+        load_encoded_data(str(path), use_schema=False)
@@ -0,0 +1,65 @@
+"""
+Tìm kiếm warm start phải chọn cùng tham số và cùng mô hình với GridSearchCV
+"""
+
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import GridSearchCV, ParameterGrid, StratifiedKFold
+
+import modeling
+from preprocessing import preprocess_pipeline
+from conftest import DATA_PATH
+
+
+SMALL_GRID = {
+    'n_estimators': [5, 10, 20],
+    'max_depth': [4, None],
+    'min_samples_split': [2, 10],
+}
+
+
+@pytest.fixture(scope='module')
+def train_data():
+    with contextlib.redirect_stdout(io.StringIO()):
+        X_train, X_test, y_train, _, _ = preprocess_pipeline(DATA_PATH)
+    return X_train.iloc[:1500], y_train.iloc[:1500], X_test
+
+
+def test_warm_start_matches_grid_search(train_data, monkeypatch):
+    X_train, y_train, X_test = train_data
+    monkeypatch.setattr(modeling, 'RF_PARAM_GRID', SMALL_GRID)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        grid = modeling.optimize_random_forest(X_train, y_train, search='grid', cv=3, n_jobs=1)
+        warm = modeling.optimize_random_forest(X_train, y_train, search='warm_start', cv=3,
+                                               n_jobs=1)
+
+    assert warm.get_params() == grid.get_params()
+    np.testing.assert_array_equal(warm.predict_proba(X_test), grid.predict_proba(X_test))
+
+
+def test_warm_start_scores_match_grid_search(train_data):
+    X_train, y_train, _ = train_data
+    grid = GridSearchCV(RandomForestClassifier(random_state=42), SMALL_GRID, cv=3,
+                        scoring='f1', n_jobs=1).fit(X_train, y_train)
+
+    n_estimators_list = SMALL_GRID['n_estimators']
+    folds = list(StratifiedKFold(n_splits=3).split(X_train, y_train))
+    tree_grid = ParameterGrid({k: v for k, v in SMALL_GRID.items() if k != 'n_estimators'})
+    for params in tree_grid:
+        fold_scores = np.array([
+            modeling._grow_forest_on_fold(X_train.iloc[tr], y_train.iloc[tr],
+                                          X_train.iloc[va], y_train.iloc[va],
+                                          n_estimators_list, params)
+            for tr, va in folds
+        ])
+        for j, n_estimators in enumerate(n_estimators_list):
+            candidate = {**params, 'n_estimators': n_estimators}
+            index = grid.cv_results_['params'].index(candidate)
+            assert fold_scores[:, j].mean() == pytest.approx(
+                grid.cv_results_['mean_test_score'][index], abs=1e-12)
@@ -0,0 +1,87 @@
+"""
+Micro-batching của dịch vụ: 1 bản ghi lỗi không làm hỏng cả batch
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from fast_scoring import LinearScorer
+from predict import predict_churn
+from service import MicroBatcher, QueueFullError, ScoringService
+
+
+@pytest.fixture
+def scorer(saved_model):
+    return LinearScorer.from_model(*saved_model)
+
+
+def _customers(raw_data, n):
+    return raw_data.drop(columns='Churn').head(n).to_dict('records')
+
+
+def test_bad_record_fails_only_its_own_request(scorer, raw_data):
+    customers = _customers(raw_data, 7)
+    bad = dict(customers[0], Contract=['x'])
+
+    async def run():
+        batcher = MicroBatcher(scorer, scorer.encoder, max_batch_size=8, max_wait_ms=50)
+        batcher.start()
+        try:
+            return await asyncio.gather(
+                *(batcher.submit(record) for record in customers + [bad]),
+                return_exceptions=True
+            )
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+    assert isinstance(results[-1], TypeError)
+    for customer, result in zip(customers, results):
+        expected = predict_churn(scorer, None, customer, encoder=scorer.encoder)
+        assert result['prediction'] == expected['prediction']
+        assert abs(result['churn_probability'] - expected['churn_probability']) < 1e-12
+
+
+def test_route_rejects_invalid_record(scorer, raw_data):
+    body = json.dumps(dict(_customers(raw_data, 1)[0], Contract=['x'])).encode()
+
+    async def run():
+        service = ScoringService(MicroBatcher(scorer, scorer.encoder))
+        return await service.route('POST', '/predict', body)
+
+    status, payload = asyncio.run(run())
+    assert status == 400
+    assert 'Contract' in payload['error']
+
+
+def test_full_queue_is_rejected(scorer, raw_data):
+    customer = _customers(raw_data, 1)[0]
+
+    async def run():
+        # Không khởi động batcher: yêu cầu đầu tiên nằm lại trong hàng đợi
+        batcher = MicroBatcher(scorer, scorer.encoder, max_queue_size=1)
+        first = asyncio.ensure_future(batcher.submit(customer))
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFullError):
+            await batcher.submit(customer)
+        first.cancel()
+
+    asyncio.run(run())
+
+
+def test_oversized_body_is_rejected(scorer):
+    async def run():
+        service = ScoringService(MicroBatcher(scorer, scorer.encoder), max_body_bytes=16)
+        server = await asyncio.start_server(service.handle_connection, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b"POST /predict HTTP/1.1\r\nContent-Length: 1000000\r\n\r\n")
+            await writer.drain()
+            status = await reader.readline()
+            writer.close()
+        return status
+
+    assert b' 413 ' in asyncio.run(run())
@@ -0,0 +1,32 @@
+"""
+predict_batch_stream phải cho cùng kết quả với predict_batch
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import DATA_PATH
+from predict import build_encoder, predict_batch, predict_batch_stream
+
+
+@pytest.mark.parametrize('use_encoder', [False, True])
+def test_stream_matches_batch(saved_model, use_encoder):
+    model, scaler, feature_columns = saved_model
+    encoder = build_encoder(scaler, feature_columns) if use_encoder else None
+
+    expected = predict_batch(model, scaler, DATA_PATH, feature_columns, encoder)
+
+    buffer = io.StringIO()
+    n_rows = predict_batch_stream(model, scaler, DATA_PATH, buffer, feature_columns,
+                                  chunksize=1000, encoder=encoder)
+    buffer.seek(0)
+    streamed = pd.read_csv(buffer)
+
+    assert n_rows == len(expected)
+    assert streamed['customerID'].tolist() == expected['customerID'].tolist()
+    assert streamed['prediction'].tolist() == expected['prediction'].tolist()
+    np.testing.assert_allclose(streamed['churn_probability'], expected['churn_probability'],
+                               rtol=0, atol=1e-12)
@@ -0,0 +1,104 @@
+"""
+threshold_sweep phải khớp với đếm trực tiếp tại từng ngưỡng; mức rủi ro và
+file chính sách quyết định
+"""
+
+import numpy as np
+import pytest
+
+from thresholds import (
+    build_decision_policy, load_decision_policy, risk_bands, risk_level,
+    save_decision_policy, threshold_sweep
+)
+
+
+def _random_scores(seed, n=500):
+    rng = np.random.default_rng(seed)
+    y_true = rng.integers(0, 2, n)
+    # Làm tròn để có nhiều điểm bằng nhau
+    y_score = np.round(np.clip(0.3 * y_true + rng.normal(0.35, 0.2, n), 0, 1), 2)
+    return y_true, y_score
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_sweep_matches_brute_force(seed):
+    y_true, y_score = _random_scores(seed)
+    sweep = threshold_sweep(y_true, y_score, cost_fp=1.0, cost_fn=5.0)
+
+    assert sweep['threshold'].is_monotonic_increasing
+    for row in sweep.itertuples():
+        predicted = y_score > row.threshold
+        assert row.tp == np.sum(predicted & (y_true == 1))
+        assert row.fp == np.sum(predicted & (y_true == 0))
+        assert row.fn == np.sum(~predicted & (y_true == 1))
+        assert row.tn == np.sum(~predicted & (y_true == 0))
+        assert row.cost == row.fp + 5.0 * row.fn
+
+    # 2 dòng biên: dự đoán Churn tất cả / không dự đoán Churn nào
+    assert sweep['tp'].iloc[0] + sweep['fp'].iloc[0] == len(y_true)
+    assert sweep['tp'].iloc[-1] + sweep['fp'].iloc[-1] == 0
+
+
+def test_bands_when_cost_optimum_is_below_precision_cutoff():
+    y_true, y_score = _random_scores(0)
+    policy = build_decision_policy(y_true, y_score, cost_fp=1.0, cost_fn=5.0,
+                                   high_precision=0.7)
+    threshold, bands = policy['threshold'], policy['risk_bands']
+
+    # FN đắt: ngưỡng tối ưu thấp, precision tại đó chưa đạt mức CAO
+    assert policy['metrics']['precision'] < 0.7
+    assert bands['medium'] == threshold
+    assert bands['high'] > threshold
+
+    # CAO là ngưỡng thấp nhất (>= ngưỡng quyết định) đạt precision 0.7
+    sweep = threshold_sweep(y_true, y_score)
+    high = sweep[sweep['threshold'] == bands['high']].iloc[0]
+    assert high['precision'] >= 0.7
+    lower = sweep[(sweep['threshold'] >= threshold) & (sweep['threshold'] < bands['high'])]
+    assert (lower['precision'] < 0.7).all()
+
+
+def test_bands_with_degenerate_labels():
+    y_score = np.linspace(0, 1, 50)
+    policy = build_decision_policy(np.zeros(50, dtype=int), y_score)
+
+    # Không có khách hàng rời bỏ: không dự đoán Churn nào, 3 mức trùng nhau
+    assert policy['threshold'] == y_score.max()
+    assert policy['risk_bands'] == {'high': policy['threshold'],
+                                    'medium': policy['threshold']}
+
+
+def test_high_band_falls_back_to_best_precision():
+    y_true, y_score = _random_scores(1)
+    sweep = threshold_sweep(y_true, y_score)
+    bands = risk_bands(sweep, 0.0, high_precision=1.01)
+
+    candidates = sweep[(sweep['threshold'] >= 0.0) & (sweep['tp'] + sweep['fp'] > 0)]
+    best = candidates.loc[candidates['precision'].idxmax(), 'threshold']
+    assert bands == {'high': best, 'medium': 0.0}
+
+
+def test_risk_level_is_strictly_above_band():
+    bands = {'high': 0.7, 'medium': 0.3}
+    assert risk_level(0.7, bands) == 'medium'
+    assert risk_level(0.71, bands) == 'high'
+    assert risk_level(0.3, bands) == 'low'
+    assert risk_level(0.5) == 'low'
+    assert risk_level(0.6) == 'medium'
+
+
+def test_policy_file_is_tied_to_model_file(tmp_path):
+    model_path = tmp_path / 'model.pkl'
+    other_path = tmp_path / 'other.pkl'
+    model_path.write_bytes(b'model')
+    other_path.write_bytes(b'other')
+    policy_path = tmp_path / 'thresholds.json'
+
+    policy = build_decision_policy(*_random_scores(2))
+    save_decision_policy(policy, policy_path, model_path=model_path)
+
+    assert policy_path.read_text().endswith('\n')
+    loaded = load_decision_policy(policy_path, model_path)
+    assert loaded['threshold'] == policy['threshold']
+    with pytest.raises(ValueError):
+        load_decision_policy(policy_path, other_path)
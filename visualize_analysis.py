@@ -3,20 +3,30 @@ Script trực quan hóa Feature Importance và phân tích Churn
 Chạy: python visualize_analysis.py
 """
 
+import os
+import sys
 import pandas as pd
 import pickle
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
 # Thiết lập style
 plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
 
 # Load model và feature columns
 print("📂 Đang tải mô hình...")
-model = pickle.load(open('models/best_rf_model.pkl', 'rb'))
-feature_cols = pickle.load(open('models/feature_columns.pkl', 'rb'))
+if os.path.exists('models/churn_model.bundle'):
+    # Gói mô hình do src/modeling.py ghi: mô hình và feature columns luôn khớp nhau
+    from bundle import load_bundle
+    bundle = load_bundle('models/churn_model.bundle')
+    model, feature_cols = bundle['model'], bundle['feature_columns']
+else:
+    model = pickle.load(open('models/best_rf_model.pkl', 'rb'))
+    feature_cols = pickle.load(open('models/feature_columns.pkl', 'rb'))
 
 # Load data
 print("📂 Đang tải dữ liệu...")